@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixtures for the ESPN extractors
+Benchmarks read ESPN payloads from benchmarks/fixtures/. Any file missing
+there is generated from a fixed seed so runs are comparable across machines;
+drop recorded responses in with the same names (or export them from a
+record/replay archive with espn_replay.py) to benchmark real pages.
+
+    scoreboard_<n>.json   scoreboard payload with n events (one or more)
+    teams.json            /teams listing
+    schedule.html         schedule page
+    game.html             game page
+"""
+
+import glob
+import json
+import os
+import random
+from typing import Dict, List, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SCOREBOARD_SIZES = (12, 80, 250)
+TEAM_COUNT = 260
+SEED = 2024
+
+_LOCATIONS = ['Georgia', 'Florida', 'Texas', 'Ohio State', 'Michigan', 'Oregon', 'USC', 'Miami',
+              'Ole Miss', 'NC State', 'Texas A&M', 'Kansas State', 'Virginia Tech', 'Utah']
+_MASCOTS = ['Bulldogs', 'Gators', 'Longhorns', 'Buckeyes', 'Wolverines', 'Ducks', 'Trojans',
+            'Hurricanes', 'Rebels', 'Wolfpack', 'Aggies', 'Wildcats', 'Hokies', 'Utes']
+
+
+def make_teams(count: int = TEAM_COUNT) -> List[Dict]:
+    """Deterministic ESPN-shaped team objects"""
+    teams = []
+    for n in range(count):
+        location = _LOCATIONS[n] if n < len(_LOCATIONS) else f"{_LOCATIONS[n % len(_LOCATIONS)]} {n}"
+        mascot = _MASCOTS[n % len(_MASCOTS)]
+        espn_id = 1000 + n
+        teams.append({
+            'id': str(espn_id),
+            'uid': f"s:20~l:23~t:{espn_id}",
+            'location': location,
+            'name': mascot,
+            'abbreviation': ''.join(word[0] for word in location.split()).upper() + str(n),
+            'displayName': f"{location} {mascot}",
+            'shortDisplayName': location,
+            'color': '%06x' % (espn_id * 7919 % 0xFFFFFF),
+            'alternateColor': 'ffffff',
+            'isActive': True,
+            'logo': f"https://a.espncdn.com/i/teamlogos/ncaa/500/{espn_id}.png",
+            'logos': [{'href': f"https://a.espncdn.com/i/teamlogos/ncaa/500/{espn_id}.png",
+                       'width': 500, 'height': 500, 'rel': ['full', 'default']}],
+            'links': [{'href': f"https://www.espn.com/college-football/team/_/id/{espn_id}",
+                       'text': 'Clubhouse'}]
+        })
+    return teams
+
+
+def _competitor(rng: random.Random, team: Dict, home_away: str, state: str) -> Dict:
+    return {
+        'id': team['id'],
+        'homeAway': home_away,
+        'order': 0 if home_away == 'home' else 1,
+        'team': team,
+        'score': str(rng.randint(0, 56)) if state != 'pre' else '0',
+        'curatedRank': {'current': rng.choice([99, 99, 99, rng.randint(1, 25)])},
+        'records': [{'name': 'overall', 'type': 'total', 'summary': f"{rng.randint(0, 9)}-{rng.randint(0, 9)}"}],
+        'linescores': [{'value': float(rng.randint(0, 21))} for _ in range(4)] if state != 'pre' else [],
+        'statistics': [{'name': f"stat{i}", 'displayValue': str(rng.random())} for i in range(12)],
+        'leaders': [{'name': 'passingYards', 'leaders': [{'displayValue': f"{rng.randint(50, 400)} YDS",
+                                                          'athlete': {'fullName': f"Player {rng.randint(1, 9999)}"}}]}]
+    }
+
+
+def make_scoreboard(event_count: int, seed: int = SEED) -> Dict:
+    """Deterministic scoreboard payload with event_count games"""
+    rng = random.Random(seed + event_count)
+    teams = make_teams()
+    events = []
+    for n in range(event_count):
+        home, away = rng.sample(teams, 2)
+        state = rng.choice(['pre', 'in', 'post'])
+        date = f"2024-11-{2 + n % 2:02d}T{16 + n % 7}:30Z"
+        events.append({
+            'id': str(401600000 + n),
+            'uid': f"s:20~l:23~e:{401600000 + n}",
+            'date': date,
+            'name': f"{away['displayName']} at {home['displayName']}",
+            'shortName': f"{away['abbreviation']} @ {home['abbreviation']}",
+            'season': {'year': 2024, 'type': 2},
+            'week': {'number': 10},
+            'competitions': [{
+                'id': str(401600000 + n),
+                'date': date,
+                'attendance': rng.randint(20000, 100000),
+                'venue': {'fullName': f"Stadium {n}", 'address': {'city': 'City', 'state': 'ST'}},
+                'competitors': [_competitor(rng, home, 'home', state), _competitor(rng, away, 'away', state)],
+                'odds': [{'provider': {'name': 'ESPN BET'}, 'details': 'X -3.5',
+                          'overUnder': 52.5, 'spread': rng.choice([-14.5, -7.0, -3.5, 2.5, 10.0])}],
+                'status': {'clock': 0.0, 'period': 4 if state == 'post' else 0,
+                           'type': {'state': state, 'completed': state == 'post',
+                                    'description': 'Final' if state == 'post' else 'Scheduled'}},
+                'broadcasts': [{'market': 'national', 'names': ['ESPN']}],
+                'notes': [],
+                'headlines': [{'description': 'x' * 200}] if state == 'post' else []
+            }],
+            'links': [{'href': f"https://www.espn.com/college-football/game/_/gameId/{401600000 + n}"}],
+            'status': {'type': {'state': state, 'completed': state == 'post'}}
+        })
+    return {'leagues': [{'id': '23', 'name': 'NCAA - Football'}], 'events': events}
+
+
+def make_teams_payload() -> Dict:
+    return {'sports': [{'leagues': [{'teams': [{'team': team} for team in make_teams()]}]}]}
+
+
+def make_schedule_html(game_count: int = 80, seed: int = SEED) -> str:
+    """Schedule page with game_count Table__TR rows plus realistic page chrome"""
+    rng = random.Random(seed)
+    teams = make_teams()
+    rows = []
+    for n in range(game_count):
+        home, away = rng.sample(teams, 2)
+        rows.append(
+            '<tr class="Table__TR Table__TR--sm Table__even" data-idx="%d">'
+            '<td class="events__col Table__TD"><div class="matchTeams">'
+            '<a class="AnchorLink" href="/college-football/team/_/id/%s/%s">%s</a></div></td>'
+            '<td class="colspan__col Table__TD"><div class="local"><span class="at">@</span>'
+            '<a class="AnchorLink" href="/college-football/team/_/id/%s/%s">%s</a></div></td>'
+            '<td class="date__col Table__TD"><a class="AnchorLink" href="/college-football/game/_/gameId/%d">%d:30 PM</a></td>'
+            '<td class="broadcast__col Table__TD">ESPN</td>'
+            '<td class="odds__col Table__TD">Line: %s -%0.1f</td></tr>'
+            % (n, away['id'], away['location'].lower().replace(' ', '-'), away['location'],
+               home['id'], home['location'].lower().replace(' ', '-'), home['location'],
+               401600000 + n, 1 + n % 11, home['abbreviation'], rng.choice([3.5, 7.0, 10.5]))
+        )
+    chrome = ''.join(f'<div class="nav-item"><a href="/nav/{i}">Link {i}</a></div>' for i in range(800))
+    return ('<html><head><title>Schedule</title><script>var x = 1;</script>'
+            '<link rel="canonical" href="https://www.espn.com/college-football/schedule/_/week/10/year/2024/seasontype/2"/>'
+            '</head><body>'
+            f'{chrome}<table class="Table"><tbody class="Table__TBODY">{"".join(rows)}</tbody></table>'
+            f'{chrome}</body></html>')
+
+
+def make_game_html(seed: int = SEED) -> str:
+    """Game page with a large embedded JSON blob and an odds block"""
+    rng = random.Random(seed)
+    blob = {'page': {'content': {'gamepackage': {
+        'gmStrp': {'tms': [{'id': str(1000 + i), 'score': rng.randint(0, 50)} for i in range(2)]},
+        'plays': [{'id': i, 'text': 'play ' * 20} for i in range(2000)]
+    }}}}
+    filler = ''.join(f'<section><p>Paragraph {i} ' + 'lorem ipsum ' * 20 + '</p></section>' for i in range(300))
+    return ('<html><head><script type="application/json" id="config">{"env": "prod"}</script>'
+            '<link rel="canonical" href="https://www.espn.com/college-football/game/_/gameId/401600000"/>'
+            f'<script type="application/json" id="espnfitt">{json.dumps(blob)}</script></head><body>'
+            f'{filler}<div class="odds"><span>Line: UGA -3.5</span><span>Over/Under: 52.5</span></div>'
+            f'{filler}</body></html>')
+
+
+def ensure_fixtures(fixtures_dir: str = FIXTURES_DIR, regenerate: bool = False) -> Dict[str, str]:
+    """Create any missing fixture files and return {name: path}"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    builders = {}
+    recorded = glob.glob(os.path.join(fixtures_dir, 'scoreboard_*.json'))
+    if regenerate or not recorded:
+        builders.update({f"scoreboard_{size}.json": (lambda size=size: json.dumps(make_scoreboard(size)))
+                         for size in SCOREBOARD_SIZES})
+    builders['teams.json'] = lambda: json.dumps(make_teams_payload())
+    builders['schedule.html'] = make_schedule_html
+    builders['game.html'] = make_game_html
+
+    paths = {}
+    for name, build in builders.items():
+        path = os.path.join(fixtures_dir, name)
+        if regenerate or not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(build())
+        paths[name] = path
+    for path in glob.glob(os.path.join(fixtures_dir, 'scoreboard_*.json')):
+        paths.setdefault(os.path.basename(path), path)
+    return paths
+
+
+def scoreboard_fixtures(paths: Dict[str, str]) -> List[Tuple[int, str]]:
+    """(event count, fixture name) for every scoreboard fixture, smallest first"""
+    found = []
+    for name in paths:
+        if name.startswith('scoreboard_') and name.endswith('.json'):
+            try:
+                found.append((int(name[len('scoreboard_'):-len('.json')]), name))
+            except ValueError:
+                continue
+    return sorted(found)
+
+
+def read_fixture(paths: Dict[str, str], name: str) -> bytes:
+    with open(paths[name], 'rb') as f:
+        return f.read()
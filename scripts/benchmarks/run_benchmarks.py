@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the ESPN extractors
+Times the hot paths of the pipeline against the fixtures in
+benchmarks/fixtures/ (see fixtures.py) without touching the network:
+scoreboard event parsing, schedule/game HTML extraction, matchup resolution,
+SQL generation/export, bulk upserts into an in-memory SQLite stand-in for MySQL,
+NumPy season analytics, batch pick scoring and process-pool bulk parsing of
+archived pages.
+
+Results are printed (or written) as JSON so runs can be diffed or tracked.
+Benchmarks whose dependencies are not installed are reported as skipped.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --repeat 10 --only parse --output results.json
+    python benchmarks/run_benchmarks.py --compare baseline.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import FIXTURES_DIR, ensure_fixtures, read_fixture, scoreboard_fixtures  # noqa: E402
+
+DEFAULT_REPEAT = 5
+WEEK_ID = 1
+# Synthetic multi-season set for the analytics suite: fixture games x repeat per season
+ANALYTICS_SEASONS = 20
+ANALYTICS_REPEAT = 3
+# Synthetic week for the scoring suite: every user picks every game
+SCORING_USERS = 5000
+SCORING_GAMES = 12
+# Archived-page directory for the bulk parse suite: copies of the schedule fixture
+BULK_PAGES = 32
+
+# Games as in Frontend/database_schema.sql: no unique key besides id, only plain indexes
+GAMES_TABLE_SQL = """CREATE TABLE Games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    week_id INTEGER NOT NULL,
+    game_number INTEGER NOT NULL,
+    home_team_espn_id INTEGER NOT NULL,
+    away_team_espn_id INTEGER NOT NULL,
+    home_team_name TEXT NOT NULL,
+    away_team_name TEXT NOT NULL,
+    home_team_logo_url TEXT,
+    away_team_logo_url TEXT,
+    game_date TEXT,
+    betting_line REAL,
+    is_completed INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_week_id ON Games (week_id);
+CREATE INDEX idx_game_date ON Games (game_date);
+CREATE INDEX idx_home_team ON Games (home_team_espn_id);
+CREATE INDEX idx_away_team ON Games (away_team_espn_id);
+"""
+
+
+class SQLiteCursor:
+    """DB-API cursor that accepts the %s paramstyle espn_db uses with MySQL"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql: str, params=()):
+        return self._cursor.execute(sql.replace('%s', '?'), params)
+
+    def executemany(self, sql: str, rows):
+        return self._cursor.executemany(sql.replace('%s', '?'), rows)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """In-memory stand-in for a MySQL connection with an empty Games table"""
+
+    def __init__(self):
+        self._connection = sqlite3.connect(':memory:')
+        self._connection.executescript(GAMES_TABLE_SQL)
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+
+class Benchmark:
+    """A named timed callable; run() returns the number of items it processed"""
+
+    def __init__(self, name: str, run: Callable[[], int], setup: Optional[Callable[[], None]] = None,
+                 params: Optional[Dict] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.params = params or {}
+
+
+def _time(benchmark: Benchmark, repeat: int) -> Dict:
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        if benchmark.setup:
+            benchmark.setup()
+        start = time.perf_counter()
+        items = benchmark.run()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        'name': benchmark.name,
+        'params': benchmark.params,
+        'repeat': repeat,
+        'items': items,
+        'min_s': round(min(timings), 6),
+        'median_s': round(median, 6),
+        'mean_s': round(statistics.mean(timings), 6),
+        'items_per_s': round(items / median, 1) if median > 0 else None
+    }
+
+
+def _matchup_strings(games) -> List[str]:
+    """Matchup inputs as users type them: 'Away at Home', some ranked, some neutral-site"""
+    matchups = []
+    for n, game in enumerate(games):
+        away, home = game.away_team_name, game.home_team_name
+        if n % 5 == 0:
+            matchups.append(f"#{n % 25 + 1} {away} at {home}")
+        elif n % 7 == 0:
+            matchups.append(f"{home} vs {away}")
+        else:
+            matchups.append(f"{away} at {home}")
+    return matchups
+
+
+def _largest_scoreboard(paths: Dict[str, str]) -> bytes:
+    return read_fixture(paths, scoreboard_fixtures(paths)[-1][1])
+
+
+def api_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_matchups import MatchupIndex
+    from espn_stream import iter_games, iter_games_with_keys, loads
+
+    benchmarks = []
+    scoreboards = scoreboard_fixtures(paths)
+    for size, name in scoreboards:
+        payload = read_fixture(paths, name)
+        params = {'events': size, 'bytes': len(payload)}
+        benchmarks.append(Benchmark(f"api.decode[{size}]",
+                                    lambda payload=payload: len(loads(payload)['events']), params=params))
+        benchmarks.append(Benchmark(f"api.parse_events[{size}]",
+                                    lambda payload=payload: len(list(iter_games(payload))), params=params))
+
+    payload = read_fixture(paths, scoreboards[-1][1])
+    parsed = list(iter_games_with_keys(payload))
+    matchups = _matchup_strings([game for game, _, _ in parsed])
+
+    def build_index() -> MatchupIndex:
+        index = MatchupIndex()
+        for game, away_keys, home_keys in parsed:
+            index.add(game, away_keys, home_keys, game.away_team_name, game.home_team_name)
+        return index
+
+    index = build_index()
+    benchmarks.append(Benchmark('matchups.build_index', lambda: len(build_index()),
+                                params={'games': len(parsed)}))
+    benchmarks.append(Benchmark('matchups.resolve',
+                                lambda: sum(1 for _, game in index.resolve(matchups) if game is not None),
+                                params={'matchups': len(matchups)}))
+    return benchmarks
+
+
+def html_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_game_extractor import HTML_PARSER, parse_game_details, parse_schedule_rows
+
+    schedule = read_fixture(paths, 'schedule.html')
+    game_page = read_fixture(paths, 'game.html')
+    return [
+        Benchmark('html.schedule_rows', lambda: len(parse_schedule_rows(schedule)),
+                  params={'bytes': len(schedule), 'parser': HTML_PARSER}),
+        Benchmark('html.game_details', lambda: 1 if parse_game_details(game_page) else 0,
+                  params={'bytes': len(game_page), 'parser': HTML_PARSER})
+    ]
+
+
+def sql_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_api_extractor import ESPNAPIExtractor
+    from espn_stream import iter_games
+
+    games = list(iter_games(_largest_scoreboard(paths)))
+    extractor = ESPNAPIExtractor()
+    return [
+        Benchmark('sql.generate_inserts', lambda: len(extractor.generate_sql_inserts(games, WEEK_ID).splitlines()),
+                  params={'games': len(games)})
+    ]
+
+
+def export_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_export import GamesExporter
+    from espn_stream import iter_games
+
+    games = list(iter_games(_largest_scoreboard(paths)))
+
+    def export(fmt: str) -> int:
+        return GamesExporter(io.StringIO(), WEEK_ID, fmt).write(games)
+
+    return [
+        Benchmark('export.sql_multirow', lambda: export('sql'), params={'games': len(games)}),
+        Benchmark('export.tsv', lambda: export('tsv'), params={'games': len(games)})
+    ]
+
+
+def db_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_db import upsert_games
+    from espn_stream import iter_games
+
+    games = list(iter_games(_largest_scoreboard(paths)))
+    state = {}
+
+    def fresh():
+        if 'connection' in state:
+            state['connection'].close()
+        state['connection'] = SQLiteConnection()
+
+    def seeded():
+        fresh()
+        upsert_games(state['connection'], games, WEEK_ID)
+
+    def upsert() -> int:
+        stats = upsert_games(state['connection'], games, WEEK_ID)
+        return sum(batch['inserted'] + batch['updated'] + batch['unchanged'] for batch in stats)
+
+    return [
+        Benchmark('db.upsert_insert', upsert, setup=fresh, params={'games': len(games), 'backend': 'sqlite'}),
+        Benchmark('db.upsert_unchanged', upsert, setup=seeded, params={'games': len(games), 'backend': 'sqlite'})
+    ]
+
+
+def _ats_records_loop(records: List[Dict]) -> Dict[int, List[int]]:
+    """Per-game Python loop equivalent of espn_analytics.ats_records (the baseline)"""
+    totals: Dict[int, List[int]] = {}
+    for game in records:
+        home, away, line = game.get('home_score'), game.get('away_score'), game.get('betting_line')
+        if not game.get('is_completed') or home is None or away is None or line is None:
+            continue
+        cover = home - away + line
+        for team, result in ((game['home_team_espn_id'], cover), (game['away_team_espn_id'], -cover)):
+            record = totals.setdefault(team, [0, 0, 0])
+            record[0 if result > 0 else 1 if result < 0 else 2] += 1
+    return totals
+
+
+def analytics_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_analytics import GameTable, ats_records, home_away_margins, spread_by_rank_band
+    from espn_stream import iter_games
+
+    # Every fixture scoreboard replayed across seasons stands in for a multi-season backfill
+    games = [game.to_dict() for _, name in scoreboard_fixtures(paths)
+             for game in iter_games(read_fixture(paths, name))]
+    records = [dict(game, season=season, seasontype=2, week=1 + n % 15)
+               for season in range(2024 - ANALYTICS_SEASONS + 1, 2025)
+               for n, game in enumerate(games * ANALYTICS_REPEAT)]
+    table = GameTable.from_games(records)
+    params = {'games': len(records), 'seasons': ANALYTICS_SEASONS}
+    return [
+        Benchmark('analytics.load', lambda: len(GameTable.from_games(records)), params=params),
+        Benchmark('analytics.ats_records', lambda: len(ats_records(table)), params=params),
+        Benchmark('analytics.ats_records_loop', lambda: len(_ats_records_loop(records)), params=params),
+        Benchmark('analytics.spread_bands', lambda: len(spread_by_rank_band(table)), params=params),
+        Benchmark('analytics.home_margins', lambda: len(home_away_margins(table)['by_season']), params=params)
+    ]
+
+
+def _scoring_rows():
+    """A settled week of SCORING_GAMES games and SCORING_USERS users' picks (fixed seed)"""
+    import random
+
+    rng = random.Random(22)
+    games = []
+    for n in range(SCORING_GAMES):
+        home_score, away_score = rng.randint(0, 56), rng.randint(0, 56)
+        games.append((n + 1, 2 * n + 1, 2 * n + 2, rng.choice((-14.5, -7.0, -3.5, 1.5, 6.0)),
+                      n < SCORING_GAMES - 2, home_score, away_score))
+    picks = [(user * SCORING_GAMES + n + 1, user, n + 1, rng.choice((2 * n + 1, 2 * n + 2)), None)
+             for user in range(1, SCORING_USERS + 1) for n in range(SCORING_GAMES)]
+    return games, picks
+
+
+def _grade_picks_loop(games: List, picks: List) -> Dict[int, List[int]]:
+    """Per-pick Python loop equivalent of espn_scoring.grade_picks + standings (the baseline)"""
+    by_id = {game[0]: game for game in games}
+    totals: Dict[int, List[int]] = {}
+    for _, user_id, game_id, picked, _ in picks:
+        record = totals.setdefault(user_id, [0, 0])
+        _, home_id, _, _, completed, home_score, away_score = by_id[game_id]
+        if not completed or home_score == away_score:
+            continue
+        record[0 if (picked == home_id) == (home_score > away_score) else 1] += 1
+    return totals
+
+
+def scoring_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    from espn_scoring import WeekPicks, WeekResults, grade_picks, standings
+
+    games, picks = _scoring_rows()
+    results = WeekResults(games)
+    week_picks = WeekPicks(picks)
+    su = grade_picks(week_picks, results, 'su')
+    ats = grade_picks(week_picks, results, 'ats')
+    params = {'picks': len(picks), 'users': SCORING_USERS}
+    return [
+        Benchmark('scoring.load', lambda: len(WeekPicks(picks)), params=params),
+        Benchmark('scoring.grade', lambda: len(grade_picks(week_picks, results, 'ats')), params=params),
+        Benchmark('scoring.grade_loop', lambda: len(_grade_picks_loop(games, picks)), params=params),
+        Benchmark('scoring.standings', lambda: len(standings(week_picks, su, ats)), params=params)
+    ]
+
+
+def bulk_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    import atexit
+    import shutil
+    import tempfile
+
+    from espn_bulk_parse import find_pages, parse_pages
+    from espn_game_extractor import parse_schedule_rows  # noqa: F401  (workers need BeautifulSoup)
+
+    directory = tempfile.mkdtemp(prefix='espn_bulk_')
+    atexit.register(shutil.rmtree, directory, True)
+    for n in range(BULK_PAGES):
+        shutil.copyfile(paths['schedule.html'], os.path.join(directory, f"schedule_{n:03d}.html"))
+    pages = find_pages(directory)
+    if not pages.schedules:
+        print("[WARN] Schedule fixture has no canonical URL; rerun with --regenerate for the bulk suite")
+        return []
+    workers = os.cpu_count() or 1
+    benchmarks = [Benchmark('bulk.parse[1]', lambda: len(parse_pages(pages, workers=1)),
+                            params={'pages': BULK_PAGES, 'workers': 1})]
+    if workers > 1:
+        benchmarks.append(Benchmark(f"bulk.parse[{workers}]", lambda: len(parse_pages(pages, workers=workers)),
+                                    params={'pages': BULK_PAGES, 'workers': workers}))
+    return benchmarks
+
+
+SUITES = [
+    ('api', api_benchmarks),
+    ('html', html_benchmarks),
+    ('sql', sql_benchmarks),
+    ('export', export_benchmarks),
+    ('db', db_benchmarks),
+    ('analytics', analytics_benchmarks),
+    ('scoring', scoring_benchmarks),
+    ('bulk', bulk_benchmarks)
+]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def run_suites(repeat: int = DEFAULT_REPEAT, only: Optional[str] = None,
+               fixtures_dir: str = FIXTURES_DIR, regenerate: bool = False,
+               archive: Optional[str] = None) -> Dict:
+    """
+    Run every benchmark (or those whose name contains `only`)
+
+    Returns:
+        {'meta': {...}, 'results': [...]} with one result per benchmark or skipped suite
+    """
+    if archive:
+        from espn_replay import ResponseArchive, export_fixtures
+
+        recorded = ResponseArchive(archive, 'r')
+        try:
+            export_fixtures(recorded, fixtures_dir)
+        finally:
+            recorded.close()
+    paths = ensure_fixtures(fixtures_dir, regenerate)
+    results = []
+
+    for suite_name, build in SUITES:
+        try:
+            benchmarks = build(paths)
+        except ImportError as e:
+            results.append({'name': suite_name, 'skipped': f"missing dependency: {e.name or e}"})
+            continue
+        for benchmark in benchmarks:
+            if only and only not in benchmark.name:
+                continue
+            results.append(_time(benchmark, repeat))
+
+    try:
+        from espn_stream import decoder_name
+        decoder = decoder_name()
+    except ImportError:
+        decoder = None
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'json_decoder': decoder,
+            'fixtures': fixtures_dir,
+            'archive': archive
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Lines describing each benchmark's median time relative to a baseline run"""
+    previous = {result['name']: result for result in baseline.get('results', []) if 'median_s' in result}
+    lines = []
+    for result in current['results']:
+        before = previous.get(result['name'])
+        if 'median_s' not in result or not before or not before['median_s']:
+            continue
+        ratio = result['median_s'] / before['median_s']
+        lines.append(f"{result['name']:<28} {before['median_s'] * 1000:>10.2f} ms -> "
+                     f"{result['median_s'] * 1000:>10.2f} ms  ({ratio:.2f}x)")
+    return lines
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the ESPN extractors")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument('--only', help="Run benchmarks whose name contains this string")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Fixture directory")
+    parser.add_argument('--regenerate', action='store_true', help="Rebuild the synthetic fixtures")
+    parser.add_argument('--archive', help="Record/replay archive to take fixtures from (espn_replay.py)")
+    parser.add_argument('--output', help="Write results JSON here instead of stdout")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against (printed to stderr)")
+    args = parser.parse_args()
+
+    report = run_suites(max(1, args.repeat), args.only, args.fixtures, args.regenerate, args.archive)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Season analytics over extracted games
+Loads fetch/resolve JSON or backfill JSON Lines output into a GameTable (one
+NumPy array per field) and answers questions about many seasons at once with
+vectorized aggregates instead of per-game Python loops:
+
+- ats_records: against-the-spread and straight-up records per team
+- spread_by_rank_band: size of the line by the favorite's rank, and how often favorites cover
+- home_away_margins: home margins, win and cover rates per season
+
+betting_line is the home team's spread as ESPN reports it (-7.0 = home
+favored by 7), so the home team covers when margin + line > 0.
+
+Usage:
+    python espn_analytics.py games.jsonl --report ats --min-games 10
+    python espn_analytics.py season_2023.json season_2024.json --report all --season 2024
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from espn_models import Game
+
+# ESPN's curatedRank.current for teams outside the Top 25
+UNRANKED = 99
+
+# (label, best rank, worst rank) of the favorite
+RANK_BANDS = (
+    ('1-5', 1, 5),
+    ('6-10', 6, 10),
+    ('11-25', 11, 25),
+    ('unranked', UNRANKED, UNRANKED),
+)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _rank(value) -> int:
+    try:
+        rank = int(value)
+    except (TypeError, ValueError):
+        return UNRANKED
+    return rank if 1 <= rank <= 25 else UNRANKED
+
+
+def _number(value) -> float:
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _season_from_date(game_date: Optional[str]) -> int:
+    """Season year for a kickoff date (January bowls belong to the previous season)"""
+    if not game_date or len(game_date) < 7:
+        return 0
+    try:
+        year, month = int(game_date[:4]), int(game_date[5:7])
+    except ValueError:
+        return 0
+    return year - 1 if month < 7 else year
+
+
+def load_records(paths: Sequence[str]) -> List[Dict]:
+    """
+    Game dicts from fetch/resolve JSON files or backfill JSON Lines files
+
+    Resolve entries without a game are skipped.
+    """
+    records = []
+    for path in paths:
+        with (sys.stdin if path == '-' else open(path, encoding='utf-8')) as f:
+            if path.endswith('.jsonl'):
+                items = (json.loads(line) for line in f if line.strip())
+            else:
+                items = json.load(f)
+            for item in items:
+                if 'matchup' in item and 'game' in item:
+                    item = item['game']
+                if item:
+                    records.append(item)
+    return records
+
+
+class GameTable:
+    """Columnar games: one array per field, row i of every array is the same game"""
+
+    COLUMNS = ('season', 'seasontype', 'week', 'home_id', 'away_id', 'home_rank', 'away_rank',
+               'home_score', 'away_score', 'line', 'completed')
+
+    def __init__(self, columns: Dict[str, np.ndarray], team_names: Optional[Dict[int, str]] = None):
+        self.season = columns['season']
+        self.seasontype = columns['seasontype']
+        self.week = columns['week']
+        self.home_id = columns['home_id']
+        self.away_id = columns['away_id']
+        self.home_rank = columns['home_rank']
+        self.away_rank = columns['away_rank']
+        self.home_score = columns['home_score']
+        self.away_score = columns['away_score']
+        self.line = columns['line']
+        self.completed = columns['completed']
+        self.team_names = team_names or {}
+
+    @classmethod
+    def from_games(cls, games: Iterable[Union[Game, Dict]]) -> 'GameTable':
+        """
+        Build the table from Game records or their to_dict() payloads
+
+        Records without season/seasontype/week (fetch output) get the season
+        from the kickoff date and 0 for the rest.
+        """
+        rows: List[Tuple] = []
+        team_names: Dict[int, str] = {}
+        for game in games:
+            if isinstance(game, Game):
+                game = game.to_dict()
+            home_id = int(game.get('home_team_espn_id') or 0)
+            away_id = int(game.get('away_team_espn_id') or 0)
+            team_names[home_id] = game.get('home_team_name') or team_names.get(home_id, '')
+            team_names[away_id] = game.get('away_team_name') or team_names.get(away_id, '')
+            rows.append((
+                int(game.get('season') or _season_from_date(game.get('game_date'))),
+                int(game.get('seasontype') or 0),
+                int(game.get('week') or 0),
+                home_id,
+                away_id,
+                _rank(game.get('home_team_rank')),
+                _rank(game.get('away_team_rank')),
+                _number(game.get('home_score')),
+                _number(game.get('away_score')),
+                _number(game.get('betting_line')),
+                bool(game.get('is_completed', False)),
+            ))
+
+        dtypes = (np.int16, np.int8, np.int8, np.int32, np.int32, np.int16, np.int16,
+                  np.float64, np.float64, np.float64, np.bool_)
+        values = list(zip(*rows)) if rows else [()] * len(cls.COLUMNS)
+        columns = {name: np.array(column, dtype=dtype)
+                   for name, column, dtype in zip(cls.COLUMNS, values, dtypes)}
+        return cls(columns, team_names)
+
+    @classmethod
+    def from_files(cls, paths: Sequence[str]) -> 'GameTable':
+        """Load fetch/resolve JSON and backfill JSON Lines files into one table"""
+        return cls.from_games(load_records(paths))
+
+    def __len__(self) -> int:
+        return len(self.season)
+
+    def select(self, mask: np.ndarray) -> 'GameTable':
+        """Rows where mask is True"""
+        return GameTable({name: getattr(self, name)[mask] for name in self.COLUMNS}, self.team_names)
+
+    def where(self, seasons: Optional[Iterable[int]] = None, seasontype: Optional[int] = None,
+              team: Optional[int] = None) -> 'GameTable':
+        """Filter by season years, season type and/or a team (home or away)"""
+        mask = np.ones(len(self), dtype=bool)
+        if seasons:
+            mask &= np.isin(self.season, list(seasons))
+        if seasontype:
+            mask &= self.seasontype == seasontype
+        if team:
+            mask &= (self.home_id == team) | (self.away_id == team)
+        return self.select(mask)
+
+    @property
+    def margin(self) -> np.ndarray:
+        """Home score minus away score (NaN until scored)"""
+        return self.home_score - self.away_score
+
+    @property
+    def cover_margin(self) -> np.ndarray:
+        """Home margin against the spread: > 0 home covered, 0 push, < 0 away covered"""
+        return self.margin + self.line
+
+    @property
+    def scored(self) -> np.ndarray:
+        """Completed games with both scores"""
+        return self.completed & ~np.isnan(self.margin)
+
+    @property
+    def graded(self) -> np.ndarray:
+        """Completed games with scores and a line"""
+        return self.scored & ~np.isnan(self.line)
+
+
+def _pct(part, whole):
+    return np.where(whole > 0, part / np.maximum(whole, 1), np.nan)
+
+
+def _round(value, digits: int = 3) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def ats_records(table: GameTable, min_games: int = 0) -> List[Dict]:
+    """
+    Against-the-spread and straight-up records for every team that played
+
+    Args:
+        table: Games to count
+        min_games: Drop teams with fewer graded (lined) games
+
+    Returns:
+        Rows sorted by cover percentage, then graded games, best first
+    """
+    scored = table.scored
+    margin = table.margin[scored]
+    # Each game counts once from each side: the away team's margins are the negation
+    teams = np.concatenate([table.home_id[scored], table.away_id[scored]])
+    margins = np.concatenate([margin, -margin])
+    covers = np.concatenate([table.cover_margin[scored], -table.cover_margin[scored]])
+    lined = ~np.isnan(covers)
+
+    ids, inverse = np.unique(teams, return_inverse=True)
+    size = len(ids)
+    su_wins = np.bincount(inverse[margins > 0], minlength=size)
+    su_losses = np.bincount(inverse[margins < 0], minlength=size)
+    wins = np.bincount(inverse[lined & (covers > 0)], minlength=size)
+    losses = np.bincount(inverse[lined & (covers < 0)], minlength=size)
+    pushes = np.bincount(inverse[lined & (covers == 0)], minlength=size)
+    graded = wins + losses + pushes
+    cover_sum = np.bincount(inverse[lined], weights=covers[lined], minlength=size)
+    cover_pct = _pct(wins, wins + losses)
+    avg_cover = _pct(cover_sum, graded)
+
+    keep = graded >= min_games
+    order = np.lexsort((-graded, -np.nan_to_num(cover_pct, nan=-1.0)))
+    return [{
+        'team_id': int(ids[i]),
+        'team': table.team_names.get(int(ids[i]), ''),
+        'ats_wins': int(wins[i]),
+        'ats_losses': int(losses[i]),
+        'ats_pushes': int(pushes[i]),
+        'cover_pct': _round(cover_pct[i]),
+        'avg_cover_margin': _round(avg_cover[i], 2),
+        'su_wins': int(su_wins[i]),
+        'su_losses': int(su_losses[i]),
+    } for i in order if keep[i]]
+
+
+def spread_by_rank_band(table: GameTable, bands: Sequence[Tuple[str, int, int]] = RANK_BANDS) -> List[Dict]:
+    """
+    Distribution of the line by the favorite's rank, with how often favorites cover
+
+    Pick'em games (line 0) have no favorite and are left out.
+    """
+    lined = ~np.isnan(table.line) & (table.line != 0)
+    home_favored = table.line < 0
+    favorite_rank = np.where(home_favored, table.home_rank, table.away_rank)
+    spread = np.abs(table.line)
+    # Positive when the favorite covered
+    favorite_cover = np.where(home_favored, table.cover_margin, -table.cover_margin)
+    graded = table.graded
+
+    rows = []
+    for label, best, worst in bands:
+        in_band = lined & (favorite_rank >= best) & (favorite_rank <= worst)
+        values = spread[in_band]
+        settled = favorite_cover[in_band & graded]
+        row = {'band': label, 'games': int(values.size)}
+        if values.size:
+            row.update(mean=_round(values.mean(), 2), std=_round(values.std(), 2))
+            row.update({f"p{p}": _round(v, 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))})
+        decided = settled[settled != 0]
+        row['graded'] = int(settled.size)
+        row['favorite_cover_pct'] = _round((decided > 0).mean()) if decided.size else None
+        rows.append(row)
+    return rows
+
+
+def _margin_summary(margin: np.ndarray, cover: np.ndarray, line: np.ndarray) -> Dict:
+    lined = ~np.isnan(cover)
+    decided = cover[lined & (cover != 0)]
+    return {
+        'games': int(margin.size),
+        'home_win_pct': _round((margin > 0).mean()) if margin.size else None,
+        'mean_margin': _round(margin.mean(), 2) if margin.size else None,
+        'median_margin': _round(np.median(margin), 2) if margin.size else None,
+        'mean_expected_margin': _round(-line[lined].mean(), 2) if lined.any() else None,
+        'home_cover_pct': _round((decided > 0).mean()) if decided.size else None,
+    }
+
+
+def home_away_margins(table: GameTable) -> Dict:
+    """
+    Home-field numbers overall and per season
+
+    Neutral-site games aren't flagged in the extracted data, so bowls count
+    the listed home team as home.
+    """
+    scored = table.scored
+    season = table.season[scored]
+    margin = table.margin[scored]
+    cover = table.cover_margin[scored]
+    line = table.line[scored]
+
+    by_season = {}
+    for year in np.unique(season):
+        in_season = season == year
+        by_season[int(year)] = _margin_summary(margin[in_season], cover[in_season], line[in_season])
+    return {'overall': _margin_summary(margin, cover, line), 'by_season': by_season}
+
+
+REPORTS = {
+    'ats': lambda table, args: ats_records(table, args.min_games)[:args.top or None],
+    'spreads': lambda table, args: spread_by_rank_band(table),
+    'home': lambda table, args: home_away_margins(table),
+}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Season analytics over extracted ESPN games")
+    parser.add_argument('paths', nargs='+', help="Fetch/resolve JSON or backfill .jsonl files ('-' for stdin)")
+    parser.add_argument('--report', choices=sorted(REPORTS) + ['all'], default='all')
+    parser.add_argument('--season', type=int, action='append', help="Only these seasons (repeatable)")
+    parser.add_argument('--seasontype', type=int, help="2 = regular season, 3 = postseason")
+    parser.add_argument('--team', type=int, help="Only games involving this ESPN team id")
+    parser.add_argument('--min-games', type=int, default=0, help="ats: minimum graded games per team")
+    parser.add_argument('--top', type=int, help="ats: only the first N teams")
+    args = parser.parse_args()
+
+    table = GameTable.from_files(args.paths).where(args.season, args.seasontype, args.team)
+    names = sorted(REPORTS) if args.report == 'all' else [args.report]
+    output = {name: REPORTS[name](table, args) for name in names}
+    output['games'] = len(table)
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
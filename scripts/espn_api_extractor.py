@@ -6,19 +6,33 @@ Much cleaner and more reliable than web scraping!
 
 Usage:
     python espn_api_extractor.py
+    (non-interactive runs: python espn_cli.py --help)
 """
 
-import requests
+import io
 import json
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import sys
-import mysql.connector
-from mysql.connector import Error
 import os
+from espn_db import DEFAULT_BATCH_SIZE, DEFAULT_POOL_SIZE, pooled_connection, upsert_games
+from espn_export import GamesExporter
+from espn_http import HTTPClient, get_shared_client
+from espn_matchups import MatchupIndex, parse_matchup
+from espn_metrics import export_at_exit, metrics
+from espn_models import Game
+from espn_planner import DEFAULT_DIVISIONS, FetchPlanner, slate_params
+from espn_stream import body_stream, iter_games_with_keys
+from espn_teams import TeamRegistry, get_team_registry
 
 class ESPNAPIExtractor:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HTTPClient] = None, db_pool_size: int = DEFAULT_POOL_SIZE,
+                 teams: Optional[TeamRegistry] = None, divisions: Iterable[str] = DEFAULT_DIVISIONS):
+        self.http = http_client or get_shared_client()
+        # Scoreboards are requested per division (groups=80/81) so slates are complete
+        self.divisions = tuple(divisions)
+        # Team names/logos come from the on-disk registry, never a per-call /teams download
+        self.teams = teams or get_team_registry()
+        self.db_pool_size = db_pool_size
         self.base_url = "https://site.api.espn.com"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -26,39 +40,15 @@ class ESPNAPIExtractor:
         }
         
     def get_logo_url(self, espn_id: int) -> str:
-        """Generate ESPN logo URL from team ID"""
-        return f"https://a.espncdn.com/i/teamlogos/ncaa/500/{espn_id}.png"
+        """ESPN logo URL for a team ID (from the team registry)"""
+        return self.teams.logo_url(espn_id)
     
     def search_team_by_name(self, team_name: str) -> Optional[Dict]:
-        """Search for team by name using ESPN API"""
-        try:
-            # ESPN has a teams endpoint, but searching can be tricky
-            # We'll use a known team ID mapping for common teams
-            # Or search through the schedule
-            url = f"{self.base_url}/apis/site/v2/sports/football/college-football/teams"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                teams = data.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', [])
-                
-                for team in teams:
-                    team_info = team.get('team', {})
-                    display_name = team_info.get('displayName', '')
-                    if team_name.lower() in display_name.lower() or display_name.lower() in team_name.lower():
-                        return {
-                            'id': team_info.get('id'),
-                            'name': display_name,
-                            'abbreviation': team_info.get('abbreviation'),
-                            'logo': team_info.get('logo')
-                        }
-            
-            return None
-        except Exception as e:
-            print(f"[ERROR] Error searching for team {team_name}: {e}")
-            return None
+        """Look a team up by name, abbreviation or alias in the local team registry"""
+        team = self.teams.search(team_name)
+        return team.to_dict() if team else None
     
-    def get_game_by_matchup(self, away_team_name: str, home_team_name: str, date: Optional[str] = None) -> Optional[Dict]:
+    def get_game_by_matchup(self, away_team_name: str, home_team_name: str, date: Optional[str] = None) -> Optional[Game]:
         """
         Get game data from ESPN API
         
@@ -68,228 +58,178 @@ class ESPNAPIExtractor:
             date: Optional date filter (YYYYMMDD format)
         
         Returns:
-            Dictionary with game data
+            Game record (supports game['field'] access like the old dictionaries)
         """
         try:
-            # Get current week's schedule
-            if date:
-                url = f"{self.base_url}/apis/site/v2/sports/football/college-football/scoreboard?dates={date}"
-            else:
-                # Get current week
-                url = f"{self.base_url}/apis/site/v2/sports/football/college-football/scoreboard"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get('events', [])
-                
-                for event in events:
-                    competitions = event.get('competitions', [])
-                    if competitions:
-                        comp = competitions[0]
-                        competitors = comp.get('competitors', [])
-                        
-                        if len(competitors) == 2:
-                            # Determine home/away
-                            home = next((c for c in competitors if c.get('homeAway') == 'home'), None)
-                            away = next((c for c in competitors if c.get('homeAway') == 'away'), None)
-                            
-                            if home and away:
-                                home_team = home.get('team', {})
-                                away_team = away.get('team', {})
-                                
-                                home_name = home_team.get('displayName', '')
-                                away_name = away_team.get('displayName', '')
-                                
-                                # Check if this matches our search
-                                home_match = (home_team_name.lower() in home_name.lower() or 
-                                            home_name.lower() in home_team_name.lower())
-                                away_match = (away_team_name.lower() in away_name.lower() or 
-                                             away_name.lower() in away_team_name.lower())
-                                
-                                if home_match and away_match:
-                                    # Get ranks
-                                    home_rank = home.get('curatedRank', {}).get('current')
-                                    away_rank = away.get('curatedRank', {}).get('current')
-                                    
-                                    # Get betting line (odds)
-                                    odds = comp.get('odds', [])
-                                    betting_line = None
-                                    if odds:
-                                        spread = odds[0].get('spread')
-                                        if spread:
-                                            betting_line = float(spread)
-                                    
-                                    # Get game date
-                                    date_str = comp.get('date', '')
-                                    game_date = None
-                                    if date_str:
-                                        try:
-                                            game_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                                        except:
-                                            game_date = date_str
-                                    
-                                    return {
-                                        'espn_game_id': event.get('id'),
-                                        'away_team_name': away_name,
-                                        'home_team_name': home_name,
-                                        'away_team_espn_id': int(away_team.get('id', 0)),
-                                        'home_team_espn_id': int(home_team.get('id', 0)),
-                                        'away_team_rank': away_rank,
-                                        'home_team_rank': home_rank,
-                                        'away_team_logo_url': self.get_logo_url(int(away_team.get('id', 0))),
-                                        'home_team_logo_url': self.get_logo_url(int(home_team.get('id', 0))),
-                                        'game_date': game_date.isoformat() if isinstance(game_date, datetime) else game_date,
-                                        'betting_line': betting_line,
-                                        'matchup_display': f"{'#' + str(home_rank) + ' ' if home_rank else ''}{home_name} vs {'#' + str(away_rank) + ' ' if away_rank else ''}{away_name}"
-                                    }
-            
-            return None
-            
+            index = self.build_matchup_index(date)
+            return index.lookup(away_team_name, home_team_name)
         except Exception as e:
             print(f"[ERROR] Error getting game: {e}")
             return None
     
-    def insert_games_to_database(self, games: List[Dict], week_id: int, db_config: Dict) -> bool:
+    def build_matchup_index(self, date: Optional[str] = None) -> MatchupIndex:
+        """
+        Fetch the full slate once and index its games by team name, abbreviation and ESPN id
+        
+        Args:
+            date: Optional date filter (YYYYMMDD format), current week if omitted
+        
+        Returns:
+            MatchupIndex whose games are Game records (empty if the scoreboard can't be fetched)
+        """
+        index = MatchupIndex()
+        plan = slate_params({'dates': date} if date else None, self.divisions)
+        try:
+            entries = FetchPlanner(self).fetch_with_keys(plan)
+        except Exception as e:
+            print(f"[WARN] Could not fetch scoreboard: {e}")
+            return index
+        
+        for game, away_keys, home_keys in entries:
+            index.add(game, away_keys, home_keys, game.away_team_name, game.home_team_name)
+        
+        return index
+    
+    def resolve_matchups(self, matchups: List[str], date: Optional[str] = None,
+                         index: Optional[MatchupIndex] = None) -> List[Optional[Game]]:
+        """
+        Resolve many matchup strings against one scoreboard fetch
+        
+        Args:
+            matchups: Strings like "Georgia vs Florida" or "Vanderbilt at Texas"
+            date: Optional date filter (YYYYMMDD format), ignored when index is given
+            index: Previously built MatchupIndex to reuse
+        
+        Returns:
+            Games in the same order as matchups (None where not found)
+        """
+        if index is None:
+            try:
+                index = self.build_matchup_index(date)
+            except Exception as e:
+                print(f"[ERROR] Error getting games: {e}")
+                return [None] * len(matchups)
+        with metrics.timer('match'):
+            return [game for _, game in index.resolve(matchups)]
+    
+    def insert_games_to_database(self, games: List[Dict], week_id: int, db_config: Dict,
+                                 batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
         """
         Insert games directly into MySQL database
         
+        Re-running for the same week updates the existing rows (matched on
+        week_id + home/away team ids) instead of inserting duplicates.
+        
         Args:
-            games: List of game dictionaries
+            games: List of Game records (or game dictionaries)
             week_id: Week ID from Weeks table
             db_config: Dictionary with database connection info
                 {'host': '...', 'port': 3306, 'database': '...', 'user': '...', 'password': '...'}
+            batch_size: Rows written per batch/transaction
         
         Returns:
             True if successful, False otherwise
         """
-        try:
-            connection = mysql.connector.connect(**db_config)
-            cursor = connection.cursor()
-            
-            inserted_count = 0
-            for idx, game in enumerate(games, start=1):
-                sql = """INSERT INTO Games (week_id, game_number, home_team_espn_id, away_team_espn_id, 
-                        home_team_name, away_team_name, home_team_logo_url, away_team_logo_url, 
-                        game_date, betting_line, is_completed)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                
-                values = (
-                    week_id,
-                    idx,
-                    game['home_team_espn_id'],
-                    game['away_team_espn_id'],
-                    game['home_team_name'],
-                    game['away_team_name'],
-                    game['home_team_logo_url'],
-                    game['away_team_logo_url'],
-                    game.get('game_date'),  # May be None
-                    game.get('betting_line'),  # May be None
-                    False  # is_completed
-                )
-                
-                cursor.execute(sql, values)
-                inserted_count += 1
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
-            
-            print(f"\n[SUCCESS] Inserted {inserted_count} games into database!")
-            return True
-            
-        except Error as e:
-            print(f"\n[ERROR] Database insertion failed: {e}")
+        results = self.upsert_games_to_database(games, week_id, db_config, batch_size)
+        if results is None:
             return False
+        
+        inserted = sum(r['inserted'] for r in results)
+        updated = sum(r['updated'] for r in results)
+        unchanged = sum(r['unchanged'] for r in results)
+        print(f"\n[SUCCESS] Inserted {inserted}, updated {updated}, unchanged {unchanged} games in database!")
+        return True
     
-    def generate_sql_inserts(self, games: List[Dict], week_id: int) -> str:
-        """Generate SQL INSERT statements for manual execution"""
-        sql_statements = []
+    def upsert_games_to_database(self, games: List[Dict], week_id: int, db_config: Dict,
+                                 batch_size: int = DEFAULT_BATCH_SIZE) -> Optional[List[Dict[str, int]]]:
+        """
+        Bulk upsert games and report what changed
         
-        for idx, game in enumerate(games, start=1):
-            # Handle None values
-            game_date = f"'{game.get('game_date')}'" if game.get('game_date') else 'NULL'
-            betting_line = str(game.get('betting_line')) if game.get('betting_line') is not None else 'NULL'
-            
-            sql = f"""INSERT INTO Games (week_id, game_number, home_team_espn_id, away_team_espn_id, 
-                    home_team_name, away_team_name, home_team_logo_url, away_team_logo_url, 
-                    game_date, betting_line, is_completed)
-VALUES ({week_id}, {idx}, 
-        {game['home_team_espn_id']}, 
-        {game['away_team_espn_id']}, 
-        '{game['home_team_name'].replace("'", "''")}', 
-        '{game['away_team_name'].replace("'", "''")}', 
-        '{game['home_team_logo_url']}', 
-        '{game['away_team_logo_url']}', 
-        {game_date}, 
-        {betting_line}, 
-        FALSE);"""
-            sql_statements.append(sql)
+        Args:
+            games: List of Game records (or game dictionaries)
+            week_id: Week ID from Weeks table
+            db_config: Dictionary with database connection info
+            batch_size: Rows written per batch/transaction
         
-        return "\n".join(sql_statements)
+        Returns:
+            Per-batch {'batch', 'inserted', 'updated', 'unchanged'} counts, or None on failure
+        """
+        from mysql.connector import Error
+
+        try:
+            with pooled_connection(db_config, self.db_pool_size) as connection:
+                return upsert_games(connection, games, week_id, batch_size)
+        except Error as e:
+            print(f"\n[ERROR] Database insertion failed: {e}")
+            return None
     
-    def search_all_games_this_week(self) -> List[Dict]:
-        """Get all games for the current week"""
+    def generate_sql_inserts(self, games: List, week_id: int) -> str:
+        """Generate multi-row INSERT statements for manual execution (see espn_export.GamesExporter)"""
+        out = io.StringIO()
+        GamesExporter(out, week_id).write(games)
+        return out.getvalue()
+    
+    def search_all_games_this_week(self) -> List[Game]:
+        """Get all games for the current week (every division in self.divisions)"""
         try:
-            url = f"{self.base_url}/apis/site/v2/sports/football/college-football/scoreboard"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get('events', [])
-                games = []
-                
-                for event in events:
-                    competitions = event.get('competitions', [])
-                    if competitions:
-                        comp = competitions[0]
-                        competitors = comp.get('competitors', [])
-                        
-                        if len(competitors) == 2:
-                            home = next((c for c in competitors if c.get('homeAway') == 'home'), None)
-                            away = next((c for c in competitors if c.get('homeAway') == 'away'), None)
-                            
-                            if home and away:
-                                home_team = home.get('team', {})
-                                away_team = away.get('team', {})
-                                
-                                home_rank = home.get('curatedRank', {}).get('current')
-                                away_rank = away.get('curatedRank', {}).get('current')
-                                
-                                odds = comp.get('odds', [])
-                                betting_line = None
-                                if odds:
-                                    spread = odds[0].get('spread')
-                                    if spread:
-                                        betting_line = float(spread)
-                                
-                                games.append({
-                                    'espn_game_id': event.get('id'),
-                                    'away_team_name': away_team.get('displayName', ''),
-                                    'home_team_name': home_team.get('displayName', ''),
-                                    'away_team_espn_id': int(away_team.get('id', 0)),
-                                    'home_team_espn_id': int(home_team.get('id', 0)),
-                                    'away_team_rank': away_rank,
-                                    'home_team_rank': home_rank,
-                                    'away_team_logo_url': self.get_logo_url(int(away_team.get('id', 0))),
-                                    'home_team_logo_url': self.get_logo_url(int(home_team.get('id', 0))),
-                                    'betting_line': betting_line,
-                                    'matchup_display': f"{'#' + str(home_rank) + ' ' if home_rank else ''}{home_team.get('displayName', '')} vs {'#' + str(away_rank) + ' ' if away_rank else ''}{away_team.get('displayName', '')}"
-                                })
-                
-                return games
-            
-            return []
-            
+            return self.get_slate_games()
         except Exception as e:
             print(f"[ERROR] Error getting games: {e}")
             return []
-
+    
+    def get_slate_games(self, params: Optional[Dict] = None, divisions: Optional[Iterable[str]] = None,
+                        max_age: Optional[float] = None) -> List[Game]:
+        """
+        Fetch the complete slate for a scoreboard query, one request per division
+        
+        Args:
+            params: Scoreboard query (None = current week); groups/limit are added per division
+            divisions: 'fbs' and/or 'fcs' (defaults to self.divisions)
+            max_age: Max age in seconds of a cached response (0 = always revalidate)
+        
+        Returns:
+            Games deduplicated by ESPN event id and ordered by kickoff
+        """
+        plan = slate_params(params, self.divisions if divisions is None else divisions)
+        return FetchPlanner(self).fetch(plan, max_age)
+    
+    def get_scoreboard_games(self, params: Optional[Dict] = None, max_age: Optional[float] = None) -> List[Game]:
+        """
+        Fetch one scoreboard page and parse its events
+        
+        Args:
+            params: Scoreboard query, e.g. {'dates': 2024, 'seasontype': 2, 'week': 5, 'groups': 80}
+            max_age: Max age in seconds of a cached response (0 = always revalidate)
+        
+        Returns:
+            List of Game records (raises on HTTP errors instead of returning [])
+        """
+        return [game for game, _, _ in self.get_scoreboard_entries(params, max_age)]
+    
+    def get_scoreboard_entries(self, params: Optional[Dict] = None,
+                               max_age: Optional[float] = None) -> Iterator[Tuple[Game, List[str], List[str]]]:
+        """
+        Like get_scoreboard_games, with each game's team lookup keys
+        
+        Yields:
+            (game, away keys, home keys) per event, as the body is read (raises on HTTP errors)
+        """
+        url = f"{self.base_url}/apis/site/v2/sports/football/college-football/scoreboard"
+        response = self.http.get(url, params=params, headers=self.headers, timeout=10, max_age=max_age,
+                                 stream=True)
+        try:
+            response.raise_for_status()
+            # Events are decoded one at a time off the body stream, so peak memory doesn't grow with the slate
+            with metrics.timer('parse_scoreboard'):
+                yield from iter_games_with_keys(body_stream(response))
+        finally:
+            response.close()
 
 def main():
     """Main function"""
     extractor = ESPNAPIExtractor()
+    export_at_exit()
+    extractor.teams.refresh_if_stale()
     
     # Get games from command line or use default list
     if len(sys.argv) > 1:
@@ -315,49 +255,30 @@ def main():
     print("=" * 60)
     print("\nFetching games from ESPN API...\n")
     
-    # First, get all games this week to search through
-    all_games = extractor.search_all_games_this_week()
-    print(f"Found {len(all_games)} games this week from ESPN API\n")
+    # Fetch this week's slate once and index it by team
+    index = extractor.build_matchup_index()
+    print(f"Found {len(index)} games this week from ESPN API\n")
     
-    # Now search for specific matchups
+    # Now resolve every matchup against the index in one pass
     found_games = []
+    with metrics.timer('match'):
+        resolved = index.resolve(matchups)
     
-    for matchup in matchups:
+    for matchup, game in resolved:
         print(f"Searching: {matchup}...")
         
-        # Parse matchup
-        if " at " in matchup or " @ " in matchup:
-            parts = matchup.split(" at ") if " at " in matchup else matchup.split(" @ ")
-            away_name = parts[0].strip()
-            home_name = parts[1].strip()
-        elif " vs " in matchup or " vs. " in matchup:
-            parts = matchup.split(" vs ") if " vs " in matchup else matchup.split(" vs. ")
-            # For vs, we'll search both orders
-            away_name = parts[0].strip()
-            home_name = parts[1].strip()
-        else:
+        if game is None and parse_matchup(matchup) is None:
             print(f"[ERROR] Could not parse: {matchup}")
             continue
         
-        # Search in the games we found
-        game_found = False
-        for game in all_games:
-            home_match = (home_name.lower() in game['home_team_name'].lower() or 
-                         game['home_team_name'].lower() in home_name.lower())
-            away_match = (away_name.lower() in game['away_team_name'].lower() or 
-                         game['away_team_name'].lower() in away_name.lower())
-            
-            if home_match and away_match:
-                print(f"[OK] Found: {game['matchup_display']}")
-                print(f"    Home: {game['home_team_name']} (ID: {game['home_team_espn_id']}, Rank: {game['home_team_rank'] or 'N/A'})")
-                print(f"    Away: {game['away_team_name']} (ID: {game['away_team_espn_id']}, Rank: {game['away_team_rank'] or 'N/A'})")
-                if game['betting_line']:
-                    print(f"    Line: {game['betting_line']}")
-                found_games.append(game)
-                game_found = True
-                break
-        
-        if not game_found:
+        if game:
+            print(f"[OK] Found: {game['matchup_display']}")
+            print(f"    Home: {game['home_team_name']} (ID: {game['home_team_espn_id']}, Rank: {game['home_team_rank'] or 'N/A'})")
+            print(f"    Away: {game['away_team_name']} (ID: {game['away_team_espn_id']}, Rank: {game['away_team_rank'] or 'N/A'})")
+            if game['betting_line']:
+                print(f"    Line: {game['betting_line']}")
+            found_games.append(game)
+        else:
             print(f"[WARN] Not found in this week's games")
         print()
     
@@ -365,7 +286,7 @@ def main():
         print("\n" + "=" * 60)
         print("GAME DATA (JSON Format):")
         print("=" * 60)
-        print(json.dumps(found_games, indent=2))
+        print(json.dumps([game.to_dict() for game in found_games], indent=2))
         
         print("\n" + "=" * 60)
         print("DATABASE OPTIONS:")
@@ -377,6 +298,11 @@ def main():
         print("\nOption 2: Generate SQL for manual insertion")
         print("  The script will generate SQL INSERT statements you can run manually")
         
+        # Prompts need a terminal; cron/CI runs should use espn_cli.py export-sql / insert
+        if not sys.stdin.isatty():
+            print("\n[INFO] Non-interactive run: skipping database prompts (see espn_cli.py)")
+            return
+        
         # Ask user what they want to do
         print("\n" + "=" * 60)
         response = input("\nAuto-insert to database? (y/n): ").strip().lower()
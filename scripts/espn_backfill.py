@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+ESPN Season Backfill
+Crawls one or more seasons from ESPN's scoreboard API with the date-range
+requests espn_planner.plan_season lays out, concurrently (asyncio over the
+shared pooled HTTP client), paced by the client's adaptive per-host rate
+limit (plus an optional fixed cap), with a resumable per-week checkpoint
+file. Each season's games are split back into scoreboard weeks and handed
+to a sink week by week: a JSON Lines file, a SQL file, or the Games table.
+
+Usage:
+    python espn_backfill.py 2023 2024 --jsonl games.jsonl
+    python espn_backfill.py 2024 --insert --checkpoint backfill_2024.json
+    python espn_backfill.py 2024 --sql season_2024.sql --weeks 1-12 --no-postseason
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from espn_api_extractor import ESPNAPIExtractor
+from espn_export import DEFAULT_CHUNK_SIZE, GamesExporter
+from espn_metrics import export_at_exit, metrics
+from espn_models import Game, season_record
+from espn_planner import (DEFAULT_DIVISIONS, POSTSEASON, REGULAR_SEASON, FetchPlanner, event_key,
+                          parse_divisions, plan_season)
+
+# Weeks.week_number is CHECKed to 1-12, so later regular-season weeks have nowhere to go
+DEFAULT_WEEKS = range(1, 13)
+DEFAULT_CONCURRENCY = 8
+# Optional fixed cap across all workers; by default the HTTP client's adaptive
+# per-host limiter (espn_ratelimit.py) decides how fast ESPN can be crawled
+DEFAULT_RATE = 0.0
+
+
+class Unit(NamedTuple):
+    """One scoreboard week of a season: what a sink stores and the checkpoint records"""
+    season: int
+    seasontype: int
+    week: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.season}-{self.seasontype}-{self.week}"
+
+
+def season_units(seasons: Iterable[int], weeks: Iterable[int] = DEFAULT_WEEKS,
+                 include_postseason: bool = True) -> List[Unit]:
+    """Every week (plus the bowl/playoff slate) of the given seasons"""
+    units = []
+    for season in seasons:
+        units.extend(Unit(season, REGULAR_SEASON, week) for week in weeks)
+        if include_postseason:
+            units.append(Unit(season, POSTSEASON, 1))
+    return units
+
+
+class AsyncRateLimiter:
+    """Token bucket shared by every worker in the event loop"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Checkpoint:
+    """Set of finished unit keys persisted after every week"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get('completed', []))
+
+    def __contains__(self, unit: Unit) -> bool:
+        return unit.key in self.done
+
+    def mark(self, unit: Unit):
+        self.done.add(unit.key)
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'completed': sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+
+# Sinks: callables taking (unit, games) and returning True once the week is stored
+# (False = dropped, so it is not checkpointed and a later run retries it), with an
+# optional close()
+
+class JSONLinesSink:
+    """Append one JSON object per game, tagged with season/seasontype/week"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, unit: Unit, games: List[Game]) -> bool:
+        if not games:
+            return False
+        for game in games:
+            record = season_record(game, unit.season, unit.seasontype, unit.week)
+            self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+class SQLFileSink:
+    """Append multi-row INSERTs per week, resolving week_id from the Weeks table at import time"""
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._exporter = GamesExporter.open(path, week_id=0, fmt='sql', chunk_size=chunk_size, append=True)
+
+    def __call__(self, unit: Unit, games: List[Game]) -> bool:
+        if unit.seasontype != REGULAR_SEASON or not games:
+            return False
+        week_id = f"(SELECT id FROM Weeks WHERE week_number = {unit.week} AND season_year = {unit.season})"
+        self._exporter.comment(f"{unit.season} week {unit.week}")
+        self._exporter.write(games, week_id=week_id)
+        return True
+
+    def close(self):
+        self._exporter.close()
+
+
+class DatabaseSink:
+    """Upsert each week's games into Games (weeks missing from the Weeks table are skipped)"""
+
+    def __init__(self, extractor: ESPNAPIExtractor, db_config: Dict):
+        self.extractor = extractor
+        self.db_config = db_config
+
+    def __call__(self, unit: Unit, games: List[Game]) -> bool:
+        from espn_db import find_week_id, pooled_connection
+
+        if unit.seasontype != REGULAR_SEASON or not games:
+            return False
+        with pooled_connection(self.db_config, self.extractor.db_pool_size) as connection:
+            week_id = find_week_id(connection, unit.week, unit.season)
+        if week_id is None:
+            print(f"[WARN] No Weeks row for {unit.season} week {unit.week}; skipping {len(games)} games")
+            return False
+        if self.extractor.upsert_games_to_database(games, week_id, self.db_config) is None:
+            raise RuntimeError(f"Database write failed for {unit.key}")
+        return True
+
+
+class SeasonBackfill:
+    """Concurrent, rate-limited, resumable crawl over scoreboard weeks"""
+
+    def __init__(self, extractor: Optional[ESPNAPIExtractor] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 checkpoint_path: Optional[str] = None):
+        """
+        Args:
+            extractor: API extractor to fetch with (shares its pooled HTTP client)
+            concurrency: Max scoreboard requests in flight
+            rate: Global request rate limit (requests/second, 0 = unlimited)
+            checkpoint_path: JSON file recording finished weeks so a rerun resumes
+        """
+        self.extractor = extractor or ESPNAPIExtractor()
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.checkpoint = Checkpoint(checkpoint_path)
+
+    def season_plan(self, season: int, include_postseason: bool) -> List[Dict]:
+        """Scoreboard queries covering a season (espn_planner.plan_season)"""
+        return plan_season(season, self.extractor.divisions, include_postseason)
+
+    def fetch_query(self, query: Dict) -> List[Game]:
+        """Blocking fetch for one planned query (run in the executor); truncated ranges are split"""
+        return FetchPlanner(self.extractor, workers=1).fetch([query])
+
+    async def run(self, units: Iterable[Unit], sink: Callable[[Unit, List[Game]], bool]) -> Dict:
+        """
+        Crawl the seasons the units belong to and hand each week's games to sink
+
+        A season's planned queries are fetched concurrently; once all of them are in,
+        the games are grouped by the scoreboard week ESPN files them under and every
+        requested week goes to sink in order.
+
+        Returns:
+            Summary dict with counts of weeks done/skipped/failed, the weeks the sink
+            dropped, and games written
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = AsyncRateLimiter(self.rate, burst=self.concurrency)
+        sink_lock = asyncio.Lock()
+        summary = {'weeks': 0, 'skipped': 0, 'failed': [], 'dropped': [], 'games': 0}
+
+        async def fetch(query: Dict) -> List[Game]:
+            async with semaphore:
+                await limiter.acquire()
+                return await loop.run_in_executor(None, self.fetch_query, query)
+
+        async def store(unit: Unit, games: List[Game]):
+            # Sinks run one at a time so files/transactions never interleave
+            async with sink_lock:
+                try:
+                    written = await loop.run_in_executor(None, sink, unit, games)
+                except Exception as e:
+                    metrics.inc('espn_errors_total', stage='sink')
+                    print(f"[ERROR] {unit.key}: could not write games: {e}")
+                    summary['failed'].append(unit.key)
+                    return
+                if not written:
+                    summary['dropped'].append(unit.key)
+                    return
+                self.checkpoint.mark(unit)
+                metrics.export()
+
+            summary['weeks'] += 1
+            summary['games'] += len(games)
+            print(f"[OK] {unit.season} {'postseason' if unit.seasontype == POSTSEASON else f'week {unit.week}'}: "
+                  f"{len(games)} games")
+
+        async def crawl(season: int, wanted: List[Unit]):
+            plan = self.season_plan(season, any(unit.seasontype == POSTSEASON for unit in wanted))
+            results = await asyncio.gather(*(fetch(query) for query in plan), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                metrics.inc('espn_errors_total', len(errors), stage='fetch_season')
+                print(f"[ERROR] {season}: {len(errors)} of {len(plan)} scoreboard requests failed: {errors[0]}")
+                summary['failed'].extend(unit.key for unit in wanted)
+                return
+
+            # Date ranges overlap after splits and span weeks: dedupe, then file by week
+            weeks: Dict[Unit, List[Game]] = {}
+            seen = set()
+            for games in results:
+                for game in games:
+                    key = event_key(game)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    weeks.setdefault(Unit(season, game.seasontype, game.week), []).append(game)
+            for unit in wanted:
+                games = sorted(weeks.get(unit, []), key=lambda game: game.game_date or '')
+                await store(unit, games)
+
+        by_season: Dict[int, List[Unit]] = {}
+        for unit in units:
+            if unit in self.checkpoint:
+                summary['skipped'] += 1
+            else:
+                by_season.setdefault(unit.season, []).append(unit)
+        await asyncio.gather(*(crawl(season, wanted) for season, wanted in by_season.items()))
+
+        summary['failed'].sort()
+        summary['dropped'].sort()
+        return summary
+
+    def run_sync(self, units: Iterable[Unit], sink: Callable[[Unit, List[Game]], bool]) -> Dict:
+        """Run the crawl from synchronous code"""
+        return asyncio.run(self.run(units, sink))
+
+
+def _parse_weeks(value: str) -> List[int]:
+    """'1-12' or '1,2,5' -> list of week numbers"""
+    weeks = []
+    for part in value.split(','):
+        if '-' in part:
+            start, end = part.split('-', 1)
+            weeks.extend(range(int(start), int(end) + 1))
+        elif part.strip():
+            weeks.append(int(part))
+    return weeks
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Backfill whole seasons of ESPN college football games")
+    parser.add_argument('seasons', nargs='+', type=int, help="Season years, e.g. 2023 2024")
+    parser.add_argument('--weeks', type=_parse_weeks, default=list(DEFAULT_WEEKS), help="e.g. 1-12 or 1,2,5")
+    parser.add_argument('--no-postseason', action='store_true', help="Skip the bowl/playoff slate (always skipped by --sql/--insert)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="Fixed max requests per second (default: adaptive)")
+    parser.add_argument('--checkpoint', help="Checkpoint file for resuming")
+    parser.add_argument('--divisions', type=parse_divisions, default=list(DEFAULT_DIVISIONS),
+                        help="Comma-separated: fbs, fcs (default: fbs)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--jsonl', help="Write games as JSON Lines")
+    output.add_argument('--sql', help="Write INSERT statements")
+    output.add_argument('--insert', action='store_true', help="Upsert into the Games table (DB_* env vars)")
+    args = parser.parse_args()
+
+    extractor = ESPNAPIExtractor(divisions=args.divisions)
+    export_at_exit()
+    # The one place a backfill may download the team listing; lookups while parsing stay offline
+    extractor.teams.refresh_if_stale()
+    if args.jsonl:
+        sink = JSONLinesSink(args.jsonl)
+    elif args.sql:
+        sink = SQLFileSink(args.sql)
+    else:
+        from espn_db import db_config_from_env
+
+        sink = DatabaseSink(extractor, db_config_from_env())
+
+    # Games rows hang off Weeks, which only holds the regular season
+    include_postseason = not args.no_postseason and bool(args.jsonl)
+    units = season_units(args.seasons, args.weeks, include_postseason)
+    backfill = SeasonBackfill(extractor, args.concurrency, args.rate, args.checkpoint)
+
+    print("ESPN Season Backfill")
+    print("=" * 60)
+    print(f"\nCrawling {len(units)} scoreboard weeks from {len(args.seasons)} season(s)...\n")
+
+    try:
+        summary = backfill.run_sync(units, sink)
+    finally:
+        if hasattr(sink, 'close'):
+            sink.close()
+
+    print("\n" + "=" * 60)
+    print(f"Weeks fetched: {summary['weeks']}, skipped (checkpoint): {summary['skipped']}, "
+          f"games: {summary['games']}")
+    if summary['dropped']:
+        print(f"[WARN] Weeks not stored (no games or no Weeks row; not checkpointed): "
+              f"{', '.join(summary['dropped'])}")
+    if summary['failed']:
+        print(f"[WARN] Failed weeks (rerun with the same --checkpoint to retry): {', '.join(summary['failed'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
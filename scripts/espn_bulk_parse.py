@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Bulk parser for archived ESPN schedule and game pages
+Re-derives games from a directory of saved HTML pages. Pages are parsed by a
+pool of worker processes (BeautifulSoup is CPU-bound and holds the GIL, so
+threads don't help), each worker reads its own files and sends back compact
+tuples instead of soups, and results are merged in the parent in file order.
+
+Pages are classified by the URL they were saved from, as recorded in the page
+itself (<link rel="canonical">, else og:url): /college-football/game/_/gameId/N
+is a game page, /college-football/schedule/_/week/W/year/Y/seasontype/T a
+schedule page whose season, season type and week tag its games. File names are
+ignored, and pages with neither URL are skipped. Game pages whose id matches a
+schedule row have their details (betting line, ...) merged into that game.
+Output is the backfill's JSON Lines format (espn_models.season_record).
+
+Usage:
+    python espn_bulk_parse.py pages/2024 --jsonl season_2024.jsonl
+    python espn_bulk_parse.py pages/2024 --workers 8 > season_2024.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from espn_metrics import export_at_exit, metrics
+from espn_models import Game, merge_game_details, season_record
+from espn_planner import REGULAR_SEASON
+
+PAGE_EXTENSIONS = ('.html', '.htm')
+CANONICAL_TAG_RE = re.compile(rb'<link\b[^>]*\brel=["\']canonical["\'][^>]*>', re.IGNORECASE)
+OG_URL_TAG_RE = re.compile(rb'<meta\b[^>]*\bproperty=["\']og:url["\'][^>]*>', re.IGNORECASE)
+TAG_URL_RE = re.compile(rb'\b(?:href|content)=["\']([^"\']+)["\']', re.IGNORECASE)
+HEAD_END = b'</head>'
+# The canonical URL sits in <head>; stop reading a page there (or after this much)
+MAX_HEAD_BYTES = 1024 * 1024
+HEAD_CHUNK_SIZE = 64 * 1024
+# Files per task sent to a worker; amortizes IPC without starving workers at the end
+DEFAULT_CHUNK_SIZE = 4
+
+
+class SchedulePage(NamedTuple):
+    """A saved schedule page and the week it shows (None where its URL doesn't say)"""
+    path: str
+    season: Optional[int]
+    seasontype: Optional[int]
+    week: Optional[int]
+
+
+class Pages(NamedTuple):
+    """Archived pages found under a directory, in sorted path order"""
+    schedules: List[SchedulePage]
+    games: Dict[str, str]
+    unclassified: List[str]
+
+
+# (espn_game_id, away_name, home_name, away_id, home_id, away_rank, home_rank, time_text, betting_line)
+CompactRow = Tuple[Optional[str], str, str, Optional[int], Optional[int], Optional[int], Optional[int],
+                   Optional[str], Optional[float]]
+
+
+def _read_head(path: str) -> bytes:
+    """The page up to </head> (or MAX_HEAD_BYTES)"""
+    head = b''
+    with open(path, 'rb') as f:
+        while len(head) < MAX_HEAD_BYTES:
+            chunk = f.read(HEAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            head += chunk
+            # Overlap the previous chunk so a tag split across reads is still found
+            if HEAD_END in head[-(len(chunk) + len(HEAD_END)):].lower():
+                break
+    return head
+
+
+def page_url(head: bytes) -> Optional[str]:
+    """URL a page was saved from: its canonical link, else its og:url"""
+    for tag_re in (CANONICAL_TAG_RE, OG_URL_TAG_RE):
+        tag = tag_re.search(head)
+        if tag:
+            url = TAG_URL_RE.search(tag.group(0))
+            if url:
+                return url.group(1).decode('utf-8', errors='replace').replace('&amp;', '&')
+    return None
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_url(url: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    ('game', {'gameid': ...}) or ('schedule', {'year', 'week', 'seasontype'...}) for an ESPN URL
+
+    Parameters come from the /_/name/value/... path segments and the query
+    string, with lowercased names. None for any other page.
+    """
+    parts = urlsplit(url)
+    path, _, rest = parts.path.partition('/_/')
+    params = {name.lower(): value for name, value in parse_qsl(parts.query)}
+    segments = [segment for segment in rest.split('/') if segment]
+    params.update((segments[i].lower(), segments[i + 1]) for i in range(0, len(segments) - 1, 2))
+    path = path.rstrip('/')
+    if path.endswith('/college-football/game') and _int(params.get('gameid')) is not None:
+        return 'game', params
+    if path.endswith('/college-football/schedule'):
+        return 'schedule', params
+    return None
+
+
+def find_pages(directory: str) -> Pages:
+    """Schedule pages, {game_id: path} for game pages, and unrecognized pages under directory (recursive)"""
+    schedules = []
+    games = {}
+    unclassified = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.lower().endswith(PAGE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            url = page_url(_read_head(path))
+            kind = classify_url(url) if url else None
+            if kind is None:
+                unclassified.append(path)
+            elif kind[0] == 'game':
+                games.setdefault(str(int(kind[1]['gameid'])), path)
+            else:
+                params = kind[1]
+                week = _int(params.get('week'))
+                seasontype = _int(params.get('seasontype'))
+                if seasontype is None and week is not None:
+                    seasontype = REGULAR_SEASON
+                schedules.append(SchedulePage(path, _int(params.get('year')), seasontype, week))
+    return Pages(schedules, games, unclassified)
+
+
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def parse_schedule_file(path: str) -> List[CompactRow]:
+    """Worker: every game row of one schedule page, ranks already resolved"""
+    from espn_game_extractor import find_page_rank, parse_schedule_rows
+
+    rows = []
+    # No team registry in workers: ids come from team links, names are resolved in the parent
+    for row in parse_schedule_rows(_read(path)):
+        rows.append((row.game_id, row.away_name, row.home_name, row.away_id, row.home_id,
+                     find_page_rank(row.row_text, row.away_name), find_page_rank(row.row_text, row.home_name),
+                     row.time_text, row.betting_line))
+    return rows
+
+
+def parse_game_file(path: str) -> Optional[Dict]:
+    """Worker: detail fields of one game page"""
+    from espn_game_extractor import parse_game_details
+
+    return parse_game_details(_read(path))
+
+
+def _map(function, paths: List[str], pool: Optional[ProcessPoolExecutor], chunk_size: int) -> Iterable:
+    if pool is None:
+        return map(function, paths)
+    return pool.map(function, paths, chunksize=max(1, chunk_size))
+
+
+def parse_pages(pages: Pages, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                teams=None, details: bool = True) -> List[Tuple[SchedulePage, Game]]:
+    """
+    Parse archived pages across a process pool and build Game records
+
+    Args:
+        pages: Pages from find_pages()
+        workers: Worker processes (default: one per CPU; 1 parses in this process)
+        chunk_size: Files handed to a worker per task
+        teams: TeamRegistry used to fill team ids missing from schedule links
+        details: Parse game pages and merge their details into matching games
+
+    Returns:
+        (schedule page, game) in schedule-file order, then row order within each page
+    """
+    workers = workers or os.cpu_count() or 1
+    game_paths = list(pages.games.values()) if details else []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with metrics.timer('bulk_parse'):
+            # Both maps are submitted before either is consumed so all workers stay busy
+            schedule_results = _map(parse_schedule_file, [page.path for page in pages.schedules], pool, chunk_size)
+            detail_results = _map(parse_game_file, game_paths, pool, chunk_size)
+
+            games = []
+            for page, rows in zip(pages.schedules, schedule_results):
+                games.extend((page, Game(espn_game_id=row[0], away_team_name=row[1], home_team_name=row[2],
+                                         away_team_espn_id=row[3], home_team_espn_id=row[4],
+                                         away_team_rank=row[5], home_team_rank=row[6],
+                                         game_date=row[7], betting_line=row[8])) for row in rows)
+            game_details = dict(zip(pages.games, detail_results)) if details else {}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    metrics.inc('espn_pages_parsed_total', len(pages.schedules), kind='schedule')
+    metrics.inc('espn_pages_parsed_total', len(game_paths), kind='game')
+
+    for _, game in games:
+        if teams is not None:
+            for side in ('away', 'home'):
+                if getattr(game, f"{side}_team_espn_id") is None:
+                    team = teams.find(getattr(game, f"{side}_team_name"))
+                    setattr(game, f"{side}_team_espn_id", team.id if team else None)
+        detail = game_details.get(game.espn_game_id)
+        if detail:
+            merge_game_details(game, detail)
+    return games
+
+
+def parse_directory(directory: str, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    teams=None, details: bool = True) -> List[Tuple[SchedulePage, Game]]:
+    """find_pages() + parse_pages() for one directory"""
+    return parse_pages(find_pages(directory), workers, chunk_size, teams, details)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Parse a directory of archived ESPN pages across processes")
+    parser.add_argument('directory', help="Directory of saved schedule and game pages (searched recursively)")
+    parser.add_argument('--jsonl', help="Write games as JSON Lines here instead of stdout")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Files per worker task")
+    parser.add_argument('--no-details', action='store_true', help="Skip game pages")
+    parser.add_argument('--no-registry', action='store_true',
+                        help="Don't look up team ids missing from schedule links in the team registry")
+    args = parser.parse_args()
+
+    export_at_exit()
+    pages = find_pages(args.directory)
+    print(f"[INFO] {len(pages.schedules)} schedule page(s), {len(pages.games)} game page(s)", file=sys.stderr)
+    if pages.unclassified:
+        print(f"[WARN] Skipped {len(pages.unclassified)} page(s) without an ESPN schedule/game URL, "
+              f"e.g. {pages.unclassified[0]}", file=sys.stderr)
+
+    teams = None
+    if not args.no_registry:
+        from espn_teams import get_team_registry
+        teams = get_team_registry()
+        teams.refresh_if_stale()
+
+    games = parse_pages(pages, args.workers, args.chunk_size, teams, not args.no_details)
+    out = open(args.jsonl, 'w', encoding='utf-8') if args.jsonl else sys.stdout
+    try:
+        for page, game in games:
+            out.write(json.dumps(season_record(game, page.season, page.seasontype, page.week)) + '\n')
+    finally:
+        if args.jsonl:
+            out.close()
+    print(f"[OK] {len(games)} game(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
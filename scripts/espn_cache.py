@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for ESPN endpoints
+Responses are keyed by URL + query, kept for a per-endpoint TTL and
+revalidated with ETag/Last-Modified once stale. Concurrent identical requests
+are collapsed into a single fetch and the cache directory is held under a
+byte budget with least-recently-used eviction.
+
+Usage:
+    from espn_cache import ResponseCache
+    client = HTTPClient(cache=ResponseCache('~/.cache/cfb-espn'))
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from espn_metrics import metrics
+
+# (substring of the URL, TTL in seconds); first match wins
+DEFAULT_TTLS = [
+    ('/college-football/teams', 7 * 24 * 3600),  # team list barely changes during a season
+    ('/college-football/scoreboard', 300),
+    ('/college-football/schedule', 300),
+    ('/college-football/game/', 600),
+    ('a.espncdn.com/i/teamlogos', 30 * 24 * 3600),
+]
+DEFAULT_TTL = 60
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cfb-espn')
+# Bytes per read when a streamed body is copied into the cache
+STREAM_CHUNK_SIZE = 64 * 1024
+
+INDEX_FILE = 'index.json'
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a stored body (bytes or an open file)"""
+
+    def __init__(self, url: str, status_code: int, content: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None, from_cache: bool = True, raw=None):
+        self.url = url
+        self.status_code = status_code
+        self._content = content
+        self._raw = raw
+        self.headers = headers or {}
+        self.from_cache = from_cache
+        self.encoding = 'utf-8'
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = self._raw.read() if self._raw is not None else b''
+            self.close()
+            self._raw = None
+        return self._content
+
+    @property
+    def raw(self):
+        """Binary file-like body, read incrementally like a streamed requests.Response.raw"""
+        if self._raw is None:
+            # Once content has been read the file is gone; serve the bytes instead
+            self._raw = io.BytesIO(self.content)
+        return self._raw
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.close()
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            # Import lazily so the cache itself stays dependency free
+            from requests import HTTPError
+            raise HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def cache_dir() -> str:
+    """Directory for cached ESPN data ($ESPN_CACHE_DIR or ~/.cache/cfb-espn)"""
+    return os.getenv('ESPN_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def make_cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Stable key for a URL and its query parameters"""
+    if params:
+        url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()))}"
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache with TTLs, revalidation and single-flight fetching"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[List[Tuple[str, int]]] = None, default_ttl: int = DEFAULT_TTL):
+        """
+        Args:
+            cache_dir: Directory for cached bodies and the index
+            max_bytes: Total body size kept on disk before LRU eviction
+            ttls: List of (url substring, seconds) checked in order
+            default_ttl: TTL for URLs that match nothing in ttls
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl
+        self._lock = threading.RLock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttls:
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def fetch(self, url: str, params: Optional[Dict],
+              fetcher: Callable[[Dict[str, str]], object], max_age: Optional[float] = None,
+              stream: bool = False):
+        """
+        Return a response for url/params, calling fetcher only when needed
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            fetcher: Callable taking extra (conditional) headers and returning a response
+            max_age: Override the endpoint TTL (0 forces revalidation, e.g. for live polling)
+            stream: fetcher returns streamed responses; a 200 body is copied to disk in chunks
+                and every hit is served as an open file (CachedResponse.raw) instead of bytes
+
+        Returns:
+            CachedResponse on a hit, revalidation or streamed 200, otherwise whatever fetcher returned
+        """
+        key = make_cache_key(url, params)
+
+        # Single flight: identical requests wait for the first one and then hit the cache
+        with self._key_lock(key):
+            entry = self._index.get(key)
+            now = time.time()
+
+            ttl = self.ttl_for(url) if max_age is None else min(max_age, self.ttl_for(url))
+            if entry and now - entry['stored_at'] < ttl:
+                cached = self._read(key, entry, stream)
+                if cached is not None:
+                    self.hits += 1
+                    metrics.inc('espn_cache_requests_total', result='hit')
+                    return cached
+
+            conditional = {}
+            if entry:
+                if entry.get('etag'):
+                    conditional['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    conditional['If-Modified-Since'] = entry['last_modified']
+
+            response = fetcher(conditional)
+
+            if response.status_code == 304 and entry:
+                cached = self._read(key, entry, stream)
+                if cached is not None:
+                    with self._lock:
+                        entry['stored_at'] = now
+                        self._save_index()
+                    self.revalidated += 1
+                    metrics.inc('espn_cache_requests_total', result='revalidated')
+                    return cached
+                # The stored body vanished, so a bodiless 304 is useless: fetch it in full
+                if hasattr(response, 'close'):
+                    response.close()
+                response = fetcher({})
+
+            self.misses += 1
+            metrics.inc('espn_cache_requests_total', result='miss')
+            if response.status_code == 200:
+                if stream:
+                    body = self._store_stream(key, url, response)
+                    headers = {'Content-Type': response.headers.get('Content-Type', '')}
+                    return CachedResponse(url, 200, headers=headers, from_cache=False, raw=body)
+                self._store(key, url, response)
+            return response
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save_index()
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def _read(self, key: str, entry: Dict, stream: bool = False) -> Optional[CachedResponse]:
+        try:
+            # An open handle keeps reading fine even if the entry is evicted meanwhile
+            f = open(self._body_path(key), 'rb')
+        except OSError:
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+
+        with self._lock:
+            entry['last_access'] = time.time()
+        headers = {'Content-Type': entry.get('content_type', '')}
+        if stream:
+            return CachedResponse(entry['url'], 200, headers=headers, raw=f)
+        with f:
+            return CachedResponse(entry['url'], 200, f.read(), headers)
+
+    def _store(self, key: str, url: str, response):
+        content = response.content
+        tmp_path = self._body_path(key) + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, self._body_path(key))
+        except OSError as e:
+            print(f"[WARN] Could not write cache entry for {url}: {e}")
+            return
+        self._add_entry(key, url, response, len(content))
+
+    def _store_stream(self, key: str, url: str, response):
+        """
+        Copy a streamed body to disk chunk by chunk (it can't be re-read, so errors propagate)
+
+        Returns:
+            The stored body opened for reading; the handle stays valid even if the
+            entry is evicted right away (e.g. a body larger than max_bytes)
+        """
+        tmp_path = self._body_path(key) + '.tmp'
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, self._body_path(key))
+            # Opened before the entry is indexed (and possibly evicted)
+            body = open(self._body_path(key), 'rb')
+        finally:
+            response.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._add_entry(key, url, response, size)
+        return body
+
+    def _add_entry(self, key: str, url: str, response, size: int):
+        now = time.time()
+        with self._lock:
+            self._index[key] = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_type': response.headers.get('Content-Type', ''),
+                'size': size,
+                'stored_at': now,
+                'last_access': now
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        total = sum(e['size'] for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]['last_access']):
+            self._remove(key)
+            total -= entry['size']
+            if total <= self.max_bytes:
+                break
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Could not save cache index: {e}")
+
+    def flush(self):
+        """Persist access times gathered from cache hits"""
+        with self._lock:
+            self._save_index()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+ESPN college football data CLI
+One non-interactive entry point for cron/CI and shell pipelines. Every
+subcommand takes its options from flags (or DB_* / ESPN_* environment
+variables) and writes JSON to stdout; status lines go to stderr. Heavy
+dependencies (requests, BeautifulSoup, mysql.connector) are only imported by
+the subcommands that use them.
+
+Usage:
+    python espn_cli.py fetch --season 2024 --week 10
+    python espn_cli.py fetch --season 2024 --divisions fbs,fcs > season.json
+    python espn_cli.py resolve "Georgia vs Florida" "Vanderbilt at Texas"
+    python espn_cli.py resolve --source html --file matchups.txt > games.json
+    python espn_cli.py export-sql --input games.json --week-id 42 --output week10.sql
+    python espn_cli.py insert --input games.json --season 2024 --week 10
+    python espn_cli.py poll --week-id 42 --max-polls 1
+    python espn_cli.py insert --input games.json --week-id 42 --snapshot-dir ../Frontend/snapshots/weeks
+    python espn_cli.py score --season 2024 --week 10 --mode su
+    python espn_cli.py --logo-mirror ../Frontend/logos fetch --season 2024 --week 10
+    python espn_cli.py teams --force
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+from espn_planner import DEFAULT_DIVISIONS, parse_divisions
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_UNRESOLVED = 2
+
+
+def _emit(stdout, payload):
+    stdout.write(json.dumps(payload, indent=2, default=str) + '\n')
+    stdout.flush()
+
+
+def _scoreboard_params(args) -> Optional[Dict]:
+    """Scoreboard query from --season/--week/--seasontype/--dates (None = current week)"""
+    params = {}
+    if args.dates:
+        params['dates'] = args.dates
+    elif args.season:
+        params['dates'] = args.season
+    if args.week:
+        params['week'] = args.week
+        params['seasontype'] = args.seasontype
+    return params or None
+
+
+def _extractor(args):
+    from espn_api_extractor import ESPNAPIExtractor
+
+    return ESPNAPIExtractor(divisions=args.divisions)
+
+
+def _mirror_logos(games: List) -> List:
+    """Mirror the games' team logos and emit URLs to the copies (only with ESPN_LOGO_MIRROR set)"""
+    if os.getenv('ESPN_LOGO_MIRROR'):
+        from espn_logos import game_team_ids, mirror_from_env
+
+        mirror = mirror_from_env()
+        counts = mirror.prefetch(game_team_ids(games))
+        mirror.install()
+        print(f"[OK] Logo mirror: {counts['fetched']} fetched, {counts['deduplicated']} deduplicated, "
+              f"{counts['failed']} failed")
+    return games
+
+
+def _slate(args) -> List:
+    """Every game for the scoreboard selection (a whole season for --season alone)"""
+    if args.season and not (args.week or args.dates):
+        from espn_planner import FetchPlanner, plan_season
+
+        return _mirror_logos(FetchPlanner(_extractor(args)).fetch(plan_season(args.season, args.divisions)))
+    return _mirror_logos(_extractor(args).get_slate_games(_scoreboard_params(args)))
+
+
+def _read_matchups(args) -> List[str]:
+    matchups = list(args.matchups or [])
+    if args.file:
+        with (sys.stdin if args.file == '-' else open(args.file)) as f:
+            matchups.extend(line.strip() for line in f if line.strip())
+    return matchups
+
+
+def _load_games(path: str) -> List:
+    """Games from a fetch/resolve JSON output (resolve entries without a game are skipped)"""
+    from espn_models import Game
+
+    with (sys.stdin if path == '-' else open(path)) as f:
+        data = json.load(f)
+    games = []
+    for item in data:
+        if 'matchup' in item and 'game' in item:
+            item = item['game']
+        if item:
+            games.append(Game.from_dict(item))
+    return games
+
+
+def _resolve(args) -> List[Dict]:
+    matchups = _read_matchups(args)
+    if not matchups:
+        raise ValueError("No matchups given (pass them as arguments or with --file)")
+
+    if args.source == 'html':
+        from espn_game_extractor import ESPNGameExtractor
+
+        games = ESPNGameExtractor().resolve_matchups(matchups, args.date)
+    else:
+        games = _extractor(args).resolve_matchups(matchups, args.date)
+    _mirror_logos([game for game in games if game])
+    return [{'matchup': matchup, 'game': game.to_dict() if game else None}
+            for matchup, game in zip(matchups, games)]
+
+
+def _games_for_write(args) -> List:
+    """Games for export-sql/insert: --input file, matchups, or the scoreboard selection"""
+    if args.input:
+        return _mirror_logos(_load_games(args.input))
+    if args.matchups or args.file:
+        from espn_models import Game
+
+        return [Game.from_dict(item['game']) for item in _resolve(args) if item['game']]
+    # Rows go to one week_id, so this is never widened to a whole season
+    return _mirror_logos(_extractor(args).get_slate_games(_scoreboard_params(args)))
+
+
+def _db_config(args) -> Dict:
+    from espn_db import db_config_from_env
+
+    config = db_config_from_env()
+    for key in ('host', 'port', 'database', 'user'):
+        value = getattr(args, f"db_{key}")
+        if value is not None:
+            config[key] = value
+    missing = [key for key in ('host', 'database', 'user') if not config.get(key)]
+    if missing:
+        raise ValueError(f"Missing database settings: {', '.join(missing)} (use --db-* flags or DB_* env vars)")
+    return config
+
+
+def _week_id(args, db_config: Optional[Dict] = None):
+    """--week-id, or the Weeks row for --season/--week"""
+    if args.week_id is not None:
+        return args.week_id
+    if not (args.season and args.week):
+        raise ValueError("Pass --week-id, or --season and --week to look it up")
+    if db_config is None:
+        # No database for file exports: resolve the week when the file is imported
+        return f"(SELECT id FROM Weeks WHERE week_number = {args.week} AND season_year = {args.season})"
+
+    from espn_db import find_week_id, pooled_connection
+
+    with pooled_connection(db_config) as connection:
+        week_id = find_week_id(connection, args.week, args.season)
+    if week_id is None:
+        raise ValueError(f"No Weeks row for {args.season} week {args.week}")
+    return week_id
+
+
+def cmd_fetch(args, stdout) -> int:
+    games = _slate(args)
+    _emit(stdout, [game.to_dict() for game in games])
+    return EXIT_OK
+
+
+def cmd_resolve(args, stdout) -> int:
+    results = _resolve(args)
+    _emit(stdout, results)
+    unresolved = sum(1 for item in results if item['game'] is None)
+    return EXIT_UNRESOLVED if unresolved and args.strict else EXIT_OK
+
+
+def cmd_export_sql(args, stdout) -> int:
+    from espn_export import GamesExporter, load_data_statement
+
+    games = _games_for_write(args)
+    week_id = _week_id(args)
+    with GamesExporter.open(args.output, week_id, args.format, args.chunk_size) as exporter:
+        if exporter.fmt != 'sql' and isinstance(week_id, str):
+            # Delimited rows can't hold a subquery; LOAD DATA sets week_id instead
+            exporter.week_id = 0
+        rows = exporter.write(games)
+
+    summary = {'path': args.output, 'format': exporter.fmt, 'rows': rows, 'week_id': week_id}
+    if exporter.fmt != 'sql':
+        summary['load_data'] = load_data_statement(os.path.abspath(args.output), exporter.fmt,
+                                                   week_id if isinstance(week_id, str) else None)
+    _emit(stdout, summary)
+    return EXIT_OK
+
+
+def cmd_insert(args, stdout) -> int:
+    from espn_db import pooled_connection, upsert_games
+
+    db_config = _db_config(args)
+    games = _games_for_write(args)
+    week_id = _week_id(args, db_config)
+    snapshot = None
+    with pooled_connection(db_config) as connection:
+        batches = upsert_games(connection, games, week_id, args.batch_size)
+        if args.snapshot_dir:
+            from espn_snapshots import snapshot_week
+
+            snapshot = snapshot_week(connection, week_id, args.snapshot_dir)
+
+    _emit(stdout, {
+        'week_id': week_id,
+        'games': len(games),
+        'inserted': sum(batch['inserted'] for batch in batches),
+        'updated': sum(batch['updated'] for batch in batches),
+        'unchanged': sum(batch['unchanged'] for batch in batches),
+        'batches': batches,
+        'snapshot': snapshot
+    })
+    return EXIT_OK
+
+
+def cmd_poll(args, stdout) -> int:
+    from espn_poller import GameDayPoller
+
+    def on_change(games):
+        # One JSON line per poll that changed something
+        stdout.write(json.dumps({'changed': [game.to_dict() for game in games]}) + '\n')
+        stdout.flush()
+
+    poller = GameDayPoller(args.week_id, _db_config(args), extractor=_extractor(args),
+                           params=_scoreboard_params(args),
+                           poll_interval=args.interval, on_change=on_change,
+                           snapshot_dir=args.snapshot_dir)
+    poller.run(max_polls=args.max_polls)
+    return EXIT_OK
+
+
+def cmd_score(args, stdout) -> int:
+    from espn_db import pooled_connection
+    from espn_scoring import settle_week
+
+    db_config = _db_config(args)
+    week_id = _week_id(args, db_config)
+    with pooled_connection(db_config) as connection:
+        summary = settle_week(connection, week_id, args.mode, args.batch_size, args.dry_run)
+    summary['standings'] = summary['standings'][:args.top or None]
+    _emit(stdout, summary)
+    return EXIT_OK
+
+
+def cmd_teams(args, stdout) -> int:
+    from espn_teams import get_team_registry
+
+    teams = get_team_registry()
+    refreshed = teams.refresh() if args.force else teams.refresh_if_stale()
+    _emit(stdout, {'teams': len(teams), 'refreshed': refreshed, 'fetched_at': teams.fetched_at,
+                   'path': teams.path})
+    return EXIT_OK if len(teams) else EXIT_ERROR
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="ESPN college football games: fetch, resolve, export, insert, poll, score, teams")
+    parser.add_argument('--replay', metavar='ARCHIVE', help="Serve ESPN responses from an archive (ESPN_REPLAY)")
+    parser.add_argument('--record', metavar='ARCHIVE', help="Record ESPN responses into an archive (ESPN_RECORD)")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the on-disk HTTP cache")
+    parser.add_argument('--metrics-json', help="Write run metrics as JSON here (ESPN_METRICS_JSON)")
+    parser.add_argument('--metrics-prom', help="Write run metrics as a Prometheus textfile (ESPN_METRICS_PROM)")
+    parser.add_argument('--logo-mirror', metavar='DIR',
+                        help="Mirror team logos into DIR and emit URLs to the copies (ESPN_LOGO_MIRROR)")
+    parser.add_argument('--logo-base-url', help="URL prefix DIR is served under, default /logos (ESPN_LOGO_BASE_URL)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def scoreboard_options(sub):
+        sub.add_argument('--season', type=int, help="Season year")
+        sub.add_argument('--week', type=int, help="Week number within the season")
+        sub.add_argument('--seasontype', type=int, default=2, help="2 = regular season, 3 = postseason")
+        sub.add_argument('--dates', help="Scoreboard date or range (YYYYMMDD or YYYYMMDD-YYYYMMDD)")
+
+    def division_option(sub):
+        sub.add_argument('--divisions', type=parse_divisions, default=list(DEFAULT_DIVISIONS),
+                         help="Scoreboard divisions, comma-separated: fbs, fcs (default: fbs)")
+
+    def matchup_options(sub):
+        sub.add_argument('matchups', nargs='*', help='e.g. "Georgia vs Florida" "Vanderbilt at Texas"')
+        sub.add_argument('--file', help="Read matchups from a file, one per line ('-' for stdin)")
+        sub.add_argument('--source', choices=('api', 'html'), default='api',
+                         help="Resolve against the scoreboard API or the schedule page")
+        sub.add_argument('--date', help="Restrict to a date (YYYYMMDD)")
+
+    def snapshot_option(sub):
+        sub.add_argument('--snapshot-dir', default=os.getenv('ESPN_SNAPSHOT_DIR'),
+                         help="Write the week's static JSON snapshot here after writing (ESPN_SNAPSHOT_DIR)")
+
+    def db_options(sub):
+        sub.add_argument('--db-host', help="Defaults to DB_HOST")
+        sub.add_argument('--db-port', type=int, help="Defaults to DB_PORT or 3306")
+        sub.add_argument('--db-database', help="Defaults to DB_NAME")
+        sub.add_argument('--db-user', help="Defaults to DB_USER (password only from DB_PASSWORD)")
+
+    fetch = commands.add_parser('fetch', help="Print every game of a week, date range or season")
+    scoreboard_options(fetch)
+    division_option(fetch)
+    fetch.set_defaults(handler=cmd_fetch)
+
+    resolve = commands.add_parser('resolve', help="Resolve matchup strings to games")
+    matchup_options(resolve)
+    division_option(resolve)
+    resolve.add_argument('--strict', action='store_true', help="Exit with status 2 if any matchup is not found")
+    resolve.set_defaults(handler=cmd_resolve)
+
+    for name, handler, help_text in (('export-sql', cmd_export_sql, "Write games as SQL or a LOAD DATA file"),
+                                     ('insert', cmd_insert, "Upsert games into the Games table")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('--input', help="Games JSON from fetch/resolve ('-' for stdin)")
+        matchup_options(sub)
+        scoreboard_options(sub)
+        division_option(sub)
+        sub.add_argument('--week-id', type=int, help="Week ID from Weeks table (else looked up from --season/--week)")
+        sub.set_defaults(handler=handler)
+        if name == 'export-sql':
+            sub.add_argument('--output', required=True, help="Output file (.sql, .tsv or .csv)")
+            sub.add_argument('--format', choices=('sql', 'tsv', 'csv'), help="Defaults to the file extension")
+            sub.add_argument('--chunk-size', type=int, default=500, help="Rows per INSERT statement")
+        else:
+            sub.add_argument('--batch-size', type=int, default=500, help="Rows per transaction")
+            snapshot_option(sub)
+            db_options(sub)
+
+    poll = commands.add_parser('poll', help="Keep a week's games current on game day")
+    poll.add_argument('--week-id', type=int, required=True, help="Week ID from Weeks table")
+    scoreboard_options(poll)
+    division_option(poll)
+    poll.add_argument('--interval', type=float, default=60, help="Seconds between polls while games are live")
+    poll.add_argument('--max-polls', type=int, help="Stop after this many polls")
+    snapshot_option(poll)
+    db_options(poll)
+    poll.set_defaults(handler=cmd_poll)
+
+    score = commands.add_parser('score', help="Grade a week's picks and write standings")
+    score.add_argument('--week-id', type=int, help="Week ID from Weeks table (else looked up from --season/--week)")
+    score.add_argument('--season', type=int, help="Season year")
+    score.add_argument('--week', type=int, help="Week number within the season")
+    score.add_argument('--mode', choices=('su', 'ats'), default='su',
+                       help="Grade stored in UserPicks.is_correct: su (winner) or ats (spread)")
+    score.add_argument('--batch-size', type=int, default=500, help="Pick ids per UPDATE")
+    score.add_argument('--dry-run', action='store_true', help="Grade and print without writing")
+    score.add_argument('--top', type=int, help="Only print the first N standings rows")
+    db_options(score)
+    score.set_defaults(handler=cmd_score)
+
+    teams = commands.add_parser('teams', help="Download the ESPN team registry if missing or a week old")
+    teams.add_argument('--force', action='store_true', help="Download even if the stored copy is fresh")
+    teams.set_defaults(handler=cmd_teams)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function"""
+    args = build_parser().parse_args(argv)
+
+    # The shared HTTP client and metrics read these when first used
+    for value, variable in ((args.replay, 'ESPN_REPLAY'), (args.record, 'ESPN_RECORD'),
+                            (args.metrics_json, 'ESPN_METRICS_JSON'), (args.metrics_prom, 'ESPN_METRICS_PROM'),
+                            (args.logo_mirror, 'ESPN_LOGO_MIRROR'), (args.logo_base_url, 'ESPN_LOGO_BASE_URL')):
+        if value:
+            os.environ[variable] = value
+    if args.no_cache:
+        os.environ['ESPN_HTTP_CACHE'] = '0'
+
+    from espn_metrics import export_at_exit
+
+    export_at_exit()
+
+    # Library status lines go to stderr so stdout stays machine-readable
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            return args.handler(args, stdout)
+        except KeyboardInterrupt:
+            return EXIT_ERROR
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            _emit(stdout, {'error': str(e), 'command': args.command})
+            return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
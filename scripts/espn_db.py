@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Database helpers for writing extracted games to the Games table
+Writes are idempotent: rows are matched on (week_id, home team, away team), new
+rows go out as batched multi-row INSERTs, changed rows are rewritten with one
+UPDATE per batch and identical rows are skipped, so re-running an extraction
+never duplicates a week's games or moves a matchup onto another game's row.
+
+Connections come from a per-config mysql.connector pool that lives for the
+whole process, so loops over weeks or repeated syncs only authenticate once.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from espn_metrics import metrics
+from espn_models import GAMES_COLUMNS, game_row
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_POOL_SIZE = 5
+DEFAULT_CHECKOUT_TIMEOUT = 30
+
+_pools: Dict[Tuple, object] = {}
+_pools_lock = threading.Lock()
+
+# Columns compared/updated for an existing row. Rows are matched on the teams, so
+# the ids never change; game_number belongs to the admin ordering and is left
+# alone; is_completed is left to the poller so re-running an extraction never
+# flips a finished game back to FALSE.
+_UPDATE_COLUMNS = ('home_team_name', 'away_team_name', 'home_team_logo_url', 'away_team_logo_url',
+                   'game_date', 'betting_line')
+
+INSERT_GAMES_SQL = (
+    f"INSERT INTO Games ({', '.join(GAMES_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(GAMES_COLUMNS))})"
+)
+
+SELECT_WEEK_ID_SQL = "SELECT id FROM Weeks WHERE week_number = %s AND season_year = %s"
+
+SELECT_WEEK_GAMES_SQL = (
+    f"SELECT id, game_number, home_team_espn_id, away_team_espn_id, {', '.join(_UPDATE_COLUMNS)} "
+    "FROM Games WHERE week_id = %s"
+)
+
+
+def update_games_sql(count: int) -> str:
+    """One UPDATE rewriting _UPDATE_COLUMNS for count rows by Games.id (CASE per column)"""
+    cases = ', '.join(f"{col} = CASE id {' '.join(['WHEN %s THEN %s'] * count)} END" for col in _UPDATE_COLUMNS)
+    return f"UPDATE Games SET {cases} WHERE id IN ({', '.join(['%s'] * count)})"
+
+
+def update_games_params(updates: List[Tuple]) -> List:
+    """Parameters for update_games_sql(len(updates)) from (game_id, values...) tuples"""
+    params = []
+    for column in range(len(_UPDATE_COLUMNS)):
+        for update in updates:
+            params.extend((update[0], update[1 + column]))
+    params.extend(update[0] for update in updates)
+    return params
+
+
+def db_config_from_env() -> Dict:
+    """Connection settings from DB_HOST / DB_PORT / DB_NAME / DB_USER / DB_PASSWORD"""
+    return {
+        'host': os.getenv('DB_HOST'),
+        'port': int(os.getenv('DB_PORT', '3306')),
+        'database': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD')
+    }
+
+
+def _pool_key(db_config: Dict) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in db_config.items()))
+
+
+def get_pool(db_config: Dict, pool_size: int = DEFAULT_POOL_SIZE):
+    """
+    Process-wide connection pool for a database config (created on first use)
+
+    Args:
+        db_config: mysql.connector connection arguments
+        pool_size: Max open connections in the pool (mysql.connector caps this at 32)
+    """
+    key = _pool_key(db_config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            from mysql.connector import pooling
+
+            pool = pooling.MySQLConnectionPool(pool_name=f"cfb_games_{len(_pools) + 1}",
+                                               pool_size=pool_size,
+                                               pool_reset_session=True,
+                                               **db_config)
+            _pools[key] = pool
+        return pool
+
+
+@contextmanager
+def pooled_connection(db_config: Dict, pool_size: int = DEFAULT_POOL_SIZE,
+                      checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT):
+    """
+    Check a healthy connection out of the pool and return it afterwards
+
+    Usage:
+        with pooled_connection(db_config) as connection:
+            upsert_games(connection, games, week_id)
+    """
+    from mysql.connector.errors import PoolError
+
+    pool = get_pool(db_config, pool_size)
+    deadline = time.monotonic() + checkout_timeout
+    while True:
+        try:
+            connection = pool.get_connection()
+            break
+        except PoolError:
+            # Every connection is checked out; wait for one to come back
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    try:
+        # Health check: transparently reconnect connections the server dropped while idle
+        connection.ping(reconnect=True, attempts=2, delay=0)
+        yield connection
+    finally:
+        # close() on a pooled connection hands it back to the pool
+        connection.close()
+
+
+def mysql_datetime(value):
+    """Normalize DATETIME values and ISO strings to 'YYYY-MM-DD HH:MM:SS' (UTC)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def _comparable(values: Tuple) -> Tuple:
+    """Values for _UPDATE_COLUMNS in a form that compares equal across Python and MySQL types"""
+    (home_name, away_name, home_logo, away_logo, game_date, betting_line) = values
+    return (
+        home_name,
+        away_name,
+        home_logo,
+        away_logo,
+        mysql_datetime(game_date),
+        round(float(betting_line), 1) if betting_line is not None else None
+    )
+
+
+def _batches(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _team_key(home_id, away_id) -> Tuple:
+    return (int(home_id) if home_id is not None else None, int(away_id) if away_id is not None else None)
+
+
+def upsert_games(connection, games: List, week_id: int, batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, int]]:
+    """
+    Idempotently write a week's games
+
+    Existing rows are matched on (week_id, home_team_espn_id, away_team_espn_id),
+    so a rerun never moves a matchup onto another game's Games.id (which
+    UserPicks reference), even after the week was reordered on the admin
+    page. Matched rows keep their game_number; new games are numbered after
+    the week's current last game, in list order.
+
+    Args:
+        connection: Open DB-API connection (mysql.connector or compatible, %s paramstyle)
+        games: Game records or game dictionaries
+        week_id: Week ID from Weeks table
+        batch_size: Rows per batch; each batch is committed in its own transaction
+
+    Returns:
+        One {'batch', 'inserted', 'updated', 'unchanged'} dict per batch
+    """
+    cursor = connection.cursor()
+    try:
+        # One round trip to learn what the week already holds
+        cursor.execute(SELECT_WEEK_GAMES_SQL, (week_id,))
+        existing = {}
+        last_number = 0
+        for row in cursor.fetchall():
+            game_id, game_number, home_id, away_id = row[:4]
+            existing.setdefault(_team_key(home_id, away_id), (int(game_id), _comparable(tuple(row[4:]))))
+            last_number = max(last_number, int(game_number or 0))
+
+        rows = []
+        seen = set()
+        for game in games:
+            row = game_row(game, week_id, 0)
+            key = _team_key(row[2], row[3])
+            if key in seen:
+                continue  # the same matchup listed twice
+            seen.add(key)
+            rows.append(row)
+
+        results = []
+        for batch_number, batch in enumerate(_batches(rows, max(1, batch_size)), start=1):
+            inserts = []
+            updates = []
+            unchanged = 0
+
+            for row in batch:
+                values = row[4:-1]
+                current = existing.get(_team_key(row[2], row[3]))
+                if current is None:
+                    last_number += 1
+                    inserts.append((week_id, last_number) + row[2:])
+                elif current[1] != _comparable(values):
+                    updates.append((current[0],) + values)
+                else:
+                    unchanged += 1
+
+            with metrics.timer('db_upsert'):
+                try:
+                    if inserts:
+                        # mysql.connector rewrites executemany INSERTs into one multi-row statement
+                        cursor.executemany(INSERT_GAMES_SQL, inserts)
+                    if updates:
+                        cursor.execute(update_games_sql(len(updates)), update_games_params(updates))
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+
+            metrics.inc('espn_db_rows_total', len(inserts), table='Games', action='inserted')
+            metrics.inc('espn_db_rows_total', len(updates), table='Games', action='updated')
+            metrics.inc('espn_db_rows_total', unchanged, table='Games', action='unchanged')
+
+            results.append({
+                'batch': batch_number,
+                'inserted': len(inserts),
+                'updated': len(updates),
+                'unchanged': unchanged
+            })
+
+        return results
+    finally:
+        cursor.close()
+
+
+def find_week_id(connection, week_number: int, season_year: int) -> Optional[int]:
+    """Look up the Weeks.id for a season's week (None if the week hasn't been created)"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SELECT_WEEK_ID_SQL, (week_number, season_year))
+        row = cursor.fetchone()
+        return int(row[0]) if row else None
+    finally:
+        cursor.close()
+
+
+SELECT_WEEK_STATE_SQL = (
+    "SELECT g.id, g.home_team_espn_id, g.away_team_espn_id, g.is_completed, g.betting_line, "
+    "r.home_team_score, r.away_team_score "
+    "FROM Games g LEFT JOIN GameResults r ON r.game_id = g.id "
+    "WHERE g.week_id = %s"
+)
+
+UPDATE_GAME_STATUS_SQL = "UPDATE Games SET is_completed = %s, betting_line = %s WHERE id = %s"
+
+UPSERT_GAME_RESULT_SQL = (
+    "INSERT INTO GameResults (game_id, home_team_score, away_team_score, winning_team_espn_id, winning_team_name) "
+    "VALUES (%s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE home_team_score = VALUES(home_team_score), "
+    "away_team_score = VALUES(away_team_score), "
+    "winning_team_espn_id = VALUES(winning_team_espn_id), "
+    "winning_team_name = VALUES(winning_team_name)"
+)
+
+
+def load_week_state(connection, week_id: int) -> Dict[Tuple[int, int], Tuple]:
+    """
+    Current stored state of a week's games
+
+    Returns:
+        {(home_team_espn_id, away_team_espn_id): (game_id, is_completed, betting_line,
+                                                   home_score, away_score)}
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SELECT_WEEK_STATE_SQL, (week_id,))
+        state = {}
+        for game_id, home_id, away_id, is_completed, betting_line, home_score, away_score in cursor.fetchall():
+            state[(int(home_id), int(away_id))] = (
+                int(game_id),
+                bool(is_completed),
+                round(float(betting_line), 1) if betting_line is not None else None,
+                home_score,
+                away_score
+            )
+        return state
+    finally:
+        cursor.close()
+
+
+def write_game_status(connection, status_rows: List[Tuple], result_rows: List[Tuple]):
+    """
+    Write changed game status and final results in one transaction
+
+    Args:
+        status_rows: (is_completed, betting_line, game_id) tuples for Games
+        result_rows: (game_id, home_score, away_score, winning_team_espn_id, winning_team_name)
+            tuples for GameResults
+    """
+    cursor = connection.cursor()
+    try:
+        with metrics.timer('db_status'):
+            if status_rows:
+                cursor.executemany(UPDATE_GAME_STATUS_SQL, status_rows)
+            if result_rows:
+                cursor.executemany(UPSERT_GAME_RESULT_SQL, result_rows)
+            connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    metrics.inc('espn_db_rows_total', len(status_rows), table='Games', action='updated')
+    metrics.inc('espn_db_rows_total', len(result_rows), table='GameResults', action='upserted')
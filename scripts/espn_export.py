@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Streaming file export of Games rows
+Games are written as they arrive, so memory stays flat however many weeks a
+backfill covers. Two formats:
+
+- sql: chunked multi-row INSERT statements (one statement per chunk_size rows)
+- tsv/csv: delimited rows for MySQL's LOAD DATA, escaped with its defaults
+  (backslash escapes, \\N for NULL); see load_data_statement()
+
+Usage:
+    with GamesExporter.open('week10.sql', week_id=42) as exporter:
+        exporter.write(games)
+"""
+
+import os
+from typing import Iterable, Optional, TextIO, Union
+
+from espn_db import mysql_datetime
+from espn_models import GAMES_COLUMNS, game_row
+
+DEFAULT_CHUNK_SIZE = 500
+FORMATS = ('sql', 'tsv', 'csv')
+DELIMITERS = {'tsv': '\t', 'csv': ','}
+
+# Raw SQL expression (e.g. a Weeks subquery) or an id
+WeekId = Union[int, str]
+
+_SQL_ESCAPES = str.maketrans({'\\': '\\\\', "'": "''", '\0': '\\0', '\n': '\\n', '\r': '\\r', '\x1a': '\\Z'})
+_FIELD_ESCAPES = {'\\': '\\\\', '\0': '\\0', '\n': '\\n', '\r': '\\r', '\t': '\\t', '\x1a': '\\Z'}
+
+
+def sql_literal(value) -> str:
+    """MySQL literal for a Python value"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return f"'{str(value).translate(_SQL_ESCAPES)}'"
+
+
+def delimited_field(value, delimiter: str) -> str:
+    """LOAD DATA field with the default ESCAPED BY '\\\\' rules (delimiter escaped too)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    escapes = dict(_FIELD_ESCAPES)
+    escapes[delimiter] = '\\' + delimiter
+    return str(value).translate(str.maketrans(escapes))
+
+
+def load_data_statement(path: str, fmt: str = 'tsv', week_id: Optional[WeekId] = None) -> str:
+    """
+    LOAD DATA statement matching a file written by GamesExporter
+
+    Args:
+        path: Path of the exported file as seen by the MySQL client
+        fmt: 'tsv' or 'csv'
+        week_id: Rows are written with this week_id already; pass a SQL expression
+            to override it at load time instead (e.g. a Weeks subquery)
+    """
+    delimiter = '\\t' if fmt == 'tsv' else ','
+    columns = list(GAMES_COLUMNS)
+    set_clause = ''
+    if isinstance(week_id, str):
+        columns[0] = '@week_id'
+        set_clause = f"\nSET week_id = {week_id}"
+    return (f"LOAD DATA LOCAL INFILE {sql_literal(path)}\nINTO TABLE Games\n"
+            f"FIELDS TERMINATED BY '{delimiter}' ESCAPED BY '\\\\'\nLINES TERMINATED BY '\\n'\n"
+            f"({', '.join(columns)}){set_clause};")
+
+
+class GamesExporter:
+    """Write Games rows to a text file incrementally, numbering games across write() calls"""
+
+    def __init__(self, out: TextIO, week_id: WeekId, fmt: str = 'sql', chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            out: Open text file (owned by the caller unless created via open())
+            week_id: Week ID from Weeks table; for sql, a string is emitted verbatim as an expression
+            fmt: 'sql', 'tsv' or 'csv'
+            chunk_size: Rows per multi-row INSERT (sql only)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        self.out = out
+        self.week_id = week_id
+        self.fmt = fmt
+        self.chunk_size = max(1, chunk_size)
+        self.rows_written = 0
+        self._owns_file = False
+
+    @classmethod
+    def open(cls, path: str, week_id: WeekId, fmt: Optional[str] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE, append: bool = False) -> 'GamesExporter':
+        """Open path for writing; the format defaults to the file extension (.sql/.tsv/.csv)"""
+        if fmt is None:
+            extension = os.path.splitext(path)[1].lstrip('.').lower()
+            fmt = extension if extension in FORMATS else 'sql'
+        # newline='' so '\n' is written as-is, which is what LINES TERMINATED BY expects
+        exporter = cls(open(path, 'a' if append else 'w', encoding='utf-8', newline=''), week_id, fmt, chunk_size)
+        exporter._owns_file = True
+        return exporter
+
+    def write(self, games: Iterable, week_id: Optional[WeekId] = None) -> int:
+        """
+        Append games (Game records or dictionaries), consuming the iterable lazily
+
+        Args:
+            games: Games in game_number order
+            week_id: Override the exporter's week_id for these games (numbering restarts at 1)
+
+        Returns:
+            Number of rows written
+        """
+        if week_id is not None:
+            self.week_id = week_id
+            self.rows_written = 0
+
+        start = self.rows_written
+        if self.fmt == 'sql':
+            self._write_sql(games)
+        else:
+            self._write_delimited(games, DELIMITERS[self.fmt])
+        self.out.flush()
+        return self.rows_written - start
+
+    def _values(self, game) -> tuple:
+        self.rows_written += 1
+        row = game_row(game, self.week_id, self.rows_written)
+        # DATETIME literal without the ISO 'T'/offset, in UTC
+        return row[:8] + (mysql_datetime(row[8]),) + row[9:]
+
+    def _write_sql(self, games: Iterable):
+        week_sql = self.week_id if isinstance(self.week_id, str) else sql_literal(self.week_id)
+        header = f"INSERT INTO Games ({', '.join(GAMES_COLUMNS)}) VALUES\n"
+        chunk = []
+        for game in games:
+            values = self._values(game)
+            chunk.append('(' + ', '.join([week_sql] + [sql_literal(value) for value in values[1:]]) + ')')
+            if len(chunk) >= self.chunk_size:
+                self.out.write(header + ',\n'.join(chunk) + ';\n')
+                chunk = []
+        if chunk:
+            self.out.write(header + ',\n'.join(chunk) + ';\n')
+
+    def _write_delimited(self, games: Iterable, delimiter: str):
+        if isinstance(self.week_id, str):
+            raise ValueError("Delimited exports need a numeric week_id (use load_data_statement(week_id=...) "
+                             "to set it from an expression at load time)")
+        for game in games:
+            self.out.write(delimiter.join(delimited_field(value, delimiter) for value in self._values(game)) + '\n')
+
+    def comment(self, text: str):
+        """Write a comment line (sql only; delimited files can't carry comments)"""
+        if self.fmt == 'sql':
+            self.out.write(f"-- {text}\n")
+
+    def close(self):
+        if self._owns_file:
+            self.out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_games(games: Iterable, path: str, week_id: WeekId, fmt: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write games to path in one call; returns the number of rows written"""
+    with GamesExporter.open(path, week_id, fmt, chunk_size) as exporter:
+        return exporter.write(games)
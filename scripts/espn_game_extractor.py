@@ -11,60 +11,228 @@ Usage:
     python espn_game_extractor.py "Georgia vs Florida" "Alabama at South Carolina"
 """
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import io
 import re
 import json
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from espn_export import GamesExporter
+from espn_http import HTTPClient, get_shared_client
+from espn_matchups import MatchupIndex, normalize_team_name
+from espn_metrics import export_at_exit, metrics
+from espn_models import GAMES_COLUMNS, Game, game_row, merge_game_details
+from espn_teams import TEAM_ID_URL_RE, TeamRegistry, get_team_registry
+
+# lxml's C parser is several times faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Only build the parts of each page we actually read
+SCHEDULE_ROW_STRAINER = SoupStrainer('tr', class_=lambda x: x and 'Table__TR' in x)
+JSON_SCRIPT_STRAINER = SoupStrainer('script', type='application/json')
+
+TEAM_HREF_RE = re.compile(r'/team/|/college-football/team/')
+GAME_HREF_RE = re.compile(r'/game/')
+GAME_ID_RE = re.compile(r'/game/_/gameId/(\d+)')
+RANK_RE = re.compile(r'#?(\d+)|\((\d+)\)')
+RANK_HASH_RE = re.compile(r'#\d+\s*')
+RANK_PAREN_RE = re.compile(r'\(\d+\)\s*')
+MATCHUP_AT_RE = re.compile(r'\s+at\s+|\s+@\s+', re.IGNORECASE)
+MATCHUP_VS_RE = re.compile(r'\s+vs\.?\s+', re.IGNORECASE)
+TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+DATE_RE = re.compile(r'\d{1,2}/\d{1,2}')
+NUMBER_RE = re.compile(r'([+-]?\d+\.?\d*)')
+# First visible text node mentioning the line (script/style bodies are stripped first)
+ODDS_TEXT_RE = re.compile(r'>([^<>]*(?:Spread|Line|Favorite)[^<>]*)<')
+RANKED_WORD_RE = re.compile(r'#(\d+)\s+(\S+)')
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def make_soup(markup, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse markup with the fastest available backend, optionally restricted by a strainer"""
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
+
+
+class ScheduleRow(NamedTuple):
+    """One game row from the schedule table"""
+    away_name: str
+    home_name: str
+    away_id: Optional[int]
+    home_id: Optional[int]
+    game_id: Optional[str]
+    time_text: Optional[str]
+    betting_line: Optional[float]
+    row_text: str
+
+
+def team_id_from_url(team_url: str, teams: Optional[TeamRegistry] = None) -> Optional[int]:
+    """Extract ESPN team ID from team URL (slug-only URLs need the team registry)"""
+    if teams is not None:
+        return teams.id_from_url(team_url)
+    match = TEAM_ID_URL_RE.search(team_url)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def _row_team_id(link, teams: Optional[TeamRegistry]) -> Optional[int]:
+    espn_id = team_id_from_url(link.get('href', ''), teams)
+    if espn_id is None and teams is not None:
+        team = teams.find(link.text.strip())
+        espn_id = team.id if team else None
+    return espn_id
+
+
+def parse_schedule_rows(content, teams: Optional[TeamRegistry] = None) -> List[ScheduleRow]:
+    """
+    Extract every game row (teams, ids, game link, time cell) from a schedule page
+    
+    Args:
+        content: Page HTML
+        teams: Registry used for team links that carry no numeric id (offline lookups only)
+    """
+    soup = make_soup(content, SCHEDULE_ROW_STRAINER)
+    rows = []
+    
+    # Find all game rows in the schedule table
+    for row in soup.find_all('tr', class_=lambda x: x and 'Table__TR' in x):
+        # Extract team links
+        team_links = row.find_all('a', href=TEAM_HREF_RE)
+        if len(team_links) < 2:
+            continue
+        away_link = team_links[0]
+        home_link = team_links[1]
+        
+        # Try to find game link to get game ID
+        game_id = None
+        game_link = row.find('a', href=GAME_HREF_RE)
+        if game_link:
+            match = GAME_ID_RE.search(game_link.get('href', ''))
+            if match:
+                game_id = match.group(1)
+        
+        # Extract game date/time
+        time_text = None
+        for cell in row.find_all('td'):
+            text = cell.get_text(strip=True)
+            # Look for date/time patterns
+            if TIME_RE.search(text) or DATE_RE.search(text):
+                time_text = text
+        
+        # Extract betting line (if available)
+        row_text = row.get_text()
+        betting_line = None
+        line_match = NUMBER_RE.search(row_text)
+        if line_match:
+            try:
+                betting_line = float(line_match.group(1))
+            except ValueError:
+                pass
+        
+        rows.append(ScheduleRow(
+            away_name=away_link.text.strip(),
+            home_name=home_link.text.strip(),
+            away_id=_row_team_id(away_link, teams),
+            home_id=_row_team_id(home_link, teams),
+            game_id=game_id,
+            time_text=time_text,
+            betting_line=betting_line,
+            row_text=row_text
+        ))
+    
+    return rows
+
+
+def find_page_rank(row_text: str, team_name: str) -> Optional[int]:
+    """Rank printed as "#N Team" in a schedule row, matched on the team's first word"""
+    words = team_name.split()
+    if not words:
+        return None
+    first_word = words[0].lower()
+    for rank, word in RANKED_WORD_RE.findall(row_text.lower()):
+        if word.startswith(first_word):
+            return int(rank)
+    return None
+
+
+def parse_game_details(content: bytes) -> Optional[Dict]:
+    """Extract detail fields from a game page's HTML"""
+    details = {}
+    
+    # Look for script tags with game data. Nothing from the blob is used, so it is
+    # never decoded: a JSON object with one of the game-data keys is enough
+    soup = make_soup(content, JSON_SCRIPT_STRAINER)
+    for script in soup.find_all('script', type='application/json'):
+        text = (script.string or '').lstrip()
+        if text.startswith('{') and ('"gamepackage"' in text or '"gameInfo"' in text):
+            details['found_json_data'] = True
+            break
+    
+    # Try to get betting line from the page text
+    html = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    odds_match = ODDS_TEXT_RE.search(SCRIPT_STYLE_RE.sub('', html))
+    if odds_match:
+        line_match = NUMBER_RE.search(odds_match.group(1))
+        if line_match:
+            try:
+                details['betting_line'] = float(line_match.group(1))
+            except:
+                pass
+    
+    return details if details else None
+
 
 class ESPNGameExtractor:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HTTPClient] = None, detail_workers: int = 4,
+                 teams: Optional[TeamRegistry] = None):
+        self.http = http_client or get_shared_client()
+        # Team ids/logos come from the on-disk registry, never a per-call download
+        self.teams = teams or get_team_registry()
+        # Concurrent game-page fetches; matches the www.espn.com connection pool size
+        self.detail_workers = detail_workers
         self.base_url = "https://www.espn.com"
         self.schedule_url = "https://www.espn.com/college-football/schedule"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # Parsed schedule pages, keyed by schedule date (None = current)
+        self._schedule_indexes: Dict[Optional[str], MatchupIndex] = {}
         
     def get_team_espn_id_from_url(self, team_url: str) -> Optional[int]:
         """Extract ESPN team ID from team URL"""
-        match = re.search(r'/team/(?:college-football/)?([^/]+)/(\d+)', team_url)
-        if match:
-            return int(match.group(2))
-        return None
+        return team_id_from_url(team_url, self.teams)
     
     def get_logo_url(self, espn_id: int) -> str:
-        """Generate ESPN logo URL from team ID"""
-        return f"https://a.espncdn.com/i/teamlogos/ncaa/500/{espn_id}.png"
+        """ESPN logo URL for a team ID (from the team registry)"""
+        return self.teams.logo_url(espn_id)
     
     def extract_team_rank(self, team_text: str) -> tuple:
         """Extract team rank and clean team name"""
         # Look for rank pattern like "#1", "1", "(1)", etc.
-        rank_match = re.search(r'#?(\d+)|\((\d+)\)', team_text)
+        rank_match = RANK_RE.search(team_text)
         rank = None
         if rank_match:
             rank = int(rank_match.group(1) or rank_match.group(2))
         
         # Clean team name (remove rank indicators)
-        clean_name = re.sub(r'#\d+\s*', '', team_text)  # Remove "#1 "
-        clean_name = re.sub(r'\(\d+\)\s*', '', clean_name)  # Remove "(1) "
+        clean_name = RANK_HASH_RE.sub('', team_text)  # Remove "#1 "
+        clean_name = RANK_PAREN_RE.sub('', clean_name)  # Remove "(1) "
         clean_name = clean_name.strip()
         
         return clean_name, rank
     
-    def search_game_by_matchup(self, matchup: str, schedule_date: Optional[str] = None) -> Optional[Dict]:
+    def parse_matchup_input(self, matchup: str) -> Optional[tuple]:
         """
-        Search for a game by matchup string (e.g., "Georgia vs Florida", "Alabama at South Carolina")
-        
-        Args:
-            matchup: String describing the game (e.g., "Georgia vs Florida", "Alabama at South Carolina")
-            schedule_date: Optional date to filter schedule (format: YYYYMMDD, e.g., "20241102")
+        Split a matchup string into (away_name, away_rank, home_name, home_rank)
         
-        Returns:
-            Dictionary with game data matching Games table schema (home team first)
+        Returns None (after printing a warning) if the format isn't recognised.
         """
-        # Parse matchup to extract team names
         matchup_lower = matchup.lower()
         
         # Determine if it's home/away or neutral site
@@ -72,179 +240,145 @@ class ESPNGameExtractor:
         is_vs = " vs " in matchup_lower or " vs. " in matchup_lower
         
         if is_at:
-            parts = re.split(r'\s+at\s+|\s+@\s+', matchup, flags=re.IGNORECASE)
-            away_team_input = parts[0].strip()
-            home_team_input = parts[1].strip()
-            away_team_name, away_rank = self.extract_team_rank(away_team_input)
-            home_team_name, home_rank = self.extract_team_rank(home_team_input)
+            parts = MATCHUP_AT_RE.split(matchup)
         elif is_vs:
-            parts = re.split(r'\s+vs\.?\s+', matchup, flags=re.IGNORECASE)
             # For "vs", assume first team is away, second is home (or neutral)
-            away_team_input = parts[0].strip()
-            home_team_input = parts[1].strip()
-            away_team_name, away_rank = self.extract_team_rank(away_team_input)
-            home_team_name, home_rank = self.extract_team_rank(home_team_input)
+            parts = MATCHUP_VS_RE.split(matchup)
         else:
             print(f"[WARN] Could not parse matchup format: {matchup}")
             print("   Expected format: 'TeamA at TeamB' or 'TeamA vs TeamB'")
             return None
         
+        away_team_name, away_rank = self.extract_team_rank(parts[0].strip())
+        home_team_name, home_rank = self.extract_team_rank(parts[1].strip())
+        return away_team_name, away_rank, home_team_name, home_rank
+    
+    def get_schedule_index(self, schedule_date: Optional[str] = None) -> MatchupIndex:
+        """
+        Download and parse a schedule page once per run, indexed by team name and ESPN id
+        
+        Args:
+            schedule_date: Optional date (format: YYYYMMDD), current schedule if omitted
+        
+        Returns:
+            MatchupIndex whose games are ScheduleRow tuples
+        """
+        index = self._schedule_indexes.get(schedule_date)
+        if index is not None:
+            return index
+        
+        if schedule_date:
+            url = f"{self.schedule_url}?date={schedule_date}"
+        else:
+            url = self.schedule_url
+        
+        response = self.http.get(url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        
+        index = MatchupIndex()
+        with metrics.timer('parse_schedule'):
+            for row in parse_schedule_rows(response.content, self.teams):
+                away_keys = [normalize_team_name(row.away_name)] + ([str(row.away_id)] if row.away_id else [])
+                home_keys = [normalize_team_name(row.home_name)] + ([str(row.home_id)] if row.home_id else [])
+                index.add(row, away_keys, home_keys, row.away_name, row.home_name)
+        
+        self._schedule_indexes[schedule_date] = index
+        return index
+    
+    def search_game_by_matchup(self, matchup: str, schedule_date: Optional[str] = None) -> Optional[Game]:
+        """
+        Search for a game by matchup string (e.g., "Georgia vs Florida", "Alabama at South Carolina")
+        
+        Args:
+            matchup: String describing the game (e.g., "Georgia vs Florida", "Alabama at South Carolina")
+            schedule_date: Optional date to filter schedule (format: YYYYMMDD, e.g., "20241102")
+        
+        Returns:
+            Game record matching Games table schema (home team first)
+        """
+        return self.resolve_matchups([matchup], schedule_date)[0]
+    
+    def resolve_matchups(self, matchups: List[str], schedule_date: Optional[str] = None) -> List[Optional[Game]]:
+        """
+        Resolve many matchups against a single download/parse of the schedule page
+        
+        Args:
+            matchups: Strings like "Georgia vs Florida" or "Alabama at South Carolina"
+            schedule_date: Optional date to filter schedule (format: YYYYMMDD, e.g., "20241102")
+        
+        Returns:
+            Game records in the same order as matchups (None where not found)
+        """
+        parsed = [self.parse_matchup_input(matchup) for matchup in matchups]
+        if not any(parsed):
+            return [None] * len(matchups)
+        
         # Fetch schedule page
         try:
-            if schedule_date:
-                url = f"{self.schedule_url}?date={schedule_date}"
-            else:
-                url = self.schedule_url
-                
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find all game rows in the schedule table
-            game_rows = soup.find_all('tr', class_=lambda x: x and 'Table__TR' in x)
+            index = self.get_schedule_index(schedule_date)
+        except Exception as e:
+            print(f"[ERROR] Error searching for game: {e}")
+            return [None] * len(matchups)
+        
+        results = []
+        for matchup, teams in zip(matchups, parsed):
+            if teams is None:
+                results.append(None)
+                continue
             
-            for row in game_rows:
-                # Extract team links
-                team_links = row.find_all('a', href=re.compile(r'/team/|/college-football/team/'))
-                
-                if len(team_links) >= 2:
-                    # Get team names and IDs
-                    away_link = team_links[0]
-                    home_link = team_links[1]
-                    
-                    away_name = away_link.text.strip()
-                    home_name = home_link.text.strip()
-                    
-                    # Check if this matches our search
-                    away_match = away_team_name.lower() in away_name.lower() or away_name.lower() in away_team_name.lower()
-                    home_match = home_team_name.lower() in home_name.lower() or home_name.lower() in home_team_name.lower()
-                    
-                    if away_match and home_match:
-                        # Found the game!
-                        away_id = self.get_team_espn_id_from_url(away_link.get('href', ''))
-                        home_id = self.get_team_espn_id_from_url(home_link.get('href', ''))
-                        
-                        # Try to find game link to get game ID
-                        game_link = row.find('a', href=re.compile(r'/game/'))
-                        game_id = None
-                        if game_link:
-                            match = re.search(r'/game/_/gameId/(\d+)', game_link.get('href', ''))
-                            if match:
-                                game_id = match.group(1)
-                        
-                        # Extract game date/time
-                        game_date = None
-                        date_cells = row.find_all('td')
-                        for cell in date_cells:
-                            text = cell.get_text(strip=True)
-                            # Look for date/time patterns
-                            if re.search(r'\d{1,2}:\d{2}', text) or re.search(r'\d{1,2}/\d{1,2}', text):
-                                game_date = text
-                        
-                        # Extract betting line (if available)
-                        betting_line = None
-                        line_text = row.get_text()
-                        line_match = re.search(r'([+-]?\d+\.?\d*)', line_text)
-                        if line_match:
-                            try:
-                                betting_line = float(line_match.group(1))
-                            except:
-                                pass
-                        
-                        # Extract ranks from team names/links if available
-                        away_rank_from_page = None
-                        home_rank_from_page = None
-                        
-                        # Look for rank in row text or links
-                        row_text_lower = line_text.lower()
-                        rank_pattern = r'#(\d+)\s+' + re.escape(away_name.split()[0].lower())
-                        rank_match = re.search(rank_pattern, row_text_lower, re.IGNORECASE)
-                        if rank_match:
-                            away_rank_from_page = int(rank_match.group(1))
-                        
-                        rank_pattern = r'#(\d+)\s+' + re.escape(home_name.split()[0].lower())
-                        rank_match = re.search(rank_pattern, row_text_lower, re.IGNORECASE)
-                        if rank_match:
-                            home_rank_from_page = int(rank_match.group(1))
-                        
-                        # Use ranks from input or page
-                        final_away_rank = away_rank if away_rank else away_rank_from_page
-                        final_home_rank = home_rank if home_rank else home_rank_from_page
-                        
-                        # Format team names with ranks
-                        away_display = f"#{final_away_rank} {away_name}" if final_away_rank else away_name
-                        home_display = f"#{final_home_rank} {home_name}" if final_home_rank else home_name
-                        
-                        game_data = {
-                            'away_team_name': away_name,
-                            'home_team_name': home_name,
-                            'away_team_display': away_display,  # Name with rank for display
-                            'home_team_display': home_display,  # Name with rank for display
-                            'away_team_rank': final_away_rank,
-                            'home_team_rank': final_home_rank,
-                            'away_team_espn_id': away_id,
-                            'home_team_espn_id': home_id,
-                            'away_team_logo_url': self.get_logo_url(away_id) if away_id else None,
-                            'home_team_logo_url': self.get_logo_url(home_id) if home_id else None,
-                            'game_date': game_date,
-                            'betting_line': betting_line,
-                            'espn_game_id': game_id,
-                            'matchup_string': matchup,
-                            'matchup_display': f"{home_display} vs {away_display}"  # Home team first
-                        }
-                        
-                        # If we found the game link, get more detailed info
-                        if game_link and game_id:
-                            detailed_info = self.get_game_details(game_id)
-                            if detailed_info:
-                                game_data.update(detailed_info)
-                        
-                        return game_data
+            away_team_name, away_rank, home_team_name, home_rank = teams
+            with metrics.timer('match'):
+                row = index.lookup(away_team_name, home_team_name)
+            if row is None:
+                print(f"[ERROR] Game not found: {matchup}")
+                results.append(None)
+                continue
             
-            print(f"[ERROR] Game not found: {matchup}")
-            return None
+            # Use ranks from input or page
+            game_data = Game(
+                espn_game_id=row.game_id,
+                away_team_name=row.away_name,
+                home_team_name=row.home_name,
+                away_team_espn_id=row.away_id,
+                home_team_espn_id=row.home_id,
+                away_team_rank=away_rank if away_rank else find_page_rank(row.row_text, row.away_name),
+                home_team_rank=home_rank if home_rank else find_page_rank(row.row_text, row.home_name),
+                game_date=row.time_text,
+                betting_line=row.betting_line,
+                matchup_string=matchup
+            )
             
-        except Exception as e:
-            print(f"[ERROR] Error searching for game: {e}")
-            return None
+            results.append(game_data)
+        
+        # Game pages are fetched concurrently once every matchup is resolved
+        self.enrich_with_details([game for game in results if game is not None])
+        return results
+    
+    def enrich_with_details(self, games: List[Game]):
+        """Fetch each game's page in a bounded thread pool and merge the details in place"""
+        games = [game for game in games if game.espn_game_id]
+        if not games:
+            return
+        
+        workers = max(1, min(self.detail_workers, len(games)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for game, detailed_info in zip(games, pool.map(self.get_game_details,
+                                                           [game.espn_game_id for game in games])):
+                if detailed_info:
+                    merge_game_details(game, detailed_info)
     
     def get_game_details(self, game_id: str) -> Optional[Dict]:
         """Get detailed game information from game page"""
         try:
             game_url = f"{self.base_url}/college-football/game/_/gameId/{game_id}"
-            response = requests.get(game_url, headers=self.headers, timeout=10)
+            response = self.http.get(game_url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {}
-            
-            # Try to extract more detailed game info
-            # Look for script tags with game data
-            scripts = soup.find_all('script', type='application/json')
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if 'gamepackage' in str(data) or 'gameInfo' in str(data):
-                        # Found game data
-                        details['found_json_data'] = True
-                except:
-                    pass
-            
-            # Try to get betting line from game page
-            odds_section = soup.find(string=re.compile(r'Spread|Line|Favorite'))
-            if odds_section:
-                line_match = re.search(r'([+-]?\d+\.?\d*)', str(odds_section))
-                if line_match:
-                    try:
-                        details['betting_line'] = float(line_match.group(1))
-                    except:
-                        pass
-            
-            return details if details else None
+            with metrics.timer('parse_game'):
+                return parse_game_details(response.content)
             
         except Exception as e:
+            metrics.inc('espn_errors_total', stage='game_details')
             print(f"[WARN] Could not get detailed game info: {e}")
             return None
     
@@ -260,46 +394,20 @@ class ESPNGameExtractor:
         Returns:
             Dictionary formatted for Games table insertion
         """
-        return {
-            'week_id': week_id,
-            'game_number': game_number,
-            'home_team_espn_id': game_data.get('home_team_espn_id'),
-            'away_team_espn_id': game_data.get('away_team_espn_id'),
-            'home_team_name': game_data.get('home_team_name'),
-            'away_team_name': game_data.get('away_team_name'),
-            'home_team_logo_url': game_data.get('home_team_logo_url'),
-            'away_team_logo_url': game_data.get('away_team_logo_url'),
-            'game_date': game_data.get('game_date'),
-            'betting_line': game_data.get('betting_line'),
-            'is_completed': False
-        }
+        return dict(zip(GAMES_COLUMNS, game_row(game_data, week_id, game_number)))
     
-    def generate_sql_insert(self, games: List[Dict], week_id: int) -> str:
-        """Generate SQL INSERT statements for games"""
-        sql_statements = []
-        
-        for idx, game in enumerate(games, start=1):
-            sql = f"""INSERT INTO Games (week_id, game_number, home_team_espn_id, away_team_espn_id, 
-                    home_team_name, away_team_name, home_team_logo_url, away_team_logo_url, 
-                    game_date, betting_line, is_completed)
-VALUES ({week_id}, {idx}, 
-        {game['home_team_espn_id']}, 
-        {game['away_team_espn_id']}, 
-        '{game['home_team_name'].replace("'", "''")}', 
-        '{game['away_team_name'].replace("'", "''")}', 
-        '{game['home_team_logo_url']}', 
-        '{game['away_team_logo_url']}', 
-        {f"'{game['game_date']}'" if game.get('game_date') else 'NULL'}, 
-        {game['betting_line'] if game.get('betting_line') is not None else 'NULL'}, 
-        FALSE);"""
-            sql_statements.append(sql)
-        
-        return "\n".join(sql_statements)
+    def generate_sql_insert(self, games: List, week_id: int) -> str:
+        """Generate multi-row INSERT statements for manual execution (see espn_export.GamesExporter)"""
+        out = io.StringIO()
+        GamesExporter(out, week_id).write(games)
+        return out.getvalue()
 
 
 def main():
     """Main function to run the extractor"""
     extractor = ESPNGameExtractor()
+    export_at_exit()
+    extractor.teams.refresh_if_stale()
     
     # Check if matchups provided as command line arguments
     if len(sys.argv) > 1:
@@ -327,10 +435,10 @@ def main():
     
         print(f"\nSearching for {len(matchups)} game(s)...\n")
     
+    # One schedule download/parse for the whole list
     games = []
-    for matchup in matchups:
+    for matchup, game_data in zip(matchups, extractor.resolve_matchups(matchups)):
         print(f"Searching: {matchup}...")
-        game_data = extractor.search_game_by_matchup(matchup)
         
         if game_data:
             print(f"[OK] Found: {game_data['matchup_display']}")
@@ -349,7 +457,7 @@ def main():
         print("\n" + "=" * 50)
         print("📊 GAME DATA (JSON Format):")
         print("=" * 50)
-        print(json.dumps(games, indent=2))
+        print(json.dumps([game.to_dict(include_display=True) for game in games], indent=2))
         
         print("\n" + "=" * 50)
         print("💡 Next Steps:")
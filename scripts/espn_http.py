@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP layer for the ESPN extractors
+Keeps one pooled requests.Session per process so repeated calls to
+site.api.espn.com and www.espn.com reuse keep-alive connections instead of
+paying a new TCP+TLS handshake per request.
+
+Responses can additionally go through an on-disk ResponseCache (espn_cache.py).
+The shared client enables it by default; set ESPN_HTTP_CACHE=0 to turn it off
+or ESPN_CACHE_DIR to move it. Network requests are paced and retried per host
+by a RequestScheduler (espn_ratelimit.py).
+
+requests itself is imported when the first network request is made, so runs
+served entirely from the cache or a replay archive never pay for it.
+
+Usage:
+    from espn_http import get_shared_client
+    response = get_shared_client().get(url, headers={...}, timeout=10)
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from espn_cache import ResponseCache, cache_dir
+from espn_metrics import metrics
+from espn_ratelimit import RequestScheduler
+from espn_replay import client_from_env
+
+# urllib3 only decodes brotli bodies when one of these packages is installed,
+# so only advertise "br" when we can actually read it
+try:
+    import brotli  # noqa: F401
+    _HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate, br' if _HAS_BROTLI else 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+# Max pooled keep-alive connections per host
+DEFAULT_POOL_SIZES = {
+    'site.api.espn.com': 10,
+    'www.espn.com': 4,
+    'a.espncdn.com': 8
+}
+
+class HTTPClient:
+    """Thin wrapper around a pooled requests.Session shared by both extractors"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None,
+                 pool_sizes: Optional[Dict[str, int]] = None,
+                 default_pool_size: int = 4, timeout: float = 10,
+                 cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        """
+        Args:
+            headers: Default headers sent with every request (merged over DEFAULT_HEADERS)
+            pool_sizes: Per-host connection pool sizes, e.g. {'www.espn.com': 4}
+            default_pool_size: Pool size for hosts not listed in pool_sizes
+            timeout: Default request timeout in seconds
+            cache: Optional on-disk response cache
+            scheduler: Optional per-host rate limiter/retry loop
+        """
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES)
+        if pool_sizes:
+            self.pool_sizes.update(pool_sizes)
+        self.default_pool_size = default_pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> 'requests.Session':
+        """Create the session on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> 'requests.Session':
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        default_adapter = HTTPAdapter(pool_connections=len(self.pool_sizes) + 1,
+                                      pool_maxsize=self.default_pool_size)
+        session.mount('https://', default_adapter)
+        session.mount('http://', default_adapter)
+
+        # Longest prefix wins in requests, so host mounts override the defaults
+        for host, size in self.pool_sizes.items():
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            session.mount(f"https://{host}/", adapter)
+            session.mount(f"http://{host}/", adapter)
+
+        return session
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, stream: bool = False, max_age: Optional[float] = None):
+        """
+        GET a URL through the pooled session and the cache
+
+        max_age caps how old a cached response may be; 0 always revalidates.
+        """
+        if self.cache is None:
+            return self._fetch(url, params, headers, timeout, stream)
+
+        def fetcher(conditional_headers: Dict[str, str]):
+            merged = dict(headers or {})
+            merged.update(conditional_headers)
+            return self._fetch(url, params, merged, timeout, stream)
+
+        # Streamed bodies are spooled to the cache file and handed back as an open file
+        return self.cache.fetch(url, params, fetcher, max_age, stream=stream)
+
+    def _fetch(self, url: str, params: Optional[Dict], headers: Optional[Dict[str, str]],
+               timeout: Optional[float], stream: bool) -> 'requests.Response':
+        import requests
+
+        def send() -> 'requests.Response':
+            return self._send(url, params, headers, timeout, stream)
+
+        if self.scheduler is None:
+            return send()
+        return self.scheduler.call(urlsplit(url).netloc, url, send,
+                                   retry_exceptions=(requests.Timeout, requests.ConnectionError))
+
+    def _send(self, url: str, params: Optional[Dict], headers: Optional[Dict[str, str]],
+              timeout: Optional[float], stream: bool) -> 'requests.Response':
+        import requests
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, headers=headers,
+                                        timeout=timeout if timeout is not None else self.timeout,
+                                        stream=stream)
+        except requests.RequestException:
+            metrics.record_http(url, None, time.perf_counter() - start)
+            raise
+
+        # Reading content here keeps the body download inside the timing; streamed bodies are left unread
+        size = None if stream else len(response.content)
+        metrics.record_http(url, response.status_code, time.perf_counter() - start,
+                            ttfb=response.elapsed.total_seconds(), size=size)
+        return response
+
+    def close(self):
+        """Close pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self.cache is not None:
+            self.cache.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client():
+    """Process-wide client used by the extractors unless one is passed in"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                # ESPN_RECORD / ESPN_REPLAY wrap or replace the network client (espn_replay.py)
+                _shared_client = client_from_env(
+                    lambda: HTTPClient(cache=_default_cache(), scheduler=RequestScheduler.from_env()))
+                atexit.register(_shared_client.close)
+    return _shared_client
+
+
+def _default_cache() -> Optional[ResponseCache]:
+    if os.getenv('ESPN_HTTP_CACHE', '1') == '0':
+        return None
+    try:
+        return ResponseCache(cache_dir())
+    except OSError as e:
+        print(f"[WARN] HTTP cache disabled: {e}")
+        return None
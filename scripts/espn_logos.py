@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Local team-logo mirror
+Downloads the 500px ESPN logo for every team id seen in a run with a bounded
+worker pool, stores each image once under its content hash (many FCS teams
+share ESPN's placeholder logo) together with smaller resized variants, and
+serves the extractors' logo URLs from our own static assets instead of
+a.espncdn.com.
+
+Layout of the mirror directory (Frontend/logos by default, served as /logos):
+    manifest.json         team id -> content hash, plus the variant sizes
+    <hash>.png            the original image
+    <hash>-<size>.png     resized variants (needs Pillow)
+
+File names change whenever a logo's bytes do, so they can be cached forever.
+
+Usage:
+    from espn_logos import LogoMirror
+    mirror = LogoMirror()
+    mirror.prefetch(team_ids)
+    mirror.install()              # Game/registry logo URLs now point at /logos/...
+
+    python espn_logos.py --input games.json
+    python espn_logos.py --all-teams --sizes 64,128 --workers 8
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from espn_metrics import metrics
+from espn_models import LOGO_URL_TEMPLATE, set_logo_resolver
+
+DEFAULT_MIRROR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Frontend', 'logos')
+DEFAULT_BASE_URL = '/logos'
+DEFAULT_SIZES = (64, 128)
+# Size emitted in Game/Games-table URLs; the site shows logos at 40-80 CSS px
+DEFAULT_URL_SIZE = 128
+DEFAULT_WORKERS = 8
+REFRESH_INTERVAL = 30 * 24 * 3600
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+HASH_LENGTH = 16
+
+
+def _write_atomic(path: str, content: bytes):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def resize_png(content: bytes, size: int) -> Optional[bytes]:
+    """PNG scaled to fit size x size (None without Pillow or for unreadable images)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image = image.convert('RGBA')
+            image.thumbnail((size, size), Image.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, format='PNG', optimize=True)
+            return out.getvalue()
+    except Exception as e:
+        print(f"[WARN] Could not resize logo to {size}px: {e}")
+        return None
+
+
+def game_team_ids(games: Iterable) -> Set[int]:
+    """Every team id referenced by Game records or game dictionaries"""
+    ids = set()
+    for game in games:
+        for key in ('home_team_espn_id', 'away_team_espn_id'):
+            value = game.get(key)
+            if value:
+                ids.add(int(value))
+    return ids
+
+
+class LogoMirror:
+    """Content-addressed copy of ESPN team logos with resized variants"""
+
+    def __init__(self, root: str = DEFAULT_MIRROR_DIR, base_url: str = DEFAULT_BASE_URL,
+                 sizes: Sequence[int] = DEFAULT_SIZES, url_size: Optional[int] = DEFAULT_URL_SIZE,
+                 http_client=None, workers: int = DEFAULT_WORKERS,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        """
+        Args:
+            root: Directory the logos and manifest are written to
+            base_url: URL prefix root is published under
+            sizes: Variant edge lengths in pixels
+            url_size: Variant used in emitted URLs (None or unavailable = the original)
+            http_client: HTTPClient used for downloads (the shared client if omitted)
+            workers: Concurrent downloads
+            refresh_interval: Seconds before a mirrored team's logo is checked again
+        """
+        self.root = root
+        self.base_url = base_url.rstrip('/')
+        self.sizes = tuple(sorted(set(int(size) for size in sizes)))
+        self.url_size = url_size
+        self.http_client = http_client
+        self.workers = max(1, workers)
+        self.refresh_interval = refresh_interval
+        # team id -> {'hash': ..., 'sizes': [...], 'fetched_at': ...}
+        self._teams: Dict[int, Dict] = {}
+        self._written: Set[str] = set()
+        self._lock = threading.Lock()
+        self._pillow_warned = False
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def __contains__(self, espn_id) -> bool:
+        return int(espn_id) in self._teams
+
+    def path(self, digest: str, size: Optional[int] = None) -> str:
+        return os.path.join(self.root, f"{digest}-{size}.png" if size else f"{digest}.png")
+
+    def url_for(self, espn_id: int, size: Optional[int] = None) -> Optional[str]:
+        """Static URL of a team's logo (None if the team isn't mirrored)"""
+        entry = self._teams.get(int(espn_id))
+        if entry is None:
+            return None
+        size = size if size is not None else self.url_size
+        digest = entry['hash']
+        if size not in entry.get('sizes', ()):
+            size = None
+        return f"{self.base_url}/{digest}-{size}.png" if size else f"{self.base_url}/{digest}.png"
+
+    def install(self):
+        """Make Game and team-registry logo URLs point at this mirror"""
+        set_logo_resolver(self.url_for)
+
+    def prefetch(self, team_ids: Iterable[int], refresh: bool = False) -> Dict[str, int]:
+        """
+        Mirror the logos of these teams concurrently and save the manifest
+
+        Args:
+            team_ids: ESPN team ids
+            refresh: Re-download teams mirrored less than refresh_interval ago
+
+        Returns:
+            Counts of 'fetched', 'deduplicated', 'unchanged', 'skipped' and 'failed' teams
+        """
+        now = time.time()
+        wanted = sorted({int(espn_id) for espn_id in team_ids if espn_id})
+        todo = [espn_id for espn_id in wanted if refresh or self._is_stale(espn_id, now)]
+        counts = {'fetched': 0, 'deduplicated': 0, 'unchanged': 0, 'failed': 0,
+                  'skipped': len(wanted) - len(todo)}
+        if not todo:
+            return counts
+
+        os.makedirs(self.root, exist_ok=True)
+        with metrics.timer('logo_mirror'):
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo))) as pool:
+                for outcome in pool.map(self._mirror_one, todo):
+                    counts[outcome] += 1
+            self._save()
+
+        for outcome in ('fetched', 'deduplicated', 'unchanged', 'failed'):
+            metrics.inc('espn_logos_total', counts[outcome], action=outcome)
+        return counts
+
+    def _is_stale(self, espn_id: int, now: float) -> bool:
+        entry = self._teams.get(espn_id)
+        if entry is None or not os.path.exists(self.path(entry['hash'])):
+            return True
+        return now - entry.get('fetched_at', 0) >= self.refresh_interval
+
+    def _client(self):
+        if self.http_client is None:
+            from espn_http import get_shared_client
+            self.http_client = get_shared_client()
+        return self.http_client
+
+    def _mirror_one(self, espn_id: int) -> str:
+        url = LOGO_URL_TEMPLATE.format(espn_id=espn_id)
+        try:
+            response = self._client().get(url, timeout=10)
+            response.raise_for_status()
+            content = response.content
+        except Exception as e:
+            print(f"[WARN] Could not mirror logo for team {espn_id}: {e}")
+            return 'failed'
+
+        digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        with self._lock:
+            previous = self._teams.get(espn_id, {}).get('hash')
+            # Claim the hash so two teams sharing an image in one run store it once
+            stored = digest in self._written or os.path.exists(self.path(digest))
+            self._written.add(digest)
+        if stored:
+            outcome = 'unchanged' if previous == digest else 'deduplicated'
+        else:
+            _write_atomic(self.path(digest), content)
+            outcome = 'fetched'
+        sizes = self._write_variants(digest, content)
+
+        with self._lock:
+            self._teams[espn_id] = {'hash': digest, 'sizes': sizes, 'fetched_at': time.time()}
+        return outcome
+
+    def _write_variants(self, digest: str, content: bytes) -> List[int]:
+        """Resize into every configured size not already on disk; returns the sizes available"""
+        available = []
+        for size in self.sizes:
+            path = self.path(digest, size)
+            if not os.path.exists(path):
+                resized = resize_png(content, size)
+                if resized is None:
+                    self._warn_no_variants()
+                    continue
+                _write_atomic(path, resized)
+            available.append(size)
+        return available
+
+    def _warn_no_variants(self):
+        if not self._pillow_warned:
+            self._pillow_warned = True
+            print("[WARN] Pillow not installed; mirroring original logos without resized variants")
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_FILE)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != FORMAT_VERSION:
+            return
+        self._teams = {int(espn_id): entry for espn_id, entry in data.get('teams', {}).items()}
+
+    def _save(self):
+        with self._lock:
+            data = {
+                'version': FORMAT_VERSION,
+                'sizes': list(self.sizes),
+                'teams': {str(espn_id): self._teams[espn_id] for espn_id in sorted(self._teams)}
+            }
+        try:
+            _write_atomic(os.path.join(self.root, MANIFEST_FILE),
+                          json.dumps(data, separators=(',', ':')).encode())
+        except OSError as e:
+            print(f"[WARN] Could not save logo manifest: {e}")
+
+
+def mirror_from_env() -> Optional[LogoMirror]:
+    """LogoMirror for ESPN_LOGO_MIRROR (directory) / ESPN_LOGO_BASE_URL, or None when unset"""
+    root = os.getenv('ESPN_LOGO_MIRROR')
+    if not root:
+        return None
+    return LogoMirror(root, os.getenv('ESPN_LOGO_BASE_URL', DEFAULT_BASE_URL))
+
+
+def _read_games(path: str) -> List[Dict]:
+    """Game dicts from fetch/resolve JSON or backfill JSON Lines output"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            items = [json.loads(line) for line in f if line.strip()]
+        else:
+            items = json.load(f)
+    games = (item['game'] if 'matchup' in item else item for item in items)
+    return [game for game in games if game]
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(',') if size.strip()]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Mirror ESPN team logos as local static assets")
+    parser.add_argument('--input', action='append', default=[],
+                        help="Games JSON/JSONL (fetch, resolve or backfill output) whose teams to mirror")
+    parser.add_argument('--team', type=int, action='append', default=[], help="ESPN team id (repeatable)")
+    parser.add_argument('--all-teams', action='store_true', help="Every team in the team registry")
+    parser.add_argument('--dir', default=DEFAULT_MIRROR_DIR, help="Mirror directory")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help="URL prefix the directory is served under")
+    parser.add_argument('--sizes', type=_parse_sizes, default=list(DEFAULT_SIZES), help="Variant sizes, e.g. 64,128")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent downloads")
+    parser.add_argument('--refresh', action='store_true', help="Re-download logos that are already mirrored")
+    args = parser.parse_args()
+
+    team_ids = set(args.team)
+    for path in args.input:
+        team_ids |= game_team_ids(_read_games(path))
+    if args.all_teams:
+        from espn_teams import get_team_registry
+
+        teams = get_team_registry()
+        teams.refresh_if_stale()
+        team_ids |= {team.id for team in teams}
+    if not team_ids:
+        parser.error("Pass --input, --team or --all-teams")
+
+    mirror = LogoMirror(args.dir, args.base_url, args.sizes, workers=args.workers)
+    counts = mirror.prefetch(team_ids, refresh=args.refresh)
+    print(json.dumps({'teams': len(team_ids), 'mirrored': len(mirror), **counts}, indent=2))
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Matchup parsing and team-name indexing shared by the ESPN extractors
+Builds a dictionary of normalized team names/abbreviations/ids -> games so a
+whole list of "Away at Home" strings resolves against a slate with constant
+time lookups instead of substring-scanning every game per matchup.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_MATCHUP_AT_RE = re.compile(r'\s+(?:at|@)\s+', re.IGNORECASE)
+_MATCHUP_VS_RE = re.compile(r'\s+vs\.?\s+', re.IGNORECASE)
+_LEADING_RANK_RE = re.compile(r'^(?:#\d+|\(\d+\))\s*')
+_NON_WORD_RE = re.compile(r"[^a-z0-9&]+")
+
+
+def normalize_team_name(name) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ("Miami (OH)" -> "miami oh")"""
+    if name is None:
+        return ''
+    return _NON_WORD_RE.sub(' ', str(name).lower().replace("'", '')).strip()
+
+
+def parse_matchup(matchup: str) -> Optional[Tuple[str, str, bool]]:
+    """
+    Split a matchup string into team names
+
+    Args:
+        matchup: "TeamA at TeamB", "TeamA @ TeamB" or "TeamA vs TeamB" (ranks like "#5 " are ignored)
+
+    Returns:
+        (away_name, home_name, is_neutral) or None if the string can't be parsed.
+        is_neutral is True for "vs" matchups, where either team may be listed as home.
+    """
+    parts = _MATCHUP_AT_RE.split(matchup, maxsplit=1)
+    is_neutral = False
+    if len(parts) != 2:
+        parts = _MATCHUP_VS_RE.split(matchup, maxsplit=1)
+        is_neutral = True
+    if len(parts) != 2:
+        return None
+
+    away = _LEADING_RANK_RE.sub('', parts[0].strip())
+    home = _LEADING_RANK_RE.sub('', parts[1].strip())
+    if not away or not home:
+        return None
+    return away, home, is_neutral
+
+
+def team_keys(team: Dict) -> List[str]:
+    """Normalized lookup keys for an ESPN team object (names, abbreviation, id)"""
+    keys = []
+    for field in ('displayName', 'shortDisplayName', 'location', 'abbreviation', 'id'):
+        key = normalize_team_name(team.get(field))
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+class MatchupIndex:
+    """Index of a slate of games keyed by normalized team names on each side"""
+
+    def __init__(self):
+        self.games: List = []
+        self._names: List[Tuple[str, str]] = []
+        # key -> list of (game position, 'away' | 'home')
+        self._by_key: Dict[str, List[Tuple[int, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def add(self, game, away_keys: Iterable[str], home_keys: Iterable[str],
+            away_name: str = '', home_name: str = ''):
+        """
+        Add a game to the index
+
+        Args:
+            game: Any game record; returned as-is from lookups
+            away_keys / home_keys: Normalized keys identifying each team
+            away_name / home_name: Display names used for the substring fallback
+        """
+        position = len(self.games)
+        self.games.append(game)
+        self._names.append((away_name.lower(), home_name.lower()))
+        for side, keys in (('away', away_keys), ('home', home_keys)):
+            for key in keys:
+                self._by_key.setdefault(key, []).append((position, side))
+
+    def lookup(self, away_name: str, home_name: str, is_neutral: bool = False):
+        """Find the game for a pair of team names, or None"""
+        position = self._lookup_exact(away_name, home_name)
+        if position is None and is_neutral:
+            position = self._lookup_exact(home_name, away_name)
+        if position is None:
+            position = self._lookup_substring(away_name, home_name, is_neutral)
+        return self.games[position] if position is not None else None
+
+    def resolve(self, matchups: Iterable[str]) -> List[Tuple[str, Optional[object]]]:
+        """Resolve many matchup strings in one pass; unparseable strings resolve to None"""
+        results = []
+        for matchup in matchups:
+            parsed = parse_matchup(matchup)
+            game = self.lookup(*parsed) if parsed else None
+            results.append((matchup, game))
+        return results
+
+    def _lookup_exact(self, away_name: str, home_name: str) -> Optional[int]:
+        away_hits = self._by_key.get(normalize_team_name(away_name))
+        home_hits = self._by_key.get(normalize_team_name(home_name))
+        if not away_hits or not home_hits:
+            return None
+        away_positions = {pos for pos, side in away_hits if side == 'away'}
+        for pos, side in home_hits:
+            if side == 'home' and pos in away_positions:
+                return pos
+        return None
+
+    def _lookup_substring(self, away_name: str, home_name: str, is_neutral: bool) -> Optional[int]:
+        # Same loose two-way substring match the extractors always used; only hit on index misses
+        away_name = away_name.lower()
+        home_name = home_name.lower()
+
+        def matches(a: str, b: str) -> bool:
+            return a in b or b in a
+
+        for pos, (game_away, game_home) in enumerate(self._names):
+            if not game_away or not game_home:
+                continue
+            if matches(away_name, game_away) and matches(home_name, game_home):
+                return pos
+            if is_neutral and matches(home_name, game_away) and matches(away_name, game_home):
+                return pos
+        return None
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Run metrics for the ESPN extractors
+A process-wide registry of counters and histograms filled in by the hot paths
+(HTTP fetches, cache lookups, parsing, matching, database writes) and exported
+as JSON or as a Prometheus textfile (for node_exporter's textfile collector).
+
+Exports go to the paths in ESPN_METRICS_JSON / ESPN_METRICS_PROM when set:
+at exit for one-shot runs, and after every poll/week in long-running modes.
+
+Usage:
+    from espn_metrics import metrics
+    with metrics.timer('parse_scoreboard'):
+        games = list(iter_games(content))
+    metrics.inc('espn_db_rows_total', len(rows), action='inserted')
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds (+Inf is implicit)
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# (substring of the URL, endpoint label); first match wins
+ENDPOINTS = [
+    ('/college-football/scoreboard', 'scoreboard'),
+    ('/college-football/teams', 'teams'),
+    ('/college-football/schedule', 'schedule'),
+    ('/college-football/game/', 'game'),
+    ('/teamlogos/', 'logo'),
+]
+
+HELP = {
+    'espn_stage_seconds': 'Wall time per pipeline stage',
+    'espn_http_request_seconds': 'HTTP request time including body download, per endpoint',
+    'espn_http_ttfb_seconds': 'Time until response headers arrived, per endpoint',
+    'espn_http_requests_total': 'HTTP requests by endpoint and status',
+    'espn_http_response_bytes_total': 'Response body bytes downloaded, per endpoint',
+    'espn_http_retries_total': 'Requests retried after a throttle, 5xx or timeout, per endpoint',
+    'espn_http_throttled_total': 'HTTP 429/503 responses, per endpoint',
+    'espn_cache_requests_total': 'Response cache lookups by result',
+    'espn_db_rows_total': 'Games/GameResults rows written or skipped, by action',
+    'espn_errors_total': 'Errors by stage',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_name(url: str) -> str:
+    """Low-cardinality endpoint label for a request URL"""
+    for pattern, name in ENDPOINTS:
+        if pattern in url:
+            return name
+    return 'other'
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'max': round(self.max, 6),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = STAGE_BUCKETS, **labels):
+        """Record one observation in a histogram"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time a block as espn_stage_seconds{stage=...}; exceptions count as espn_errors_total"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('espn_errors_total', stage=stage)
+            raise
+        finally:
+            self.observe('espn_stage_seconds', time.perf_counter() - start, stage=stage)
+
+    def record_http(self, url: str, status: Optional[int], seconds: float,
+                    ttfb: Optional[float] = None, size: Optional[int] = None):
+        """Record one HTTP request (status None means it failed without a response)"""
+        endpoint = endpoint_name(url)
+        self.observe('espn_http_request_seconds', seconds, HTTP_BUCKETS, endpoint=endpoint)
+        if ttfb is not None:
+            self.observe('espn_http_ttfb_seconds', ttfb, HTTP_BUCKETS, endpoint=endpoint)
+        self.inc('espn_http_requests_total', endpoint=endpoint, status=status if status is not None else 'error')
+        if size:
+            self.inc('espn_http_response_bytes_total', size, endpoint=endpoint)
+        if status is None or status >= 400:
+            self.inc('espn_errors_total', stage='http')
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly snapshot including derived rows/second"""
+        with self._lock:
+            counters = {name: [dict(labels=dict(key), value=value) for key, value in sorted(series.items())]
+                        for name, series in sorted(self._counters.items())}
+            histograms = {name: [dict(labels=dict(key), **histogram.to_dict())
+                                 for key, histogram in sorted(series.items())]
+                          for name, series in sorted(self._histograms.items())}
+
+        written = sum(item['value'] for item in counters.get('espn_db_rows_total', [])
+                      if item['labels'].get('action') in ('inserted', 'updated', 'upserted'))
+        db_seconds = sum(item['sum'] for item in histograms.get('espn_stage_seconds', [])
+                         if item['labels'].get('stage', '').startswith('db_'))
+        return {
+            'started_at': self.started_at,
+            'elapsed_seconds': round(time.time() - self.started_at, 3),
+            'counters': counters,
+            'histograms': histograms,
+            'derived': {
+                'db_rows_written': written,
+                'db_rows_per_second': round(written / db_seconds, 1) if db_seconds else None
+            }
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, json_path: Optional[str] = None, prom_path: Optional[str] = None):
+        """
+        Write snapshots to disk (atomically, so collectors never read half a file)
+
+        Args:
+            json_path: JSON output path (defaults to $ESPN_METRICS_JSON)
+            prom_path: Prometheus textfile path (defaults to $ESPN_METRICS_PROM)
+        """
+        json_path = json_path or os.getenv('ESPN_METRICS_JSON')
+        prom_path = prom_path or os.getenv('ESPN_METRICS_PROM')
+        if json_path:
+            _write_atomic(json_path, json.dumps(self.to_dict(), indent=2))
+        if prom_path:
+            _write_atomic(prom_path, self.to_prometheus())
+
+
+def _write_atomic(path: str, content: str):
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARN] Could not write metrics to {path}: {e}")
+
+
+metrics = MetricsRegistry()
+
+_exit_export_registered = False
+
+
+def export_at_exit():
+    """Export the shared registry when the process exits (if an export path is configured)"""
+    global _exit_export_registered
+    if not _exit_export_registered:
+        _exit_export_registered = True
+        atexit.register(metrics.export)
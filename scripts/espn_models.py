@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Shared game record and scoreboard event parser for the ESPN extractors
+Game keeps only the raw fields per game in __slots__; logo URLs and display
+strings are derived on access, and to_dict()/to_row() produce the JSON and
+Games-table shapes the scripts have always written.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from espn_matchups import team_keys
+
+LOGO_URL_TEMPLATE = "https://a.espncdn.com/i/teamlogos/ncaa/500/{espn_id}.png"
+
+# Column order used for INSERTs into the Games table
+GAMES_COLUMNS = ('week_id', 'game_number', 'home_team_espn_id', 'away_team_espn_id',
+                 'home_team_name', 'away_team_name', 'home_team_logo_url', 'away_team_logo_url',
+                 'game_date', 'betting_line', 'is_completed')
+
+
+# Maps a team id to a self-hosted logo URL (None = not mirrored); see espn_logos.py
+_logo_resolver: Optional[Callable[[int], Optional[str]]] = None
+
+
+def set_logo_resolver(resolver: Optional[Callable[[int], Optional[str]]]):
+    """Serve logo URLs from resolver first (e.g. a LogoMirror); None restores ESPN's CDN"""
+    global _logo_resolver
+    _logo_resolver = resolver
+
+
+def mirrored_logo_url(espn_id: Optional[int]) -> Optional[str]:
+    """Self-hosted logo URL for a team ID, if a mirror is installed and has it"""
+    if not espn_id or _logo_resolver is None:
+        return None
+    return _logo_resolver(int(espn_id))
+
+
+def logo_url(espn_id: Optional[int]) -> Optional[str]:
+    """Generate logo URL from team ID (the local mirror when it has the team, else ESPN's CDN)"""
+    if not espn_id:
+        return None
+    return mirrored_logo_url(espn_id) or LOGO_URL_TEMPLATE.format(espn_id=espn_id)
+
+
+def _rank_prefix(rank: Optional[int]) -> str:
+    return f"#{rank} " if rank else ''
+
+
+class Game:
+    """One game between two teams, home team first in all display strings"""
+
+    __slots__ = ('espn_game_id', 'away_team_name', 'home_team_name', 'away_team_espn_id',
+                 'home_team_espn_id', 'away_team_rank', 'home_team_rank', 'game_date',
+                 'betting_line', 'is_completed', 'home_score', 'away_score',
+                 'matchup_string', 'details', 'seasontype', 'week')
+
+    # Keys readable through game['...'] besides the slots
+    _DERIVED = ('away_team_logo_url', 'home_team_logo_url', 'away_team_display',
+                'home_team_display', 'matchup_display')
+
+    def __init__(self, espn_game_id: Optional[str], away_team_name: str, home_team_name: str,
+                 away_team_espn_id: Optional[int], home_team_espn_id: Optional[int],
+                 away_team_rank: Optional[int] = None, home_team_rank: Optional[int] = None,
+                 game_date: Optional[str] = None, betting_line: Optional[float] = None,
+                 is_completed: bool = False, home_score: Optional[int] = None,
+                 away_score: Optional[int] = None, matchup_string: Optional[str] = None,
+                 details: Optional[Dict] = None, seasontype: Optional[int] = None,
+                 week: Optional[int] = None):
+        self.espn_game_id = espn_game_id
+        self.away_team_name = away_team_name
+        self.home_team_name = home_team_name
+        self.away_team_espn_id = away_team_espn_id
+        self.home_team_espn_id = home_team_espn_id
+        self.away_team_rank = away_team_rank
+        self.home_team_rank = home_team_rank
+        self.game_date = game_date
+        self.betting_line = betting_line
+        self.is_completed = is_completed
+        self.home_score = home_score
+        self.away_score = away_score
+        self.matchup_string = matchup_string
+        self.details = details
+        # Scoreboard week the event belongs to (ESPN's season type and week number), when known
+        self.seasontype = seasontype
+        self.week = week
+
+    @property
+    def away_team_logo_url(self) -> Optional[str]:
+        return logo_url(self.away_team_espn_id)
+
+    @property
+    def home_team_logo_url(self) -> Optional[str]:
+        return logo_url(self.home_team_espn_id)
+
+    @property
+    def away_team_display(self) -> str:
+        return f"{_rank_prefix(self.away_team_rank)}{self.away_team_name}"
+
+    @property
+    def home_team_display(self) -> str:
+        return f"{_rank_prefix(self.home_team_rank)}{self.home_team_name}"
+
+    @property
+    def matchup_display(self) -> str:
+        return f"{self.home_team_display} vs {self.away_team_display}"
+
+    # Read-only dict-style access so existing callers of game['...'] keep working
+    def __getitem__(self, key: str):
+        if key in self.__slots__ or key in self._DERIVED:
+            return getattr(self, key)
+        if self.details and key in self.details:
+            return self.details[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"Game({self.espn_game_id!r}, {self.matchup_display!r})"
+
+    def to_dict(self, include_display: bool = False) -> Dict:
+        """JSON shape printed by the extractors"""
+        data = {
+            'espn_game_id': self.espn_game_id,
+            'away_team_name': self.away_team_name,
+            'home_team_name': self.home_team_name,
+            'away_team_espn_id': self.away_team_espn_id,
+            'home_team_espn_id': self.home_team_espn_id,
+            'away_team_rank': self.away_team_rank,
+            'home_team_rank': self.home_team_rank,
+            'away_team_logo_url': self.away_team_logo_url,
+            'home_team_logo_url': self.home_team_logo_url,
+            'game_date': self.game_date,
+            'betting_line': self.betting_line,
+            'matchup_display': self.matchup_display
+        }
+        if self.home_score is not None or self.away_score is not None:
+            data['home_score'] = self.home_score
+            data['away_score'] = self.away_score
+            data['is_completed'] = self.is_completed
+        if include_display:
+            data['away_team_display'] = self.away_team_display
+            data['home_team_display'] = self.home_team_display
+        if self.matchup_string is not None:
+            data['matchup_string'] = self.matchup_string
+        if self.details:
+            data.update(self.details)
+        return data
+
+    def to_row(self, week_id: int, game_number: int) -> Tuple:
+        """Values for GAMES_COLUMNS"""
+        return (week_id, game_number, self.home_team_espn_id, self.away_team_espn_id,
+                self.home_team_name, self.away_team_name, self.home_team_logo_url,
+                self.away_team_logo_url, self.game_date, self.betting_line, self.is_completed)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Game':
+        """Rebuild a Game from a to_dict() payload (e.g. saved JSON output)"""
+        known = set(cls.__slots__) | set(cls._DERIVED)
+        details = {k: v for k, v in data.items() if k not in known}
+        return cls(data.get('espn_game_id'), data.get('away_team_name', ''), data.get('home_team_name', ''),
+                   data.get('away_team_espn_id'), data.get('home_team_espn_id'),
+                   data.get('away_team_rank'), data.get('home_team_rank'),
+                   data.get('game_date'), data.get('betting_line'),
+                   bool(data.get('is_completed', False)), data.get('home_score'),
+                   data.get('away_score'), data.get('matchup_string'), details or None,
+                   data.get('seasontype'), data.get('week'))
+
+
+def game_row(game, week_id: int, game_number: int) -> Tuple:
+    """Games-table values for a Game or a legacy game dictionary"""
+    if isinstance(game, Game):
+        return game.to_row(week_id, game_number)
+    return (week_id, game_number, game.get('home_team_espn_id'), game.get('away_team_espn_id'),
+            game.get('home_team_name'), game.get('away_team_name'), game.get('home_team_logo_url'),
+            game.get('away_team_logo_url'), game.get('game_date'), game.get('betting_line'),
+            bool(game.get('is_completed', False)))
+
+
+def season_record(game: Game, season: Optional[int], seasontype: Optional[int], week: Optional[int]) -> Dict:
+    """Game dict tagged with season/seasontype/week: one line of the backfill JSON Lines format"""
+    record = game.to_dict()
+    record.update(season=season, seasontype=seasontype, week=week)
+    return record
+
+
+def merge_game_details(game: Game, details: Dict):
+    """Fold fields scraped from a game page into a Game (betting_line overrides the schedule's)"""
+    extra = dict(details)
+    if 'betting_line' in extra:
+        game.betting_line = extra.pop('betting_line')
+    if extra:
+        game.details = {**(game.details or {}), **extra}
+
+
+def _parse_date(date_str: str) -> Optional[str]:
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        return date_str
+
+
+def _parse_score(competitor: Dict) -> Optional[int]:
+    score = competitor.get('score')
+    if isinstance(score, dict):  # some endpoints nest it as {'value': 21.0, 'displayValue': '21'}
+        score = score.get('value')
+    try:
+        return int(float(score))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_event_with_keys(event: Dict) -> Optional[Tuple[Game, List[str], List[str]]]:
+    """
+    Parse one scoreboard event
+
+    Returns:
+        (game, away team lookup keys, home team lookup keys), or None for events
+        that aren't a two-team competition
+    """
+    competitions = event.get('competitions', [])
+    if not competitions:
+        return None
+    comp = competitions[0]
+    competitors = comp.get('competitors', [])
+    if len(competitors) != 2:
+        return None
+
+    home = next((c for c in competitors if c.get('homeAway') == 'home'), None)
+    away = next((c for c in competitors if c.get('homeAway') == 'away'), None)
+    if not home or not away:
+        return None
+
+    home_team = home.get('team', {})
+    away_team = away.get('team', {})
+
+    # Get betting line (odds)
+    odds = comp.get('odds', [])
+    betting_line = None
+    if odds:
+        spread = odds[0].get('spread')
+        if spread:
+            betting_line = float(spread)
+
+    # Scores are only meaningful once the game has kicked off
+    status_type = (comp.get('status') or event.get('status') or {}).get('type', {})
+    started = status_type.get('state', 'pre') != 'pre'
+    # Date-range scoreboards mix weeks, so keep the week each event was scheduled in
+    season = event.get('season') or {}
+    week = event.get('week') or {}
+
+    game = Game(
+        espn_game_id=event.get('id'),
+        away_team_name=away_team.get('displayName', ''),
+        home_team_name=home_team.get('displayName', ''),
+        away_team_espn_id=int(away_team.get('id', 0)),
+        home_team_espn_id=int(home_team.get('id', 0)),
+        away_team_rank=away.get('curatedRank', {}).get('current'),
+        home_team_rank=home.get('curatedRank', {}).get('current'),
+        game_date=_parse_date(comp.get('date', '')),
+        betting_line=betting_line,
+        is_completed=bool(status_type.get('completed', False)),
+        home_score=_parse_score(home) if started else None,
+        away_score=_parse_score(away) if started else None,
+        seasontype=season.get('type'),
+        week=week.get('number')
+    )
+    return game, team_keys(away_team), team_keys(home_team)
+
+
+def parse_event(event: Dict) -> Optional[Game]:
+    """Parse one scoreboard event into a Game (None if it isn't a two-team competition)"""
+    parsed = parse_event_with_keys(event)
+    return parsed[0] if parsed else None
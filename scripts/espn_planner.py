@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Scoreboard fetch planning for complete slates
+The bare scoreboard URL only returns ESPN's featured subset of a week. Asking
+per division (groups=80 FBS, groups=81 FCS) with a high limit returns every
+game, and a dates=YYYYMMDD-YYYYMMDD range covers many days in one request.
+The planner turns "this week", "week N" or "season S" into the fewest such
+requests, splits a date range in half whenever a response comes back
+truncated at the limit, and merges the results deduplicated by event id.
+
+Usage:
+    planner = FetchPlanner(ESPNAPIExtractor())
+    games = planner.fetch(plan_week(2024, 10, divisions=('fbs', 'fcs')))
+    season = planner.fetch(plan_season(2024))
+"""
+
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from espn_models import Game
+
+GROUPS = {'fbs': 80, 'fcs': 81}
+DEFAULT_DIVISIONS = ('fbs',)
+DEFAULT_LIMIT = 1000         # events per response; a full response means it was truncated
+MAX_RANGE_DAYS = 45          # about six weeks of games, well under the limit
+DEFAULT_WORKERS = 4
+
+REGULAR_SEASON = 2
+POSTSEASON = 3
+
+Entry = Tuple[Game, List[str], List[str]]
+
+
+def parse_divisions(text: str) -> List[str]:
+    """'fbs,fcs' -> ['fbs', 'fcs'] (argparse type)"""
+    divisions = [part.strip().lower() for part in text.split(',') if part.strip()]
+    if not divisions or any(division not in GROUPS for division in divisions):
+        raise argparse.ArgumentTypeError(f"expected a comma-separated list of {', '.join(GROUPS)}")
+    return divisions
+
+
+def slate_params(params: Optional[Dict] = None, divisions: Iterable[str] = DEFAULT_DIVISIONS,
+                 limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    """One complete-slate query per division for a scoreboard query (None = current week)"""
+    plan = []
+    for division in divisions:
+        if division not in GROUPS:
+            raise ValueError(f"Unknown division {division!r} (expected one of {', '.join(GROUPS)})")
+        query = dict(params or {})
+        query.update(groups=GROUPS[division], limit=limit)
+        plan.append(query)
+    return plan
+
+
+def plan_week(season: int, week: int, seasontype: int = REGULAR_SEASON,
+              divisions: Iterable[str] = DEFAULT_DIVISIONS) -> List[Dict]:
+    """Queries covering every game of one week"""
+    return slate_params({'dates': season, 'seasontype': seasontype, 'week': week}, divisions)
+
+
+def date_ranges(start: date, end: date, max_days: int = MAX_RANGE_DAYS) -> List[Tuple[date, date]]:
+    """Split [start, end] into consecutive inclusive ranges of at most max_days"""
+    ranges = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=max_days - 1))
+        ranges.append((start, stop))
+        start = stop + timedelta(days=1)
+    return ranges
+
+
+def _dates_param(start: date, end: date) -> str:
+    if start == end:
+        return start.strftime('%Y%m%d')
+    return f"{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
+
+
+def plan_dates(start: date, end: date, divisions: Iterable[str] = DEFAULT_DIVISIONS,
+               max_days: int = MAX_RANGE_DAYS) -> List[Dict]:
+    """Queries covering every game between two dates (inclusive) with date-range requests"""
+    plan = []
+    for range_start, range_end in date_ranges(start, end, max_days):
+        plan.extend(slate_params({'dates': _dates_param(range_start, range_end)}, divisions))
+    return plan
+
+
+def season_window(season: int, include_postseason: bool = True) -> Tuple[date, date]:
+    """Dates spanning a season: week 0 in late August through the title game in January"""
+    end = date(season + 1, 1, 31) if include_postseason else date(season, 12, 15)
+    return date(season, 8, 20), end
+
+
+def plan_season(season: int, divisions: Iterable[str] = DEFAULT_DIVISIONS,
+                include_postseason: bool = True, max_days: int = MAX_RANGE_DAYS) -> List[Dict]:
+    """Queries covering a whole season in a handful of date-range requests"""
+    start, end = season_window(season, include_postseason)
+    return plan_dates(start, end, divisions, max_days)
+
+
+def _split_range(query: Dict) -> Optional[List[Dict]]:
+    """Halve a query's date range (None if it covers a single day or isn't a range)"""
+    dates = str(query.get('dates', ''))
+    if '-' not in dates:
+        return None
+    start_text, end_text = dates.split('-', 1)
+    start = date(int(start_text[:4]), int(start_text[4:6]), int(start_text[6:8]))
+    end = date(int(end_text[:4]), int(end_text[4:6]), int(end_text[6:8]))
+    middle = start + (end - start) // 2
+    halves = []
+    for range_start, range_end in ((start, middle), (middle + timedelta(days=1), end)):
+        half = dict(query)
+        half['dates'] = _dates_param(range_start, range_end)
+        halves.append(half)
+    return halves
+
+
+def event_key(game: Game):
+    """Identity of a scoreboard event across overlapping queries"""
+    if game.espn_game_id:
+        return game.espn_game_id
+    return (game.home_team_espn_id, game.away_team_espn_id, game.game_date)
+
+
+class FetchPlanner:
+    """Runs scoreboard plans concurrently and merges them into one deduplicated slate"""
+
+    def __init__(self, extractor, workers: int = DEFAULT_WORKERS):
+        """
+        Args:
+            extractor: ESPNAPIExtractor (anything with get_scoreboard_entries)
+            workers: Scoreboard requests in flight (the HTTP client still rate limits per host)
+        """
+        self.extractor = extractor
+        self.workers = max(1, workers)
+        self.requests_made = 0
+
+    def fetch_with_keys(self, plan: List[Dict], max_age: Optional[float] = None) -> List[Entry]:
+        """
+        Fetch every query in plan and merge the events
+
+        Returns:
+            (game, away keys, home keys) per distinct event, ordered by kickoff
+        """
+        merged: Dict = {}
+        lock = threading.Lock()
+
+        def consume(order: int, query: Dict) -> int:
+            # Entries are merged as the response is decoded, so no query's entries are held
+            # as a list. A truncated query's entries are kept too; its halves only add what
+            # was cut off. The earliest (round, query, position) wins, as if merged in plan order.
+            count = 0
+            for entry in self.extractor.get_scoreboard_entries(query, max_age):
+                rank = (rounds, order, count)
+                count += 1
+                key = event_key(entry[0])
+                with lock:
+                    if key not in merged or rank < merged[key][0]:
+                        merged[key] = (rank, entry)
+            return count
+
+        rounds = 0
+        pending = list(plan)
+        while pending:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                counts = list(pool.map(consume, range(len(pending)), pending))
+            rounds += 1
+            self.requests_made += len(pending)
+
+            retry = []
+            for query, count in zip(pending, counts):
+                limit = query.get('limit')
+                if limit and count >= limit:
+                    halves = _split_range(query)
+                    if halves:
+                        # Truncated at the limit: refetch the range in two halves
+                        retry.extend(halves)
+                        continue
+                    print(f"[WARN] Scoreboard query {query} hit the {limit}-event limit; some games may be missing")
+            pending = retry
+
+        ranked = sorted(merged.values(), key=lambda item: item[0])
+        return sorted((entry for _, entry in ranked), key=lambda entry: entry[0].game_date or '')
+
+    def fetch(self, plan: List[Dict], max_age: Optional[float] = None) -> List[Game]:
+        """Games for every query in plan, deduplicated by event id and ordered by kickoff"""
+        return [game for game, _, _ in self.fetch_with_keys(plan, max_age)]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+ESPN Game-Day Poller
+Long-running mode that keeps a week's Games rows current while games are
+played. Polls are scheduled around each game's kickoff window, each game's
+stored state (completed flag, line, final score) is hashed, and only games
+whose hash changed are written to Games/GameResults.
+
+Usage:
+    python espn_poller.py --week-id 42
+    python espn_poller.py --week-id 42 --season 2024 --week 10 --interval 30
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from espn_api_extractor import ESPNAPIExtractor
+from espn_db import db_config_from_env, load_week_state, pooled_connection, write_game_status
+from espn_metrics import export_at_exit, metrics
+from espn_models import Game
+from espn_snapshots import snapshot_week
+
+DEFAULT_POLL_INTERVAL = 60       # while any game is inside its window
+DEFAULT_IDLE_INTERVAL = 30 * 60  # longest sleep between windows (lines still move)
+# Consecutive polls in which no scoreboard game matched a stored row before giving up
+MAX_UNMATCHED_POLLS = 3
+PREGAME_LEAD = 15 * 60           # start polling this long before kickoff
+GAME_WINDOW = 5 * 3600           # stop treating a game as live this long after kickoff
+# Keep polling a game this long past its window for delays and overtime; after
+# that it is treated as canceled, postponed or suspended (those never go final)
+MAX_OVERRUN = 6 * 3600
+
+
+def state_digest(is_completed: bool, betting_line: Optional[float],
+                 home_score: Optional[int], away_score: Optional[int]) -> str:
+    """Hash of the state we persist for a game; scores only count once the game is final"""
+    if not is_completed:
+        home_score = away_score = None
+    line = round(float(betting_line), 1) if betting_line is not None else None
+    return hashlib.sha1(repr((bool(is_completed), line, home_score, away_score)).encode()).hexdigest()
+
+
+def _kickoff(game: Game) -> Optional[datetime]:
+    if not game.game_date:
+        return None
+    try:
+        kickoff = datetime.fromisoformat(game.game_date.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return kickoff if kickoff.tzinfo else kickoff.replace(tzinfo=timezone.utc)
+
+
+def _abandoned(game: Game, now: datetime) -> bool:
+    """True once a game that never went final is past its window plus MAX_OVERRUN"""
+    kickoff = _kickoff(game)
+    return kickoff is not None and (now - kickoff).total_seconds() > GAME_WINDOW + MAX_OVERRUN
+
+
+class GameDayPoller:
+    """Poll the scoreboard around kickoff windows and write only changed games"""
+
+    def __init__(self, week_id: int, db_config: Dict, extractor: Optional[ESPNAPIExtractor] = None,
+                 params: Optional[Dict] = None, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 idle_interval: float = DEFAULT_IDLE_INTERVAL,
+                 on_change: Optional[Callable[[List[Game]], None]] = None,
+                 snapshot_dir: Optional[str] = None):
+        """
+        Args:
+            week_id: Week ID from Weeks table whose games are tracked
+            db_config: Dictionary with database connection info
+            extractor: API extractor used for scoreboard fetches
+            params: Scoreboard query (defaults to the current week)
+            poll_interval: Seconds between polls while games are live
+            idle_interval: Max seconds to sleep while no game is live
+            on_change: Called with the changed games after each write
+            snapshot_dir: Rewrite the week's static snapshot here after each write (espn_snapshots.py)
+        """
+        self.week_id = week_id
+        self.db_config = db_config
+        self.extractor = extractor or ESPNAPIExtractor()
+        self.params = params
+        self.poll_interval = poll_interval
+        self.idle_interval = idle_interval
+        self.on_change = on_change
+        self.snapshot_dir = snapshot_dir
+
+        # (home_team_espn_id, away_team_espn_id) -> Games.id / last written digest / stored line
+        self._game_ids: Dict[Tuple[int, int], int] = {}
+        self._digests: Dict[Tuple[int, int], str] = {}
+        self._lines: Dict[Tuple[int, int], Optional[float]] = {}
+        self._tracked: List[Game] = []
+
+    def load_state(self):
+        """Seed digests from what the database already holds so unchanged games are never rewritten"""
+        with pooled_connection(self.db_config, self.extractor.db_pool_size) as connection:
+            state = load_week_state(connection, self.week_id)
+        for key, (game_id, is_completed, betting_line, home_score, away_score) in state.items():
+            self._game_ids[key] = game_id
+            self._lines[key] = betting_line
+            self._digests[key] = state_digest(is_completed, betting_line, home_score, away_score)
+
+    def poll_once(self) -> List[Game]:
+        """
+        Fetch the full slate once and write games whose state changed
+
+        Returns:
+            The changed games
+        """
+        games = self.extractor.get_slate_games(self.params, max_age=0)
+
+        tracked = []
+        changed = []
+        status_rows = []
+        result_rows = []
+        new_digests = {}
+
+        for game in games:
+            key = (game.home_team_espn_id, game.away_team_espn_id)
+            game_id = self._game_ids.get(key)
+            if game_id is None:
+                continue  # not one of this week's pick'em games
+            tracked.append(game)
+
+            # ESPN drops odds once a game kicks off; keep the line we already stored
+            if game.betting_line is None:
+                game.betting_line = self._lines.get(key)
+
+            digest = state_digest(game.is_completed, game.betting_line, game.home_score, game.away_score)
+            if digest == self._digests.get(key):
+                continue
+
+            status_rows.append((game.is_completed, game.betting_line, game_id))
+            if game.is_completed and game.home_score is not None and game.away_score is not None:
+                home_won = game.home_score > game.away_score
+                result_rows.append((
+                    game_id,
+                    game.home_score,
+                    game.away_score,
+                    game.home_team_espn_id if home_won else game.away_team_espn_id,
+                    game.home_team_name if home_won else game.away_team_name
+                ))
+            new_digests[key] = digest
+            changed.append(game)
+
+        if status_rows:
+            with pooled_connection(self.db_config, self.extractor.db_pool_size) as connection:
+                write_game_status(connection, status_rows, result_rows)
+                if self.snapshot_dir:
+                    snapshot_week(connection, self.week_id, self.snapshot_dir)
+            self._digests.update(new_digests)
+            for game in changed:
+                self._lines[(game.home_team_espn_id, game.away_team_espn_id)] = game.betting_line
+            if self.on_change:
+                self.on_change(changed)
+
+        self._tracked = tracked
+        return changed
+
+    def next_delay(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds until the next poll, or None once no tracked game can still change"""
+        now = now or datetime.now(timezone.utc)
+        pending = [game for game in self._tracked if not game.is_completed and not _abandoned(game, now)]
+        if not pending:
+            return None
+
+        next_window = None
+        for game in pending:
+            kickoff = _kickoff(game)
+            if kickoff is None:
+                return self.poll_interval
+            window_start = (kickoff - now).total_seconds() - PREGAME_LEAD
+            window_end = (kickoff - now).total_seconds() + GAME_WINDOW
+            if window_start <= 0 <= window_end or window_end < 0:
+                # Live, or past its window but not final yet (delays, overtime)
+                return self.poll_interval
+            next_window = window_start if next_window is None else min(next_window, window_start)
+
+        return max(self.poll_interval, min(next_window, self.idle_interval))
+
+    def run(self, max_polls: Optional[int] = None):
+        """Poll until every tracked game is final (or max_polls is reached)"""
+        self.load_state()
+        if not self._game_ids:
+            print(f"[WARN] No games stored for week_id {self.week_id}; nothing to poll")
+            return
+
+        polls = 0
+        unmatched = 0
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            polled = False
+            try:
+                changed = self.poll_once()
+                polled = True
+                stamp = datetime.now().strftime('%H:%M:%S')
+                if changed:
+                    print(f"[OK] {stamp} Updated {len(changed)} game(s): "
+                          f"{', '.join(game.matchup_display for game in changed)}")
+                else:
+                    print(f"[INFO] {stamp} No changes")
+            except Exception as e:
+                metrics.inc('espn_errors_total', stage='poll')
+                print(f"[ERROR] Poll failed: {e}")
+            metrics.export()
+
+            if self._tracked:
+                unmatched = 0
+                delay = self.next_delay()
+            elif polled:
+                # The slate came back but none of it is in Games (wrong week, or the
+                # rows were replaced): back off, and stop rather than poll forever
+                unmatched += 1
+                if unmatched >= MAX_UNMATCHED_POLLS:
+                    print(f"[WARN] No scoreboard game matched week_id {self.week_id} "
+                          f"in {unmatched} polls; stopping")
+                    return
+                delay = self.idle_interval
+            else:
+                delay = self.poll_interval
+            if delay is None:
+                now = datetime.now(timezone.utc)
+                stalled = [game for game in self._tracked if not game.is_completed and _abandoned(game, now)]
+                if stalled:
+                    print(f"[WARN] Stopped polling {len(stalled)} game(s) that never went final: "
+                          f"{', '.join(game.matchup_display for game in stalled)}")
+                print("[SUCCESS] No games left to poll" if stalled else "[SUCCESS] All games final")
+                return
+            time.sleep(delay)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Keep a week's Games rows current on game day")
+    parser.add_argument('--week-id', type=int, required=True, help="Week ID from Weeks table")
+    parser.add_argument('--season', type=int, help="Season year (defaults to the current week)")
+    parser.add_argument('--week', type=int, help="Week number within the season")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Seconds between polls while games are live")
+    parser.add_argument('--snapshot-dir', default=os.getenv('ESPN_SNAPSHOT_DIR'),
+                        help="Rewrite the week's static JSON snapshot here after each change (ESPN_SNAPSHOT_DIR)")
+    args = parser.parse_args()
+
+    params = None
+    if args.season and args.week:
+        params = {'dates': args.season, 'seasontype': 2, 'week': args.week}
+
+    print("ESPN Game-Day Poller")
+    print("=" * 60)
+    poller = GameDayPoller(args.week_id, db_config_from_env(), params=params, poll_interval=args.interval,
+                           snapshot_dir=args.snapshot_dir)
+    export_at_exit()
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopped")
+
+
+if __name__ == "__main__":
+    main()
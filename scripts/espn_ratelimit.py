@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-host rate limiting and retries for ESPN requests
+Every request through the shared HTTP client passes a RequestScheduler, which
+keeps one token bucket and one concurrency ceiling per host:
+
+- The bucket's rate creeps up while responses are fast and successful, is
+  halved on 429/503 (honoring Retry-After) and cut on other 5xx or slow
+  responses, so bulk crawls settle at whatever ESPN tolerates
+- Throttled, 5xx and timed-out requests are retried with jittered
+  exponential backoff before an error is surfaced to the caller
+
+Configuration (environment): ESPN_RATE (starting requests/second per host),
+ESPN_MAX_RATE, ESPN_MAX_CONCURRENCY, ESPN_MAX_RETRIES.
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from espn_metrics import endpoint_name, metrics
+
+DEFAULT_RATE = 5.0            # requests/second per host to start with
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 20.0
+DEFAULT_MAX_CONCURRENCY = 8   # requests in flight per host
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5    # seconds; doubled per attempt
+DEFAULT_BACKOFF_CAP = 30.0
+SLOW_RESPONSE = 2.0           # seconds; slower responses ease the rate off
+
+RATE_INCREASE = 0.1           # additive, per fast successful response
+THROTTLE_DECREASE = 0.5       # multiplicative, on 429/503
+ERROR_DECREASE = 0.75         # multiplicative, on other 5xx and timeouts
+SLOW_DECREASE = 0.9           # multiplicative, on slow responses
+
+THROTTLE_STATUSES = (429, 503)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_CAP) -> float:
+    """Full-jitter exponential backoff for retry number attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HostLimiter:
+    """Token bucket plus in-flight ceiling for one host, with AIMD rate adaptation"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available (and any Retry-After pause has passed)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def feedback(self, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """Adjust the rate from one response (status None = timeout/connection error)"""
+        with self._lock:
+            if status in THROTTLE_STATUSES:
+                self.rate = max(self.min_rate, self.rate * THROTTLE_DECREASE)
+                self._tokens = 0.0
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            elif status is None or status >= 500:
+                self.rate = max(self.min_rate, self.rate * ERROR_DECREASE)
+            elif latency > SLOW_RESPONSE:
+                self.rate = max(self.min_rate, self.rate * SLOW_DECREASE)
+            else:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+
+class RequestScheduler:
+    """Shared per-host limiter and retry loop used by HTTPClient"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_cap: float = DEFAULT_BACKOFF_CAP):
+        """
+        Args:
+            rate: Starting requests/second per host
+            min_rate: Floor the rate never drops below
+            max_rate: Ceiling the rate never climbs above
+            max_concurrency: Max requests in flight per host
+            max_retries: Retries after the first attempt for throttled/5xx/failed requests
+            backoff_base: First retry waits up to this many seconds (doubling per attempt)
+            backoff_cap: Longest single backoff
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'RequestScheduler':
+        return cls(rate=float(os.getenv('ESPN_RATE', DEFAULT_RATE)),
+                   max_rate=float(os.getenv('ESPN_MAX_RATE', DEFAULT_MAX_RATE)),
+                   max_concurrency=int(os.getenv('ESPN_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)),
+                   max_retries=int(os.getenv('ESPN_MAX_RETRIES', DEFAULT_MAX_RETRIES)))
+
+    def limiter(self, host: str) -> HostLimiter:
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = self._hosts[host] = HostLimiter(self.rate, self.min_rate, self.max_rate,
+                                                          self.max_concurrency)
+            return limiter
+
+    def rates(self) -> Dict[str, float]:
+        """Current adapted rate per host"""
+        with self._lock:
+            return {host: round(limiter.rate, 2) for host, limiter in self._hosts.items()}
+
+    def call(self, host: str, url: str, send: Callable[[], object],
+             retry_exceptions: Tuple[Type[BaseException], ...] = (OSError,)):
+        """
+        Send a request under the host's rate limit, retrying transient failures
+
+        Args:
+            host: Host the request goes to (one bucket per host)
+            url: Request URL (for metrics labels)
+            send: Performs the request and returns a response with status_code/headers
+            retry_exceptions: Exceptions treated as transient (timeouts, connection resets)
+
+        Returns:
+            The first non-retryable response, or the last response once retries run out.
+            The last exception is re-raised if every attempt failed without a response.
+        """
+        limiter = self.limiter(host)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            start = time.perf_counter()
+            with limiter.slots:
+                try:
+                    response = send()
+                except retry_exceptions:
+                    limiter.feedback(None, time.perf_counter() - start)
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                else:
+                    status = response.status_code
+                    retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                    limiter.feedback(status, time.perf_counter() - start, retry_after)
+                    if status not in RETRY_STATUSES or attempt >= self.max_retries:
+                        return response
+                    if status in THROTTLE_STATUSES:
+                        metrics.inc('espn_http_throttled_total', endpoint=endpoint_name(url))
+                    # The retried response is discarded; release its connection first
+                    if hasattr(response, 'close'):
+                        response.close()
+                    # The server's Retry-After wins over our own backoff cap
+                    delay = retry_after if retry_after is not None else \
+                        backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+
+            metrics.inc('espn_http_retries_total', endpoint=endpoint_name(url))
+            attempt += 1
+            time.sleep(delay)
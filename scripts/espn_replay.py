@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Record/replay of ESPN HTTP traffic
+A ResponseArchive is a deflate-compressed zip holding one body plus a small
+JSON header per distinct request (URL + query). RecordingClient wraps the
+normal HTTP client and saves every response it returns; ReplayClient serves
+the extractors from an archive without touching the network, so past weeks
+can be re-processed and parser changes tested deterministically.
+
+The shared client switches mode from the environment:
+    ESPN_RECORD=week10.zip python espn_api_extractor.py ...   # fetch and record
+    ESPN_REPLAY=week10.zip python espn_api_extractor.py ...   # serve from the archive
+
+Usage:
+    python espn_replay.py list week10.zip
+    python espn_replay.py fixtures week10.zip benchmarks/fixtures
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from typing import Dict, Iterator, Optional
+
+from espn_cache import CachedResponse, make_cache_key
+
+# Response headers worth keeping (the rest is CDN noise)
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode for a request the archive doesn't contain"""
+
+
+class ResponseArchive:
+    """Zip archive of recorded responses keyed like the response cache"""
+
+    def __init__(self, path: str, mode: str = 'r'):
+        """
+        Args:
+            path: Archive file
+            mode: 'r' to replay, 'a' to record (creating the file if needed)
+        """
+        if mode not in ('r', 'a'):
+            raise ValueError("mode must be 'r' or 'a'")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+        self._keys = {name[:-5] for name in self._zip.namelist() if name.endswith('.json')}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[CachedResponse]:
+        """Recorded response for url/params, or None"""
+        key = make_cache_key(url, params)
+        if key not in self._keys:
+            return None
+        with self._lock:
+            meta = json.loads(self._zip.read(f"{key}.json"))
+            content = self._zip.read(f"{key}.body")
+        return CachedResponse(meta['url'], meta['status'], content, meta.get('headers'))
+
+    def put(self, url: str, params: Optional[Dict], response) -> bool:
+        """
+        Store a response (the first recording of a request wins)
+
+        Returns:
+            True if it was written, False if the request was already archived
+        """
+        if self.mode != 'a':
+            raise ValueError("Archive is open read-only")
+        key = make_cache_key(url, params)
+        meta = {
+            'url': url,
+            'params': params,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'recorded_at': time.time()
+        }
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._zip.writestr(f"{key}.body", response.content)
+            self._zip.writestr(f"{key}.json", json.dumps(meta))
+            self._keys.add(key)
+        return True
+
+    def entries(self) -> Iterator[Dict]:
+        """Headers of every recorded response (url, params, status, headers, recorded_at, key, size)"""
+        for key in sorted(self._keys):
+            with self._lock:
+                meta = json.loads(self._zip.read(f"{key}.json"))
+                size = self._zip.getinfo(f"{key}.body").file_size
+            meta.update(key=key, size=size)
+            yield meta
+
+    def read_body(self, key: str) -> bytes:
+        with self._lock:
+            return self._zip.read(f"{key}.body")
+
+    def close(self):
+        with self._lock:
+            self._zip.close()
+
+
+class RecordingClient:
+    """HTTP client wrapper that archives every response it returns"""
+
+    def __init__(self, client, archive: ResponseArchive):
+        self.client = client
+        self.archive = archive
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, stream: bool = False, max_age: Optional[float] = None):
+        # The archive needs the whole body, so streamed requests are read in full while recording
+        response = self.client.get(url, params=params, headers=headers, timeout=timeout, max_age=max_age)
+        # Server errors aren't worth replaying
+        if response.status_code < 500:
+            self.archive.put(url, params, response)
+        if not stream:
+            return response
+        # The body has been consumed; hand streaming callers a fresh copy of it
+        recorded = CachedResponse(url, response.status_code, response.content,
+                                  dict(response.headers), from_cache=False)
+        response.close()
+        return recorded
+
+    def close(self):
+        self.client.close()
+        self.archive.close()
+
+
+class ReplayClient:
+    """Drop-in HTTP client serving responses from an archive only"""
+
+    def __init__(self, archive: ResponseArchive):
+        self.archive = archive
+        self.cache = None
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, stream: bool = False, max_age: Optional[float] = None):
+        response = self.archive.get(url, params)
+        if response is None:
+            raise ReplayMissError(f"Not in archive {self.archive.path}: {url} {params or ''}".strip())
+        return response
+
+    def close(self):
+        self.archive.close()
+
+
+def client_from_env(build_client):
+    """
+    Shared-client factory honoring ESPN_REPLAY / ESPN_RECORD
+
+    Args:
+        build_client: Callable returning the normal network client
+    """
+    replay_path = os.getenv('ESPN_REPLAY')
+    if replay_path:
+        return ReplayClient(ResponseArchive(replay_path, 'r'))
+    record_path = os.getenv('ESPN_RECORD')
+    if record_path:
+        return RecordingClient(build_client(), ResponseArchive(record_path, 'a'))
+    return build_client()
+
+
+# Benchmark fixture names by endpoint (see benchmarks/fixtures.py)
+_FIXTURE_ENDPOINTS = [
+    ('/college-football/teams', 'teams.json'),
+    ('/college-football/schedule', 'schedule.html'),
+    ('/college-football/game/', 'game.html'),
+]
+
+
+def export_fixtures(archive: ResponseArchive, fixtures_dir: str) -> Dict[str, str]:
+    """
+    Write recorded responses as benchmark fixtures
+
+    Every scoreboard becomes scoreboard_<events>.json; the largest recorded
+    teams/schedule/game responses become teams.json/schedule.html/game.html.
+
+    Returns:
+        {fixture name: source URL}
+    """
+    os.makedirs(fixtures_dir, exist_ok=True)
+    chosen: Dict[str, Dict] = {}
+    for entry in archive.entries():
+        if entry['status'] != 200:
+            continue
+        url = entry['url']
+        if '/college-football/scoreboard' in url:
+            events = len(json.loads(archive.read_body(entry['key'])).get('events', []))
+            if events:
+                chosen[f"scoreboard_{events}.json"] = entry
+            continue
+        for pattern, name in _FIXTURE_ENDPOINTS:
+            if pattern in url and entry['size'] > chosen.get(name, {}).get('size', -1):
+                chosen[name] = entry
+                break
+
+    for name, entry in chosen.items():
+        with open(os.path.join(fixtures_dir, name), 'wb') as f:
+            f.write(archive.read_body(entry['key']))
+    return {name: entry['url'] for name, entry in chosen.items()}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Inspect ESPN response archives")
+    commands = parser.add_subparsers(dest='command', required=True)
+    list_parser = commands.add_parser('list', help="List recorded requests as JSON lines")
+    list_parser.add_argument('archive')
+    fixtures_parser = commands.add_parser('fixtures', help="Write recorded responses as benchmark fixtures")
+    fixtures_parser.add_argument('archive')
+    fixtures_parser.add_argument('fixtures_dir')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.archive):
+        print(f"[ERROR] No archive at {args.archive}", file=sys.stderr)
+        sys.exit(1)
+
+    archive = ResponseArchive(args.archive, 'r')
+    try:
+        if args.command == 'list':
+            for entry in archive.entries():
+                print(json.dumps(entry))
+        else:
+            for name, url in sorted(export_fixtures(archive, args.fixtures_dir).items()):
+                print(f"[OK] {name} <- {url}")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
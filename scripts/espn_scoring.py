@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Batch pick scoring against completed Games
+Settles a whole week in one pass: the week's UserPicks and final scores are
+loaded with one query each, every pick is graded straight-up and against the
+spread with vectorized comparisons, and the results go back as bulk UPDATEs
+(only picks whose grade changed) plus one multi-row WeeklyUserStats upsert
+instead of per-pick queries.
+
+UserPicks.is_correct holds the straight-up grade by default (the site's picks
+are "who wins"); mode='ats' stores the against-the-spread grade instead. Both
+grades are always reported. betting_line is the home team's spread
+(-7.0 = home favored by 7), so the home team covers when margin + line > 0.
+Picks on unfinished games, pushes and games without a line (ATS) stay NULL.
+
+Usage:
+    python espn_scoring.py --week-id 42
+    python espn_scoring.py --week-id 42 --mode ats --dry-run
+"""
+
+import argparse
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from espn_db import DEFAULT_BATCH_SIZE
+from espn_metrics import metrics
+
+MODES = ('su', 'ats')
+
+# Grade codes; UNGRADED is written as NULL
+CORRECT = 1
+INCORRECT = 0
+UNGRADED = -1
+
+SELECT_WEEK_RESULTS_SQL = (
+    "SELECT g.id, g.home_team_espn_id, g.away_team_espn_id, g.betting_line, g.is_completed, "
+    "r.home_team_score, r.away_team_score "
+    "FROM Games g LEFT JOIN GameResults r ON r.game_id = g.id "
+    "WHERE g.week_id = %s"
+)
+
+SELECT_WEEK_PICKS_SQL = (
+    "SELECT id, user_id, game_id, picked_team_espn_id, is_correct FROM UserPicks WHERE week_id = %s"
+)
+
+
+
+def update_picks_sql(count: int) -> str:
+    """One UPDATE setting is_correct for count picks by UserPicks.id (CASE on id)"""
+    return (f"UPDATE UserPicks SET is_correct = CASE id {' '.join(['WHEN %s THEN %s'] * count)} END "
+            f"WHERE id IN ({', '.join(['%s'] * count)})")
+
+
+UPSERT_WEEKLY_STATS_SQL = (
+    "INSERT INTO WeeklyUserStats (user_id, week_id, total_picks, correct_picks, incorrect_picks, accuracy) "
+    "VALUES (%s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE total_picks = VALUES(total_picks), "
+    "correct_picks = VALUES(correct_picks), "
+    "incorrect_picks = VALUES(incorrect_picks), "
+    "accuracy = VALUES(accuracy)"
+)
+
+# Season-long totals for everyone who picked this week, recomputed in one statement
+# so total_picks, correct_picks and accuracy always come from the same aggregate.
+# Accuracy is over graded picks only (ungraded and pushed picks have is_correct NULL),
+# the same denominator WeeklyUserStats uses
+UPDATE_PROFILE_TOTALS_SQL = (
+    "UPDATE UserProfiles p JOIN ("
+    "SELECT user_id, COUNT(*) AS total, SUM(is_correct = TRUE) AS correct, "
+    "SUM(is_correct IS NOT NULL) AS graded "
+    "FROM UserPicks WHERE user_id IN (SELECT user_id FROM UserPicks WHERE week_id = %s) "
+    "GROUP BY user_id) s ON s.user_id = p.user_id "
+    "SET p.total_picks = s.total, "
+    "p.correct_picks = s.correct, "
+    "p.accuracy = IF(s.graded > 0, ROUND(100 * s.correct / s.graded, 2), 0)"
+)
+
+
+def _number(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class WeekResults:
+    """A week's games as arrays sorted by Games.id, with final scores where known"""
+
+    def __init__(self, rows: List[tuple]):
+        """
+        Args:
+            rows: (game_id, home_id, away_id, betting_line, is_completed, home_score, away_score)
+                tuples, as returned by SELECT_WEEK_RESULTS_SQL
+        """
+        rows = sorted(rows, key=lambda row: row[0])
+        self.game_id = np.array([row[0] for row in rows], dtype=np.int64)
+        self.home_id = np.array([row[1] for row in rows], dtype=np.int64)
+        self.away_id = np.array([row[2] for row in rows], dtype=np.int64)
+        self.line = np.array([_number(row[3]) for row in rows], dtype=np.float64)
+        self.completed = np.array([bool(row[4]) for row in rows], dtype=np.bool_)
+        self.home_score = np.array([_number(row[5]) for row in rows], dtype=np.float64)
+        self.away_score = np.array([_number(row[6]) for row in rows], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.game_id)
+
+
+class WeekPicks:
+    """A week's UserPicks rows as arrays; stored is_correct is coded like the grades"""
+
+    def __init__(self, rows: List[tuple]):
+        """
+        Args:
+            rows: (pick_id, user_id, game_id, picked_team_espn_id, is_correct) tuples,
+                as returned by SELECT_WEEK_PICKS_SQL
+        """
+        self.pick_id = np.array([row[0] for row in rows], dtype=np.int64)
+        self.user_id = np.array([row[1] for row in rows], dtype=np.int64)
+        self.game_id = np.array([row[2] for row in rows], dtype=np.int64)
+        self.picked_id = np.array([row[3] for row in rows], dtype=np.int64)
+        self.stored = np.array([UNGRADED if row[4] is None else int(bool(row[4])) for row in rows],
+                               dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.pick_id)
+
+
+def grade_picks(picks: WeekPicks, results: WeekResults, mode: str = 'su') -> np.ndarray:
+    """
+    Grade every pick at once
+
+    Args:
+        picks: The week's picks
+        results: The week's games
+        mode: 'su' (picked the winner) or 'ats' (picked team covered the spread)
+
+    Returns:
+        int8 array aligned with picks: CORRECT, INCORRECT or UNGRADED
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown scoring mode {mode!r} (expected one of {', '.join(MODES)})")
+    grades = np.full(len(picks), UNGRADED, dtype=np.int8)
+    if not len(picks) or not len(results):
+        return grades
+
+    # Row of each pick's game in the sorted results
+    row = np.minimum(np.searchsorted(results.game_id, picks.game_id), len(results) - 1)
+    found = results.game_id[row] == picks.game_id
+
+    home_picked = picks.picked_id == results.home_id[row]
+    away_picked = picks.picked_id == results.away_id[row]
+    margin = results.home_score[row] - results.away_score[row]
+    if mode == 'ats':
+        margin = margin + results.line[row]
+    # Positive when the picked side won (su) or covered (ats); NaN without scores or a line
+    picked_margin = np.where(home_picked, margin, -margin)
+
+    graded = (found & results.completed[row] & (home_picked | away_picked)
+              & ~np.isnan(picked_margin) & (picked_margin != 0))
+    grades[graded] = np.where(picked_margin[graded] > 0, CORRECT, INCORRECT)
+    return grades
+
+
+def _accuracy(correct: np.ndarray, graded: np.ndarray) -> np.ndarray:
+    """Percent correct of graded picks, rounded like DECIMAL(5,2); 0 before anything is graded"""
+    return np.round(np.where(graded > 0, 100.0 * correct / np.maximum(graded, 1), 0.0), 2)
+
+
+def standings(picks: WeekPicks, su_grades: np.ndarray, ats_grades: np.ndarray) -> List[Dict]:
+    """
+    Per-user totals for the week
+
+    Returns:
+        One row per user, best straight-up record first
+    """
+    users, inverse = np.unique(picks.user_id, return_inverse=True)
+    size = len(users)
+    total = np.bincount(inverse, minlength=size)
+    correct = np.bincount(inverse[su_grades == CORRECT], minlength=size)
+    incorrect = np.bincount(inverse[su_grades == INCORRECT], minlength=size)
+    ats_correct = np.bincount(inverse[ats_grades == CORRECT], minlength=size)
+    ats_incorrect = np.bincount(inverse[ats_grades == INCORRECT], minlength=size)
+    accuracy = _accuracy(correct, correct + incorrect)
+    ats_accuracy = _accuracy(ats_correct, ats_correct + ats_incorrect)
+
+    order = np.lexsort((users, -ats_correct, -correct))
+    return [{
+        'user_id': int(users[i]),
+        'total_picks': int(total[i]),
+        'correct_picks': int(correct[i]),
+        'incorrect_picks': int(incorrect[i]),
+        'accuracy': float(accuracy[i]),
+        'ats_correct': int(ats_correct[i]),
+        'ats_incorrect': int(ats_incorrect[i]),
+        'ats_accuracy': float(ats_accuracy[i]),
+    } for i in order]
+
+
+def load_week(connection, week_id: int):
+    """The week's (WeekPicks, WeekResults), one query each"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SELECT_WEEK_RESULTS_SQL, (week_id,))
+        results = WeekResults(cursor.fetchall())
+        cursor.execute(SELECT_WEEK_PICKS_SQL, (week_id,))
+        picks = WeekPicks(cursor.fetchall())
+        return picks, results
+    finally:
+        cursor.close()
+
+
+def _pick_updates(pick_ids: np.ndarray, grades: np.ndarray, batch_size: int) -> List[Tuple[str, List]]:
+    """(update_picks_sql, params) per batch of pick ids"""
+    values = {CORRECT: True, INCORRECT: False, UNGRADED: None}
+    statements = []
+    for start in range(0, len(pick_ids), batch_size):
+        ids = [int(pick_id) for pick_id in pick_ids[start:start + batch_size]]
+        params = []
+        for pick_id, grade in zip(ids, grades[start:start + batch_size]):
+            params.extend((pick_id, values[int(grade)]))
+        params.extend(ids)
+        statements.append((update_picks_sql(len(ids)), params))
+    return statements
+
+
+def settle_week(connection, week_id: int, mode: str = 'su', batch_size: int = DEFAULT_BATCH_SIZE,
+                dry_run: bool = False) -> Dict:
+    """
+    Grade a week's picks and write is_correct, WeeklyUserStats and UserProfiles totals
+
+    Args:
+        connection: Open DB-API connection (mysql.connector or compatible, %s paramstyle)
+        week_id: Week ID from Weeks table
+        mode: Grade stored in UserPicks.is_correct ('su' or 'ats')
+        batch_size: Pick ids per UPDATE statement
+        dry_run: Grade and report without writing
+
+    Returns:
+        Summary with pick counts and the week's standings
+    """
+    picks, results = load_week(connection, week_id)
+
+    with metrics.timer('scoring'):
+        su_grades = grade_picks(picks, results, 'su')
+        ats_grades = grade_picks(picks, results, 'ats')
+        table = standings(picks, su_grades, ats_grades)
+    grades = ats_grades if mode == 'ats' else su_grades
+
+    # Only picks whose stored grade differs are rewritten, so re-settling a week is cheap
+    changed = grades != picks.stored
+    statements = _pick_updates(picks.pick_id[changed], grades[changed], max(1, batch_size))
+    # WeeklyUserStats tracks the same grade as is_correct
+    keys = ('ats_correct', 'ats_incorrect', 'ats_accuracy') if mode == 'ats' else \
+        ('correct_picks', 'incorrect_picks', 'accuracy')
+    stats_rows = [(row['user_id'], week_id, row['total_picks']) + tuple(row[key] for key in keys)
+                  for row in table]
+
+    if not dry_run and (statements or stats_rows):
+        cursor = connection.cursor()
+        try:
+            with metrics.timer('db_scoring'):
+                for statement, params in statements:
+                    cursor.execute(statement, params)
+                if stats_rows:
+                    cursor.executemany(UPSERT_WEEKLY_STATS_SQL, stats_rows)
+                    cursor.execute(UPDATE_PROFILE_TOTALS_SQL, (week_id,))
+                connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        metrics.inc('espn_db_rows_total', int(changed.sum()), table='UserPicks', action='updated')
+        metrics.inc('espn_db_rows_total', len(stats_rows), table='WeeklyUserStats', action='upserted')
+
+    return {
+        'week_id': week_id,
+        'mode': mode,
+        'games': len(results),
+        'final_games': int(results.completed.sum()),
+        'picks': len(picks),
+        'graded': int((grades != UNGRADED).sum()),
+        'changed': int(changed.sum()),
+        'users': len(table),
+        'dry_run': dry_run,
+        'standings': table,
+    }
+
+
+def main():
+    """Main function"""
+    from espn_db import db_config_from_env, pooled_connection
+    from espn_metrics import export_at_exit
+
+    parser = argparse.ArgumentParser(description="Grade a week's picks against completed games")
+    parser.add_argument('--week-id', type=int, required=True, help="Week ID from Weeks table")
+    parser.add_argument('--mode', choices=MODES, default='su',
+                        help="Grade stored in UserPicks.is_correct: su (winner) or ats (spread)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Pick ids per UPDATE")
+    parser.add_argument('--dry-run', action='store_true', help="Grade and print without writing")
+    parser.add_argument('--top', type=int, help="Only print the first N standings rows")
+    args = parser.parse_args()
+
+    export_at_exit()
+    with pooled_connection(db_config_from_env()) as connection:
+        summary = settle_week(connection, args.week_id, args.mode, args.batch_size, args.dry_run)
+    summary['standings'] = summary['standings'][:args.top or None]
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Static per-week game snapshots for the frontend
+After an insert or poll cycle the week's Games rows are written as
+snapshots/weeks/<week_id>.json under Frontend/, in the same shape the
+picks-games-by-week Netlify function returns ({"games": [...]}), plus
+pre-compressed .gz and .br copies. Reads of a week's games can then be
+static CDN hits instead of MySQL queries.
+
+Each snapshot carries a format version and an etag (a hash of the games), and
+a week's files are only rewritten when the etag changes, so an unchanged week
+never produces a new deploy.
+
+Usage:
+    python espn_snapshots.py --week-id 42
+    python espn_snapshots.py --week-id 41 --week-id 42 --dir ../Frontend/snapshots/weeks
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from espn_metrics import metrics
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'Frontend', 'snapshots', 'weeks')
+FORMAT_VERSION = 1
+ETAG_LENGTH = 16
+
+# Same columns, order and keys as netlify/functions/picks-games-by-week.js
+SNAPSHOT_COLUMNS = ('id', 'week_id', 'cfbd_game_id', 'game_number', 'home_team_espn_id', 'away_team_espn_id',
+                    'home_team_name', 'away_team_name', 'home_team_logo_url', 'away_team_logo_url',
+                    'game_date', 'venue', 'betting_line', 'is_completed')
+
+SELECT_SNAPSHOT_SQL = (
+    f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM Games WHERE week_id = %s ORDER BY game_number"
+)
+
+# Databases without the cfbd/venue migration: those keys are emitted as null
+_BASE_COLUMNS = tuple(col for col in SNAPSHOT_COLUMNS if col not in ('cfbd_game_id', 'venue'))
+SELECT_SNAPSHOT_BASE_SQL = (
+    f"SELECT {', '.join(_BASE_COLUMNS)} FROM Games WHERE week_id = %s ORDER BY game_number"
+)
+
+ER_BAD_FIELD_ERROR = 1054
+
+
+def _json_value(column: str, value):
+    """Column value the way mysql2 serializes it for the Netlify function"""
+    if value is None:
+        return None
+    if column == 'is_completed':
+        return bool(value)
+    if column == 'betting_line':
+        # mysql2 returns DECIMAL columns as strings
+        return f"{Decimal(str(value)):.1f}"
+    if isinstance(value, datetime):
+        # game_date is stored as UTC; JSON.stringify(Date) -> 2024-11-02T19:30:00.000Z
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def snapshot_games(rows: List[Tuple], columns=SNAPSHOT_COLUMNS) -> List[Dict]:
+    """Games rows as the function's JSON objects (missing columns are null)"""
+    games = []
+    for row in rows:
+        values = dict(zip(columns, row))
+        games.append({column: _json_value(column, values.get(column)) for column in SNAPSHOT_COLUMNS})
+    return games
+
+
+def load_week_games(connection, week_id: int) -> List[Dict]:
+    """A week's games in snapshot form, ordered by game_number"""
+    cursor = connection.cursor()
+    try:
+        try:
+            cursor.execute(SELECT_SNAPSHOT_SQL, (week_id,))
+            columns = SNAPSHOT_COLUMNS
+        except Exception as e:
+            if getattr(e, 'errno', None) != ER_BAD_FIELD_ERROR:
+                raise
+            cursor.execute(SELECT_SNAPSHOT_BASE_SQL, (week_id,))
+            columns = _BASE_COLUMNS
+        return snapshot_games(cursor.fetchall(), columns)
+    finally:
+        cursor.close()
+
+
+def games_etag(games: List[Dict]) -> str:
+    """Content hash of the games payload (independent of when the snapshot was built)"""
+    canonical = json.dumps(games, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:ETAG_LENGTH]
+
+
+def encode_snapshot(week_id: int, games: List[Dict], etag: Optional[str] = None) -> bytes:
+    """Snapshot document: the function's {"games": [...]} plus version, week and etag"""
+    document = {
+        'version': FORMAT_VERSION,
+        'week_id': week_id,
+        'etag': etag or games_etag(games),
+        'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'games': games
+    }
+    return json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path: str, content: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _stored_etag(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read()).get('etag')
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(week_id: int, games: List[Dict], directory: str = DEFAULT_SNAPSHOT_DIR,
+                   force: bool = False) -> Dict:
+    """
+    Write <week_id>.json with .gz/.br copies unless the stored snapshot has the same etag
+
+    Returns:
+        {'week_id', 'path', 'etag', 'games', 'written', 'bytes'}
+    """
+    path = os.path.join(directory, f"{week_id}.json")
+    etag = games_etag(games)
+    result = {'week_id': week_id, 'path': path, 'etag': etag, 'games': len(games), 'written': False}
+    if not force and _stored_etag(path) == etag:
+        return result
+
+    with metrics.timer('snapshot'):
+        body = encode_snapshot(week_id, games, etag)
+        os.makedirs(directory, exist_ok=True)
+        # Compressed copies go first so the .json (whose etag decides rewrites) is never
+        # newer than them; mtime=0 keeps the gzip bytes identical for identical content
+        _write_atomic(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(path + '.br', brotli.compress(body, quality=11))
+        _write_atomic(path, body)
+
+    metrics.inc('espn_snapshots_total', 1, action='written')
+    result.update(written=True, bytes=len(body))
+    return result
+
+
+def snapshot_week(connection, week_id: int, directory: str = DEFAULT_SNAPSHOT_DIR, force: bool = False) -> Dict:
+    """Snapshot a week straight from the Games table"""
+    return write_snapshot(week_id, load_week_games(connection, week_id), directory, force)
+
+
+def main():
+    """Main function"""
+    from espn_db import db_config_from_env, pooled_connection
+
+    parser = argparse.ArgumentParser(description="Write static per-week game snapshots for the frontend")
+    parser.add_argument('--week-id', type=int, action='append', required=True, help="Week ID (repeatable)")
+    parser.add_argument('--dir', default=os.getenv('ESPN_SNAPSHOT_DIR') or DEFAULT_SNAPSHOT_DIR,
+                        help="Output directory (ESPN_SNAPSHOT_DIR, default Frontend/snapshots/weeks)")
+    parser.add_argument('--force', action='store_true', help="Rewrite even if the games are unchanged")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("[WARN] brotli not installed; writing .json and .json.gz only", file=sys.stderr)
+    with pooled_connection(db_config_from_env()) as connection:
+        results = [snapshot_week(connection, week_id, args.dir, args.force) for week_id in args.week_id]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
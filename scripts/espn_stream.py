@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Streaming decode of ESPN scoreboard payloads
+Full-slate scoreboards (groups/limit) run to several megabytes, but only a few
+fields per competitor end up in a Game. With ijson installed the `events`
+array is parsed one event at a time straight off the response body (see
+body_stream), so neither the raw payload nor the decoded tree exists in full;
+without it the payload is decoded in one go with orjson (if installed) or json.
+"""
+
+import io
+import json
+from typing import Dict, Iterator, List, Tuple, Union
+
+from espn_models import Game, parse_event_with_keys
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Source = Union[bytes, bytearray, io.RawIOBase, io.BufferedIOBase]
+
+
+def loads(data: Union[bytes, str]):
+    """Decode a JSON document with the fastest available decoder"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def body_stream(response):
+    """
+    Binary file-like body of a response fetched with stream=True
+
+    Works for requests.Response (gzip/deflate undone while reading) and
+    espn_cache.CachedResponse (the cached body file). A body something else
+    already read (e.g. espn_replay's RecordingClient) is served from memory.
+    """
+    if getattr(response, '_content_consumed', False):
+        return io.BytesIO(response.content)
+    raw = response.raw
+    if hasattr(raw, 'decode_content'):
+        raw.decode_content = True
+    return raw
+
+
+def iter_events(source: Source) -> Iterator[Dict]:
+    """
+    Yield scoreboard events one at a time
+
+    Args:
+        source: Response body bytes or a binary file-like object (e.g. body_stream())
+    """
+    if ijson is not None:
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        yield from ijson.items(stream, 'events.item', use_float=True)
+        return
+
+    data = source if isinstance(source, (bytes, bytearray)) else source.read()
+    yield from loads(data).get('events', [])
+
+
+def iter_games_with_keys(source: Source) -> Iterator[Tuple[Game, List[str], List[str]]]:
+    """Yield (game, away keys, home keys) per event, dropping each event once parsed"""
+    for event in iter_events(source):
+        parsed = parse_event_with_keys(event)
+        if parsed:
+            yield parsed
+
+
+def iter_games(source: Source) -> Iterator[Game]:
+    """Yield a Game per two-team event in a scoreboard payload"""
+    for game, _, _ in iter_games_with_keys(source):
+        yield game
+
+
+def decoder_name() -> str:
+    """Which decoder iter_events will use (for logs and benchmarks)"""
+    if ijson is not None:
+        return f"ijson ({getattr(ijson, 'backend', 'python')})"
+    return 'orjson' if orjson is not None else 'json'
+
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Persistent ESPN team registry
+The college-football /teams listing is downloaded by an explicit refresh
+(`espn_cli.py teams`, or the start of a backfill or bulk parse), stored on disk
+as a compact id-keyed table with its name index (teams.json in the cache
+directory) and re-downloaded by the next refresh once it is older than a week.
+Lookups by ESPN id, normalized name, abbreviation, alias or team-page URL are
+dictionary hits against the stored copy and never touch the network; with no
+stored copy they find nothing.
+
+Usage:
+    from espn_teams import get_team_registry
+    teams = get_team_registry()
+    teams.refresh_if_stale()      # batch entry points only, never per lookup
+    teams.find('Ole Miss')        # -> Team(id=145, ...)
+    teams.logo_url(61)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from espn_cache import cache_dir
+from espn_matchups import normalize_team_name
+from espn_models import logo_url as template_logo_url, mirrored_logo_url
+
+TEAMS_URL = "https://site.api.espn.com/apis/site/v2/sports/football/college-football/teams"
+REGISTRY_FILE = 'teams.json'
+REFRESH_INTERVAL = 7 * 24 * 3600
+FORMAT_VERSION = 1
+
+# Names people (and other sites) use that ESPN doesn't list for the team
+ALIASES = {
+    145: ('Mississippi',),
+    2390: ('Miami FL', 'Miami (FL)', 'Miami Florida'),
+    30: ('Southern California', 'Southern Cal'),
+    2116: ('Central Florida',),
+    99: ('Louisiana State',),
+    252: ('Brigham Young',),
+    2567: ('Southern Methodist',),
+    2628: ('Texas Christian',),
+    41: ('Connecticut',),
+    113: ('Massachusetts',),
+    221: ('Pittsburgh',),
+    152: ('North Carolina State',),
+}
+
+# Modern team pages: /college-football/team/_/id/61/georgia-bulldogs
+# Older pages: /team/college-football/georgia/61 or /college-football/team/georgia/61
+TEAM_ID_URL_RE = re.compile(r'/team/(?:_/id/|(?:college-football/)?[^/_]+/)(\d+)')
+# Slug-only pages: /college-football/team/_/name/uga/georgia-bulldogs
+TEAM_NAME_URL_RE = re.compile(r'/team/_/name/([^/?#]+)(?:/([^/?#]+))?')
+
+
+class Team(NamedTuple):
+    """One ESPN college football team"""
+    id: int
+    display_name: str
+    abbreviation: Optional[str]
+    short_name: Optional[str]
+    location: Optional[str]
+    nickname: Optional[str]
+    logo: Optional[str]
+    aliases: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict:
+        """Shape returned by the old search_team_by_name"""
+        return {'id': str(self.id), 'name': self.display_name, 'abbreviation': self.abbreviation,
+                'logo': self.logo}
+
+
+def _team_from_json(team: Dict) -> Optional[Team]:
+    try:
+        espn_id = int(team.get('id'))
+    except (TypeError, ValueError):
+        return None
+    logos = team.get('logos') or []
+    logo = team.get('logo') or (logos[0].get('href') if logos else None)
+    return Team(espn_id, team.get('displayName') or '', team.get('abbreviation'),
+                team.get('shortDisplayName'), team.get('location'), team.get('name'), logo,
+                ALIASES.get(espn_id, ()))
+
+
+def _team_names(team: Team) -> Iterator[str]:
+    yield team.display_name
+    yield team.short_name
+    yield team.location
+    yield team.abbreviation
+    yield from team.aliases
+
+
+class TeamRegistry:
+    """ESPN teams keyed by id and by every normalized name they go by"""
+
+    def __init__(self, path: Optional[str] = None, http_client=None,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        """
+        Args:
+            path: Registry file (defaults to teams.json in the ESPN cache directory)
+            http_client: HTTPClient used for refreshes (the shared client if omitted)
+            refresh_interval: Seconds before refresh_if_stale() re-downloads the listing
+        """
+        self.path = path or os.path.join(cache_dir(), REGISTRY_FILE)
+        self.http_client = http_client
+        self.refresh_interval = refresh_interval
+        self.fetched_at = 0.0
+        self._by_id: Dict[int, Team] = {}
+        self._by_name: Dict[str, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._by_id)
+
+    def __contains__(self, espn_id) -> bool:
+        return self.get(espn_id) is not None
+
+    def __iter__(self) -> Iterator[Team]:
+        self._ensure_loaded()
+        return iter(list(self._by_id.values()))
+
+    def get(self, espn_id) -> Optional[Team]:
+        """Team for an ESPN id (int or numeric string)"""
+        self._ensure_loaded()
+        try:
+            return self._by_id.get(int(espn_id))
+        except (TypeError, ValueError):
+            return None
+
+    def find(self, name: str) -> Optional[Team]:
+        """Team for a display name, short name, location, abbreviation, alias or id"""
+        self._ensure_loaded()
+        key = normalize_team_name(name)
+        espn_id = self._by_name.get(key)
+        if espn_id is None and key.isdigit():
+            espn_id = int(key)
+        return self._by_id.get(espn_id) if espn_id is not None else None
+
+    def search(self, name: str) -> Optional[Team]:
+        """find(), falling back to the old substring match against display names"""
+        team = self.find(name)
+        if team is not None:
+            return team
+        needle = normalize_team_name(name)
+        if not needle:
+            return None
+        for team in self._by_id.values():
+            display = normalize_team_name(team.display_name)
+            if needle in display or display in needle:
+                return team
+        return None
+
+    def logo_url(self, espn_id) -> Optional[str]:
+        """Logo for an ESPN id: the local mirror, then the listing, then the standard CDN path"""
+        mirrored = mirrored_logo_url(espn_id)
+        if mirrored:
+            return mirrored
+        team = self.get(espn_id)
+        if team is not None and team.logo:
+            return team.logo
+        return template_logo_url(espn_id)
+
+    def id_from_url(self, team_url: str) -> Optional[int]:
+        """ESPN id from a team page URL, resolving slug-only URLs through the registry"""
+        match = TEAM_ID_URL_RE.search(team_url)
+        if match:
+            return int(match.group(1))
+        match = TEAM_NAME_URL_RE.search(team_url)
+        if match:
+            slug, slug_name = match.groups()
+            for candidate in (slug_name, slug):
+                team = self.find(candidate.replace('-', ' ')) if candidate else None
+                if team is not None:
+                    return team.id
+        return None
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at >= self.refresh_interval
+
+    def refresh_if_stale(self) -> bool:
+        """Download the listing if none is stored or it is older than refresh_interval; True if refreshed"""
+        self._ensure_loaded(warn_empty=False)
+        if self._by_id and not self.is_stale():
+            return False
+        return self.refresh()
+
+    def refresh(self) -> bool:
+        """Download the /teams listing and persist it (keeps the stored copy on failure)"""
+        client = self.http_client
+        if client is None:
+            from espn_http import get_shared_client
+            client = get_shared_client()
+        try:
+            response = client.get(TEAMS_URL, params={'limit': 1000}, timeout=10)
+            response.raise_for_status()
+            listing = response.json()
+            teams = listing.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', [])
+        except Exception as e:
+            print(f"[WARN] Could not refresh team registry: {e}")
+            return False
+
+        parsed = [team for team in (_team_from_json(entry.get('team', {})) for entry in teams) if team]
+        if not parsed:
+            print("[WARN] ESPN returned no teams; keeping the stored registry")
+            return False
+
+        with self._lock:
+            self._index(parsed)
+            self.fetched_at = time.time()
+            self._loaded = True
+            self._save()
+        return True
+
+    def _ensure_loaded(self, warn_empty: bool = True):
+        """Load the stored copy once; lookups never download (see refresh_if_stale)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load()
+            self._loaded = True
+            if warn_empty and not self._by_id:
+                print(f"[WARN] No stored team registry at {self.path}; "
+                      f"run 'python espn_cli.py teams' to download it")
+
+    def _index(self, teams: List[Team]):
+        by_id = {team.id: team for team in teams}
+        by_name: Dict[str, int] = {}
+        ambiguous = set()
+        for team in teams:
+            for name in _team_names(team):
+                key = normalize_team_name(name)
+                if not key:
+                    continue
+                if by_name.get(key, team.id) != team.id:
+                    ambiguous.add(key)
+                by_name.setdefault(key, team.id)
+        # A name shared by two teams (e.g. a location) can't identify either one
+        for key in ambiguous:
+            del by_name[key]
+        # Display names always win, even over an ambiguous short name
+        for team in teams:
+            by_name[normalize_team_name(team.display_name)] = team.id
+        self._by_id = by_id
+        self._by_name = by_name
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != FORMAT_VERSION:
+            return
+        self._by_id = {row[0]: Team(row[0], *row[1:7], tuple(row[7])) for row in data.get('teams', [])}
+        self._by_name = {name: int(espn_id) for name, espn_id in data.get('names', {}).items()}
+        self.fetched_at = data.get('fetched_at', 0.0)
+
+    def _save(self):
+        data = {
+            'version': FORMAT_VERSION,
+            'fetched_at': self.fetched_at,
+            'teams': [list(team[:7]) + [list(team.aliases)] for team in self._by_id.values()],
+            'names': self._by_name
+        }
+        directory = os.path.dirname(self.path)
+        tmp_path = self.path + '.tmp'
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[WARN] Could not save team registry: {e}")
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_team_registry() -> TeamRegistry:
+    """Process-wide registry used by the extractors unless one is passed in"""
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_lock:
+            if _shared_registry is None:
+                _shared_registry = TeamRegistry()
+    return _shared_registry
@@ -0,0 +1,8 @@
+"""Shared pytest setup: make the scripts (and the benchmark SQLite stand-in) importable"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'benchmarks'))
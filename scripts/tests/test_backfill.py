@@ -0,0 +1,55 @@
+"""SeasonBackfill: season plans fetched by date range, stored week by week"""
+
+from espn_backfill import SeasonBackfill, season_units
+from espn_models import Game
+from espn_planner import POSTSEASON, REGULAR_SEASON, plan_season
+
+
+class FakeExtractor:
+    """Serves each game to the first planned query whose date range covers its kickoff"""
+
+    divisions = ('fbs',)
+
+    def __init__(self, games):
+        self.games = games
+        self.queries = []
+
+    def get_scoreboard_entries(self, query, max_age=None):
+        self.queries.append(query)
+        start, _, end = str(query['dates']).partition('-')
+        end = end or start
+        for game in self.games:
+            day = game.game_date[:10].replace('-', '')
+            if start <= day <= end:
+                yield game, [], []
+
+
+def _game(game_id, day, seasontype=REGULAR_SEASON, week=1):
+    return Game(game_id, 'Away', 'Home', 1, 2, game_date=f"{day}T19:30Z", seasontype=seasontype, week=week)
+
+
+def test_backfill_uses_season_plan_and_groups_by_week(tmp_path):
+    games = [_game('1', '2024-08-31', week=1), _game('2', '2024-09-07', week=2),
+             _game('3', '2024-11-30', week=14), _game('4', '2024-12-28', POSTSEASON, 1)]
+    extractor = FakeExtractor(games)
+    stored = {}
+
+    def sink(unit, week_games):
+        stored[unit.key] = [game.espn_game_id for game in week_games]
+        return bool(week_games)
+
+    backfill = SeasonBackfill(extractor, checkpoint_path=str(tmp_path / 'checkpoint.json'))
+    summary = backfill.run_sync(season_units([2024], [1, 2, 3]), sink)
+
+    assert sorted(extractor.queries, key=str) == sorted(plan_season(2024), key=str)
+    assert stored == {'2024-2-1': ['1'], '2024-2-2': ['2'], '2024-2-3': [], '2024-3-1': ['4']}
+    assert summary['weeks'] == 3 and summary['games'] == 3
+    assert summary['dropped'] == ['2024-2-3']
+
+    # Checkpointed weeks are skipped; only the dropped week makes the season refetch
+    extractor.queries.clear()
+    stored.clear()
+    summary = SeasonBackfill(extractor, checkpoint_path=str(tmp_path / 'checkpoint.json')).run_sync(
+        season_units([2024], [1, 2, 3]), sink)
+    assert summary['skipped'] == 3
+    assert list(stored) == ['2024-2-3']
@@ -0,0 +1,139 @@
+"""ResponseCache: TTL hits, ETag revalidation and streamed bodies"""
+
+import io
+
+import pytest
+
+import espn_cache
+from espn_cache import ResponseCache
+
+SCOREBOARD_URL = 'https://site.api.espn.com/apis/site/v2/sports/football/college-football/scoreboard'
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.raw = io.BytesIO(content)
+
+    def iter_content(self, chunk_size):
+        return iter(lambda: self.raw.read(chunk_size), b'')
+
+    def close(self):
+        pass
+
+
+class Fetcher:
+    """Records the conditional headers of every call and replays queued responses"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, conditional_headers):
+        self.calls.append(conditional_headers)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(espn_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache(str(tmp_path))
+
+
+def test_ttl_by_endpoint(cache):
+    assert cache.ttl_for(SCOREBOARD_URL) == 300
+    assert cache.ttl_for('https://site.api.espn.com/apis/site/v2/sports/football/college-football/teams') == 7 * 24 * 3600
+    assert cache.ttl_for('https://example.com/other') == espn_cache.DEFAULT_TTL
+
+
+def test_fresh_entries_are_served_without_fetching(cache, clock):
+    fetcher = Fetcher(FakeResponse(200, b'{"events": []}', {'ETag': '"v1"'}))
+    assert cache.fetch(SCOREBOARD_URL, {'week': 1}, fetcher).content == b'{"events": []}'
+    clock[0] += 299
+    cached = cache.fetch(SCOREBOARD_URL, {'week': 1}, fetcher)
+    assert cached.from_cache and cached.content == b'{"events": []}'
+    assert len(fetcher.calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+
+def test_params_are_part_of_the_key(cache):
+    fetcher = Fetcher(FakeResponse(200, b'1'), FakeResponse(200, b'2'))
+    cache.fetch(SCOREBOARD_URL, {'week': 1}, fetcher)
+    assert cache.fetch(SCOREBOARD_URL, {'week': 2}, fetcher).content == b'2'
+
+
+def test_stale_entries_revalidate_with_etag(cache, clock):
+    fetcher = Fetcher(FakeResponse(200, b'body', {'ETag': '"v1"', 'Last-Modified': 'Sat, 02 Nov 2024 19:30:00 GMT'}),
+                      FakeResponse(304))
+    cache.fetch(SCOREBOARD_URL, None, fetcher)
+    clock[0] += 301
+    revalidated = cache.fetch(SCOREBOARD_URL, None, fetcher)
+    assert fetcher.calls[1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Sat, 02 Nov 2024 19:30:00 GMT'}
+    assert revalidated.content == b'body' and cache.revalidated == 1
+    # A 304 restarts the TTL
+    clock[0] += 299
+    cache.fetch(SCOREBOARD_URL, None, fetcher)
+    assert len(fetcher.calls) == 2
+
+
+def test_changed_body_replaces_the_entry(cache, clock):
+    fetcher = Fetcher(FakeResponse(200, b'old', {'ETag': '"v1"'}), FakeResponse(200, b'new', {'ETag': '"v2"'}),
+                      FakeResponse(304))
+    cache.fetch(SCOREBOARD_URL, None, fetcher, max_age=0)
+    assert cache.fetch(SCOREBOARD_URL, None, fetcher, max_age=0).content == b'new'
+    cache.fetch(SCOREBOARD_URL, None, fetcher, max_age=0)
+    assert fetcher.calls[2] == {'If-None-Match': '"v2"'}
+
+
+def test_errors_are_not_cached(cache):
+    fetcher = Fetcher(FakeResponse(503, b'down'), FakeResponse(200, b'up'))
+    assert cache.fetch(SCOREBOARD_URL, None, fetcher).status_code == 503
+    assert cache.fetch(SCOREBOARD_URL, None, fetcher).content == b'up'
+
+
+def test_streamed_bodies_are_spooled_and_served_as_files(cache):
+    body = b'{"events": [' + b','.join(b'{"id": %d}' % i for i in range(1000)) + b']}'
+    fetcher = Fetcher(FakeResponse(200, body, {'ETag': '"v1"'}))
+    streamed = cache.fetch(SCOREBOARD_URL, None, fetcher, stream=True)
+    assert streamed.raw.read() == body
+    streamed.close()
+    hit = cache.fetch(SCOREBOARD_URL, None, fetcher, stream=True)
+    assert hit.from_cache and hit.raw.read() == body
+    hit.close()
+    assert len(fetcher.calls) == 1
+
+
+def test_streamed_body_larger_than_the_cache_is_still_returned(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10)
+    body = b'x' * 100
+    streamed = cache.fetch(SCOREBOARD_URL, None, Fetcher(FakeResponse(200, body)), stream=True)
+    # Evicted as soon as it was indexed, but the caller still gets the whole body
+    assert streamed.raw.read() == body
+    streamed.close()
+    assert cache.fetch(SCOREBOARD_URL, None, Fetcher(FakeResponse(200, b'again')), stream=True).content == b'again'
+
+
+def test_content_after_a_streamed_read_is_still_available(cache):
+    cache.fetch(SCOREBOARD_URL, None, Fetcher(FakeResponse(200, b'body')))
+    hit = cache.fetch(SCOREBOARD_URL, None, Fetcher(), stream=True)
+    assert hit.content == b'body'
+    assert hit.raw.read() == b'body'
+
+
+def test_304_for_a_missing_body_refetches_in_full(cache, tmp_path, clock):
+    fetcher = Fetcher(FakeResponse(200, b'old', {'ETag': '"v1"'}), FakeResponse(304),
+                      FakeResponse(200, b'new', {'ETag': '"v1"'}))
+    cache.fetch(SCOREBOARD_URL, None, fetcher)
+    for path in tmp_path.glob('*.body'):
+        path.unlink()
+    clock[0] += 301
+    response = cache.fetch(SCOREBOARD_URL, None, fetcher)
+    assert response.status_code == 200 and response.content == b'new'
+    assert fetcher.calls[1] == {'If-None-Match': '"v1"'} and fetcher.calls[2] == {}
@@ -0,0 +1,73 @@
+"""upsert_games against the SQLite stand-in for Games (same keys as the real schema)"""
+
+import pytest
+
+from espn_db import upsert_games
+from run_benchmarks import SQLiteConnection
+
+WEEK_ID = 7
+
+
+def _game(home_id, away_id, line=None, home_name=None):
+    return {'home_team_espn_id': home_id, 'away_team_espn_id': away_id,
+            'home_team_name': home_name or f"Team {home_id}", 'away_team_name': f"Team {away_id}",
+            'home_team_logo_url': None, 'away_team_logo_url': None,
+            'game_date': '2024-11-02T19:30Z', 'betting_line': line}
+
+
+def _rows(connection):
+    cursor = connection.cursor()
+    cursor.execute("SELECT id, game_number, home_team_espn_id, away_team_espn_id, betting_line "
+                   "FROM Games WHERE week_id = %s ORDER BY id", (WEEK_ID,))
+    return cursor.fetchall()
+
+
+def _totals(batches):
+    return {key: sum(batch[key] for batch in batches) for key in ('inserted', 'updated', 'unchanged')}
+
+
+@pytest.fixture
+def connection():
+    connection = SQLiteConnection()
+    yield connection
+    connection.close()
+
+
+def test_first_run_inserts_in_order(connection):
+    batches = upsert_games(connection, [_game(1, 2), _game(3, 4), _game(5, 6)], WEEK_ID)
+    assert _totals(batches) == {'inserted': 3, 'updated': 0, 'unchanged': 0}
+    assert [row[1:4] for row in _rows(connection)] == [(1, 1, 2), (2, 3, 4), (3, 5, 6)]
+
+
+def test_rerun_is_a_no_op(connection):
+    games = [_game(1, 2, -3.5), _game(3, 4)]
+    upsert_games(connection, games, WEEK_ID)
+    before = _rows(connection)
+    assert _totals(upsert_games(connection, games, WEEK_ID)) == {'inserted': 0, 'updated': 0, 'unchanged': 2}
+    assert _rows(connection) == before
+
+
+def test_reordered_slate_keeps_ids_and_numbers(connection):
+    upsert_games(connection, [_game(1, 2), _game(3, 4), _game(5, 6)], WEEK_ID)
+    ids = {(row[2], row[3]): (row[0], row[1]) for row in _rows(connection)}
+
+    # Same matchups in another order, one line moved, one game dropped and one added
+    batches = upsert_games(connection, [_game(5, 6), _game(7, 8), _game(1, 2, -7.0)], WEEK_ID)
+    assert _totals(batches) == {'inserted': 1, 'updated': 1, 'unchanged': 1}
+
+    rows = {(row[2], row[3]): row for row in _rows(connection)}
+    # Existing matchups keep their Games.id (which UserPicks reference) and game_number
+    for key in ((1, 2), (3, 4), (5, 6)):
+        assert rows[key][:2] == ids[key]
+    assert rows[(1, 2)][4] == -7.0
+    # New games are numbered after the week's last game
+    assert rows[(7, 8)][1] == 4
+
+
+def test_updates_rewrite_only_changed_rows(connection):
+    upsert_games(connection, [_game(1, 2), _game(3, 4)], WEEK_ID)
+    batches = upsert_games(connection, [_game(1, 2, home_name='Renamed'), _game(3, 4)], WEEK_ID, batch_size=1)
+    assert _totals(batches) == {'inserted': 0, 'updated': 1, 'unchanged': 1}
+    cursor = connection.cursor()
+    cursor.execute("SELECT home_team_name FROM Games WHERE home_team_espn_id = %s", (1,))
+    assert cursor.fetchall() == [('Renamed',)]
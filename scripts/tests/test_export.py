@@ -0,0 +1,80 @@
+"""GamesExporter: SQL literals and LOAD DATA field escaping"""
+
+import io
+import re
+
+import pytest
+
+from espn_export import GamesExporter, delimited_field, sql_literal
+
+
+def _game(**overrides):
+    game = {'home_team_espn_id': 61, 'away_team_espn_id': 57,
+            'home_team_name': 'Georgia Bulldogs', 'away_team_name': 'Florida Gators',
+            'home_team_logo_url': None, 'away_team_logo_url': None,
+            'game_date': '2024-11-02T19:30:00Z', 'betting_line': -14.5}
+    game.update(overrides)
+    return game
+
+
+def _export(games, fmt, week_id=42, **kwargs):
+    out = io.StringIO()
+    GamesExporter(out, week_id, fmt, **kwargs).write(games)
+    return out.getvalue()
+
+
+def test_sql_literals():
+    assert sql_literal(None) == 'NULL'
+    assert sql_literal(True) == 'TRUE'
+    assert sql_literal(-3.5) == '-3.5'
+    assert sql_literal("Hawai'i") == "'Hawai''i'"
+    assert sql_literal('back\\slash\nline') == "'back\\\\slash\\nline'"
+
+
+def test_delimited_fields():
+    assert delimited_field(None, '\t') == '\\N'
+    assert delimited_field(False, '\t') == '0'
+    # The delimiter is backslash-escaped like LOAD DATA expects; other tabs/newlines become \t, \n
+    assert delimited_field('a\tb', '\t') == 'a\\\tb'
+    assert delimited_field('a\tb\n', ',') == 'a\\tb\\n'
+    assert delimited_field('a,b', ',') == 'a\\,b'
+    assert delimited_field('C:\\path', ',') == 'C:\\\\path'
+
+
+def test_sql_export_numbers_rows_and_chunks():
+    sql = _export([_game(), _game(away_team_name="Hawai'i"), _game()], 'sql', chunk_size=2)
+    assert sql.count('INSERT INTO Games') == 2
+    assert "(42, 1, 61, 57, 'Georgia Bulldogs', 'Florida Gators', NULL, NULL, '2024-11-02 19:30:00', -14.5" in sql
+    assert "'Hawai''i'" in sql
+    assert '(42, 3, ' in sql
+
+
+def test_tsv_export_escapes_and_nulls():
+    line = _export([_game(home_team_name='Tab\tName', betting_line=None)], 'tsv').rstrip('\n')
+    fields = re.split(r'(?<!\\)\t', line)
+    assert len(fields) == 11
+    assert fields[:2] == ['42', '1']
+    assert fields[4] == 'Tab\\\tName'
+    assert fields[6] == fields[7] == fields[9] == '\\N'
+    assert fields[8] == '2024-11-02 19:30:00'
+
+
+def test_csv_export_escapes_delimiter():
+    line = _export([_game(away_team_name='Miami, FL')], 'csv')
+    assert 'Miami\\, FL' in line
+
+
+def test_delimited_export_needs_numeric_week():
+    with pytest.raises(ValueError):
+        _export([_game()], 'tsv', week_id='(SELECT id FROM Weeks)')
+
+
+def test_extractors_generate_multirow_inserts():
+    from espn_api_extractor import ESPNAPIExtractor
+    from espn_game_extractor import ESPNGameExtractor
+
+    games = [_game(), _game(home_team_name="Hawai'i Rainbow Warriors")]
+    expected = _export(games, 'sql')
+    assert expected.count('INSERT INTO Games') == 1
+    assert ESPNAPIExtractor.__new__(ESPNAPIExtractor).generate_sql_inserts(games, 42) == expected
+    assert ESPNGameExtractor.__new__(ESPNGameExtractor).generate_sql_insert(games, 42) == expected
@@ -0,0 +1,45 @@
+"""MatchupIndex: resolving "Away at Home" / "A vs B" strings against a slate"""
+
+import pytest
+
+from espn_matchups import MatchupIndex, normalize_team_name, parse_matchup
+
+
+def _keys(*names):
+    return [normalize_team_name(name) for name in names]
+
+
+@pytest.fixture
+def index():
+    index = MatchupIndex()
+    index.add('uga-fla', _keys('Florida Gators', 'Florida', 'FLA'), _keys('Georgia Bulldogs', 'Georgia', 'UGA'),
+              'Florida Gators', 'Georgia Bulldogs')
+    index.add('vandy-tex', _keys('Vanderbilt Commodores', 'Vanderbilt', 'VAN'), _keys('Texas Longhorns', 'Texas', 'TEX'),
+              'Vanderbilt Commodores', 'Texas Longhorns')
+    return index
+
+
+def test_parse_matchup():
+    assert parse_matchup('#5 Vanderbilt at Texas') == ('Vanderbilt', 'Texas', False)
+    assert parse_matchup('Georgia vs Florida') == ('Georgia', 'Florida', True)
+    assert parse_matchup('Georgia') is None
+
+
+def test_exact_lookup_by_any_key(index):
+    assert index.lookup('Vanderbilt', 'Texas') == 'vandy-tex'
+    assert index.lookup('VAN', 'Texas Longhorns') == 'vandy-tex'
+
+
+def test_sides_matter_unless_neutral(index):
+    assert index.lookup('Texas', 'Vanderbilt') is None
+    assert index.lookup('Georgia', 'Florida', is_neutral=True) == 'uga-fla'
+
+
+def test_substring_fallback(index):
+    assert index.lookup('Vanderbilt Commodores Football', 'Texas') == 'vandy-tex'
+
+
+def test_resolve_keeps_order_and_misses(index):
+    results = index.resolve(['Georgia vs Florida', 'Alabama at Auburn', 'not a matchup', 'Vanderbilt @ Texas'])
+    assert results == [('Georgia vs Florida', 'uga-fla'), ('Alabama at Auburn', None),
+                       ('not a matchup', None), ('Vanderbilt @ Texas', 'vandy-tex')]
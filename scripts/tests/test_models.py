@@ -0,0 +1,65 @@
+"""parse_event: scoreboard events to Game records"""
+
+from espn_models import parse_event
+
+
+def _competitor(side, team_id, name, score=None, rank=None):
+    competitor = {'homeAway': side, 'team': {'id': str(team_id), 'displayName': name}}
+    if score is not None:
+        competitor['score'] = str(score)
+    if rank is not None:
+        competitor['curatedRank'] = {'current': rank}
+    return competitor
+
+
+def _event(state='pre', completed=False, home_score=None, away_score=None, odds=None, competitors=None):
+    competition = {
+        'date': '2024-11-02T19:30Z',
+        'competitors': competitors if competitors is not None else [
+            _competitor('home', 61, 'Georgia Bulldogs', home_score, rank=2),
+            _competitor('away', 57, 'Florida Gators', away_score),
+        ],
+        'status': {'type': {'state': state, 'completed': completed}},
+    }
+    if odds is not None:
+        competition['odds'] = odds
+    return {'id': '401520281', 'competitions': [competition]}
+
+
+def test_scheduled_game():
+    game = parse_event(_event(odds=[{'spread': -14.5}]))
+    assert game.espn_game_id == '401520281'
+    assert (game.away_team_espn_id, game.home_team_espn_id) == (57, 61)
+    assert (game.away_team_name, game.home_team_name) == ('Florida Gators', 'Georgia Bulldogs')
+    assert game.home_team_rank == 2 and game.away_team_rank is None
+    assert game.betting_line == -14.5
+    assert game.game_date.startswith('2024-11-02')
+    assert not game.is_completed
+
+
+def test_scores_ignored_before_kickoff():
+    game = parse_event(_event(state='pre', home_score=0, away_score=0))
+    assert game.home_score is None and game.away_score is None
+
+
+def test_final_game():
+    game = parse_event(_event(state='post', completed=True, home_score=34, away_score=20))
+    assert game.is_completed
+    assert (game.home_score, game.away_score) == (34, 20)
+    assert game.betting_line is None
+
+
+def test_non_two_team_events_are_skipped():
+    assert parse_event({'id': '1', 'competitions': []}) is None
+    assert parse_event(_event(competitors=[_competitor('home', 61, 'Georgia Bulldogs')])) is None
+    neutral = [_competitor('home', 61, 'Georgia Bulldogs'), _competitor('home', 57, 'Florida Gators')]
+    assert parse_event(_event(competitors=neutral)) is None
+
+
+def test_scoreboard_week_kept():
+    event = _event()
+    event.update(season={'year': 2024, 'type': 2}, week={'number': 10})
+    game = parse_event(event)
+    assert (game.seasontype, game.week) == (2, 10)
+    assert 'week' not in game.to_dict()
+    assert parse_event(_event()).week is None
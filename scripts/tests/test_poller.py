@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+from espn_models import Game
+from espn_poller import GameDayPoller
+
+
+NOW = datetime(2024, 11, 2, 20, 0, tzinfo=timezone.utc)
+
+
+def make_game(game_id, kickoff, is_completed=False):
+    return Game(game_id, 'Away', 'Home', '1', '2',
+                game_date=kickoff.strftime('%Y-%m-%dT%H:%MZ'), is_completed=is_completed)
+
+
+def make_poller(games):
+    poller = GameDayPoller.__new__(GameDayPoller)
+    poller.poll_interval = 60
+    poller.idle_interval = 1800
+    poller._tracked = games
+    return poller
+
+
+def test_live_game_polls_at_interval():
+    poller = make_poller([make_game('1', NOW - timedelta(hours=1))])
+    assert poller.next_delay(NOW) == 60
+
+
+def test_overrun_game_still_polled():
+    poller = make_poller([make_game('1', NOW - timedelta(hours=7))])
+    assert poller.next_delay(NOW) == 60
+
+
+def test_game_that_never_completes_stops_polling():
+    poller = make_poller([make_game('1', NOW - timedelta(days=1))])
+    assert poller.next_delay(NOW) is None
+
+
+def test_stalled_game_does_not_hold_later_kickoff():
+    poller = make_poller([make_game('1', NOW - timedelta(days=1)),
+                          make_game('2', NOW + timedelta(hours=3))])
+    assert poller.next_delay(NOW) == 1800
+
+
+def test_all_final_returns_none():
+    poller = make_poller([make_game('1', NOW - timedelta(hours=2), is_completed=True)])
+    assert poller.next_delay(NOW) is None
@@ -0,0 +1,34 @@
+import espn_ratelimit
+from espn_ratelimit import RequestScheduler
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_retried_response_closed_and_retry_after_honored(monkeypatch):
+    clock = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(espn_ratelimit.time, 'sleep', sleep)
+    monkeypatch.setattr(espn_ratelimit.time, 'monotonic', lambda: clock[0])
+    throttled = FakeResponse(429, {'Retry-After': '90'})
+    ok = FakeResponse(200)
+    responses = iter([throttled, ok])
+    scheduler = RequestScheduler(rate=1000, backoff_cap=30)
+
+    response = scheduler.call('site.api.espn.com', 'https://site.api.espn.com/x', lambda: next(responses))
+
+    assert response is ok and not ok.closed
+    assert throttled.closed
+    assert 90 in sleeps
@@ -0,0 +1,78 @@
+"""RecordingClient in front of the scoreboard extractor (ESPN_RECORD mode)"""
+
+import io
+import json
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from espn_api_extractor import ESPNAPIExtractor  # noqa: E402
+from espn_cache import ResponseCache  # noqa: E402
+from espn_replay import RecordingClient, ReplayClient, ResponseArchive  # noqa: E402
+from espn_teams import TeamRegistry  # noqa: E402
+
+SCOREBOARD = {'events': [{'id': '401520281', 'competitions': [{
+    'date': '2024-11-02T19:30Z',
+    'competitors': [
+        {'homeAway': 'home', 'team': {'id': '61', 'displayName': 'Georgia Bulldogs'}},
+        {'homeAway': 'away', 'team': {'id': '57', 'displayName': 'Florida Gators'}},
+    ],
+    'status': {'type': {'state': 'pre', 'completed': False}},
+}]}]}
+
+
+def _network_response(url, body):
+    """A requests.Response whose body is only in its raw stream, like a live download"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers['Content-Type'] = 'application/json'
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class NetworkClient:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False, max_age=None):
+        return _network_response(url, self.body)
+
+    def close(self):
+        pass
+
+
+class CachingClient(NetworkClient):
+    """Like HTTPClient with its on-disk cache: returns CachedResponse objects"""
+
+    def __init__(self, body, cache):
+        super().__init__(body)
+        self.cache = cache
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False, max_age=None):
+        return self.cache.fetch(url, params, lambda conditional: _network_response(url, self.body),
+                                max_age, stream=stream)
+
+
+def _extractor(client, tmp_path):
+    return ESPNAPIExtractor(http_client=client, teams=TeamRegistry(str(tmp_path / 'teams.json')))
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_recording_client_serves_streamed_scoreboards(tmp_path, cached):
+    body = json.dumps(SCOREBOARD).encode()
+    inner = CachingClient(body, ResponseCache(str(tmp_path / 'cache'))) if cached else NetworkClient(body)
+    archive = ResponseArchive(str(tmp_path / 'espn.zip'), 'a')
+    client = RecordingClient(inner, archive)
+
+    games = _extractor(client, tmp_path).get_scoreboard_games({'week': 10})
+    # A second call is a cache hit when the cache is on
+    games += _extractor(client, tmp_path).get_scoreboard_games({'week': 10})
+    client.close()
+    assert [game.espn_game_id for game in games] == ['401520281'] * 2
+
+    replay = ReplayClient(ResponseArchive(str(tmp_path / 'espn.zip'), 'r'))
+    replayed = _extractor(replay, tmp_path).get_scoreboard_games({'week': 10})
+    replay.close()
+    assert [(game.away_team_espn_id, game.home_team_espn_id) for game in replayed] == [(57, 61)]
@@ -0,0 +1,73 @@
+"""grade_picks / standings / pick updates"""
+
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from espn_scoring import CORRECT, INCORRECT, UNGRADED, WeekPicks, WeekResults, _pick_updates, grade_picks, standings  # noqa: E402
+
+HOME, AWAY = 61, 57
+
+# (game_id, home_id, away_id, betting_line, is_completed, home_score, away_score)
+RESULTS = WeekResults([
+    (14, HOME, AWAY, -7.5, True, 34, 20),    # home wins and covers
+    (10, HOME, AWAY, -3.0, True, 21, 24),    # away wins and covers
+    (11, HOME, AWAY, -7.0, True, 27, 20),    # home wins, ATS push
+    (12, HOME, AWAY, None, True, 10, 3),     # no line: straight-up only
+    (13, HOME, AWAY, -1.0, False, None, None),  # not played yet
+])
+
+
+def _picks(rows):
+    # (pick_id, user_id, game_id, picked_team_espn_id, is_correct)
+    return WeekPicks(rows)
+
+
+def test_straight_up():
+    picks = _picks([(1, 1, 14, HOME, None), (2, 1, 14, AWAY, None), (3, 1, 10, AWAY, None),
+                    (4, 1, 11, HOME, None), (5, 1, 12, AWAY, None), (6, 1, 13, HOME, None)])
+    assert grade_picks(picks, RESULTS, 'su').tolist() == [CORRECT, INCORRECT, CORRECT, CORRECT, INCORRECT, UNGRADED]
+
+
+def test_against_the_spread():
+    picks = _picks([(1, 1, 14, HOME, None), (2, 1, 10, HOME, None), (3, 1, 11, HOME, None),
+                    (4, 1, 12, HOME, None), (5, 1, 13, AWAY, None)])
+    assert grade_picks(picks, RESULTS, 'ats').tolist() == [CORRECT, INCORRECT, UNGRADED, UNGRADED, UNGRADED]
+
+
+def test_unknown_games_and_teams_stay_ungraded():
+    picks = _picks([(1, 1, 99, HOME, None), (2, 1, 14, 1234, None), (3, 1, 9, HOME, None)])
+    assert grade_picks(picks, RESULTS, 'su').tolist() == [UNGRADED] * 3
+
+
+def test_empty_inputs_and_bad_mode():
+    assert len(grade_picks(_picks([]), RESULTS)) == 0
+    assert grade_picks(_picks([(1, 1, 14, HOME, None)]), WeekResults([])).tolist() == [UNGRADED]
+    with pytest.raises(ValueError):
+        grade_picks(_picks([]), RESULTS, 'moneyline')
+
+
+def test_standings():
+    picks = _picks([(1, 1, 14, HOME, None), (2, 1, 10, HOME, None), (3, 1, 13, HOME, None),
+                    (4, 2, 14, HOME, None), (5, 2, 10, AWAY, None)])
+    table = standings(picks, grade_picks(picks, RESULTS, 'su'), grade_picks(picks, RESULTS, 'ats'))
+    assert [row['user_id'] for row in table] == [2, 1]
+    assert table[0]['correct_picks'] == 2 and table[0]['accuracy'] == 100.0
+    assert (table[1]['total_picks'], table[1]['correct_picks'], table[1]['incorrect_picks']) == (3, 1, 1)
+    assert table[1]['accuracy'] == 50.0
+
+
+def test_pick_updates_are_parameterized_batches():
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE UserPicks (id INTEGER PRIMARY KEY, is_correct INTEGER)")
+    connection.executemany("INSERT INTO UserPicks VALUES (?, ?)", [(i, 1) for i in range(1, 6)])
+
+    statements = _pick_updates(np.array([1, 2, 3, 5]), np.array([CORRECT, INCORRECT, UNGRADED, INCORRECT]), 3)
+    assert len(statements) == 2
+    for sql, params in statements:
+        assert "'" not in sql
+        connection.execute(sql.replace('%s', '?'), params)
+    assert connection.execute("SELECT id, is_correct FROM UserPicks ORDER BY id").fetchall() == \
+        [(1, 1), (2, 0), (3, None), (4, 1), (5, 0)]